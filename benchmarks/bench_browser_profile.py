@@ -0,0 +1,83 @@
+"""
+Benchmark: lean browser profile (resource blocking + persistent disk cache) vs. full Chrome.
+
+Loads the same pages through FlipkartScraper's pooled driver twice: once with
+scraper.browser.lean on (images / media / fonts / analytics blocked, per-slot
+profile with disk cache) and once with a stock profile. Reports page-load time
+and bytes transferred (Resource Timing API) for the first, cold load and the
+average of the warm reloads that follow. Needs Chrome and network access:
+
+    python benchmarks/bench_browser_profile.py --loads 4 --url "https://www.flipkart.com/search?q=iphone"
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from product_assistant.etl.browser_profile import page_transfer_stats
+from product_assistant.etl.data_scrapper import FlipkartScraper
+
+DEFAULT_URLS = [
+    "https://www.flipkart.com/search?q=iphone+15",
+    "https://www.flipkart.com/search?q=wireless+earbuds",
+]
+
+
+def _wait_for_load(driver, timeout=30):
+    # load_ms is only set once the load event has finished
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if driver.execute_script("return (performance.getEntriesByType('navigation')[0] || {}).loadEventEnd > 0"):
+            return
+        time.sleep(0.1)
+
+
+def measure(lean, urls, loads, headless, profile_dir):
+    config = {"scraper": {
+        "driver_pool": {"max_drivers": 1},
+        "politeness": {"min_interval_seconds": 0},
+        "http": {"enabled": False},
+        "browser": {"lean": lean, "headless": headless, "profile_dir": profile_dir},
+    }}
+    scraper = FlipkartScraper(output_dir=tempfile.mkdtemp(), config=config)
+    samples = {"cold": [], "warm": []}
+    try:
+        with scraper.driver_pool.driver() as driver:
+            for url in urls:
+                for i in range(loads):
+                    scraper._safe_get(driver, url)
+                    _wait_for_load(driver)
+                    samples["cold" if i == 0 else "warm"].append(page_transfer_stats(driver))
+    finally:
+        scraper.close()
+    return samples
+
+
+def _summary(samples):
+    if not samples:
+        return "-"
+    load = statistics.mean(s["load_ms"] for s in samples)
+    kb = statistics.mean(s["transfer_bytes"] for s in samples) / 1024
+    requests = statistics.mean(s["requests"] for s in samples)
+    return f"{load:>9.0f}{kb:>12.0f}{requests:>10.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", help="page to load (repeatable); defaults to two search pages")
+    parser.add_argument("--loads", type=int, default=4, help="loads per URL; the first one is cold")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args()
+    urls = args.url or DEFAULT_URLS
+
+    print(f"{'profile':>8}{'load':>7}{'load (ms)':>11}{'KB sent':>12}{'requests':>10}")
+    for lean in (False, True):
+        # Fresh profile root per run, so the cold load really is cold
+        samples = measure(lean, urls, args.loads, not args.headed, tempfile.mkdtemp())
+        name = "lean" if lean else "full"
+        for phase in ("cold", "warm"):
+            print(f"{name:>8}{phase:>7}{_summary(samples[phase])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Recall@k, memory and query latency for reduced-dimension and quantised embeddings.
+
+Settings compared against exact float32 search at full dimensionality:
+    dims  x  {float32, float16, int8, int8 + float re-scoring}
+
+What maps to the app:
+- The dims rows model `embedding_model.dimensions`. That setting is what makes the
+  AstraDB index smaller and faster; the collection stores float vectors at that size.
+- float16 / int8 are the on-disk formats of the query-embedding cache
+  (`embedding_cache.dtype`); the recall columns show what dequantised vectors lose.
+- The int8 and int8 + re-scoring *search* rows are an offline what-if for a local
+  quantised index. The retriever never searches int8 codes, so their memory and
+  latency figures are not the app's.
+
+By default a synthetic corpus is used whose variance decays across dimensions
+(like Matryoshka-trained text-embedding-3 vectors). Pass --vectors with a .npy
+matrix of real embeddings (n x 1536) for representative numbers:
+
+    python benchmarks/bench_embedding_compression.py --n 50000 --dims 1536 512 256
+"""
+import argparse
+import time
+
+import numpy as np
+
+from product_assistant.utils.quantization import normalize, quantize_int8, truncate_embeddings
+
+
+def synthetic_corpus(n, dim, rng):
+    decay = 1.0 / np.sqrt(1.0 + np.arange(dim) / 32.0)
+    return normalize(rng.standard_normal((n, dim)).astype(np.float32) * decay)
+
+
+def make_queries(corpus, n_queries, rng, noise=0.6):
+    picks = rng.choice(len(corpus), size=n_queries, replace=False)
+    noisy = corpus[picks] + noise * rng.standard_normal((n_queries, corpus.shape[1])).astype(np.float32) / np.sqrt(corpus.shape[1])
+    return normalize(noisy)
+
+
+def topk(matrix, query, k):
+    scores = matrix @ query
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def search_int8(query, codes, scales, k, rescore_vectors=None, rescore_factor=4):
+    # Top-k over int8 codes; with `rescore_vectors`, the top k * rescore_factor
+    # approximate candidates are re-scored in float (what-if only, see the module docstring).
+    approx = (codes @ query) * scales  # int8 @ float32 -> float32 without a full dequantise copy
+    n_candidates = min(len(approx), k * rescore_factor if rescore_vectors is not None else k)
+    candidates = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+    if rescore_vectors is not None:
+        exact = np.asarray(rescore_vectors[candidates], dtype=np.float32) @ query
+        return candidates[np.argsort(-exact)[:k]]
+    return candidates[np.argsort(-approx[candidates])[:k]]
+
+
+def recall(found, truth):
+    return len(set(found.tolist()) & set(truth.tolist())) / len(truth)
+
+
+def run_setting(name, search_fn, queries, truth, memory_bytes):
+    recalls = []
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        recalls.append(recall(search_fn(query), expected))
+    latency_ms = 1000 * (time.perf_counter() - start) / len(queries)
+    print(f"{name:<28}{np.mean(recalls):>10.3f}{memory_bytes / 2**20:>12.1f}{latency_ms:>12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", help="Optional .npy matrix of real embeddings")
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--full-dim", type=int, default=1536)
+    parser.add_argument("--dims", type=int, nargs="+", default=[1536, 512, 256])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.vectors:
+        corpus = normalize(np.load(args.vectors))
+    else:
+        corpus = synthetic_corpus(args.n, args.full_dim, rng)
+    queries = make_queries(corpus, args.queries, rng)
+    truth = [topk(corpus, q, args.k) for q in queries]
+
+    print(f"corpus={corpus.shape} queries={len(queries)} k={args.k} (recall vs exact float32 @ full dim)")
+    print(f"{'setting':<28}{'recall@k':>10}{'memory MB':>12}{'query ms':>12}")
+    for dim in args.dims:
+        reduced = truncate_embeddings(corpus, dim)
+        reduced_queries = truncate_embeddings(queries, dim)
+        half = reduced.astype(np.float16)
+        codes, scales = quantize_int8(reduced)
+
+        run_setting(f"d={dim} float32", lambda q: topk(reduced, q, args.k), reduced_queries, truth, reduced.nbytes)
+        run_setting(
+            f"d={dim} float16",
+            lambda q: topk(half, q.astype(np.float16), args.k),
+            reduced_queries,
+            truth,
+            half.nbytes,
+        )
+        run_setting(
+            f"d={dim} int8",
+            lambda q: search_int8(q, codes, scales, args.k),
+            reduced_queries,
+            truth,
+            codes.nbytes + scales.nbytes,
+        )
+        # Re-scoring reads full-precision rows for the few candidates only, so those
+        # can stay on disk (memmap); memory counts the int8 index alone.
+        run_setting(
+            f"d={dim} int8 + rescore x{args.rescore_factor}",
+            lambda q: search_int8(q, codes, scales, args.k, rescore_vectors=reduced, rescore_factor=args.rescore_factor),
+            reduced_queries,
+            truth,
+            codes.nbytes + scales.nbytes,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Throughput / latency of the CPU-local embedding provider vs OpenAI on this machine.
+
+Reports single-query latency (p50 / p95) and bulk embedding throughput at a few
+batch sizes. OpenAI is included only when OPENAI_API_KEY is set:
+
+    python benchmarks/bench_embedding_providers.py --local-model sentence-transformers/all-MiniLM-L6-v2
+"""
+import argparse
+import os
+import statistics
+import time
+
+import pandas as pd
+
+from product_assistant.utils.local_embeddings import LocalEmbeddings
+
+SAMPLE_QUERIES = [
+    "Can you suggest good budget iPhone under 1,00,000 INR?",
+    "best samsung phone with good battery life",
+    "oneplus vs pixel camera comparison",
+    "noise cancelling earbuds under 5000",
+    "gaming laptop with rtx graphics",
+]
+
+
+def _texts(csv_path, n):
+    if csv_path and os.path.exists(csv_path):
+        df = pd.read_csv(csv_path)
+        base = (df["product_title"].astype(str) + " | " + df["top_reviews"].astype(str)).tolist()
+    else:
+        base = SAMPLE_QUERIES
+    return [base[i % len(base)] + f" #{i}" for i in range(n)]
+
+
+def query_latency(embeddings, repeats):
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        embeddings.embed_query(SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] + f" {i}")
+        timings.append(1000 * (time.perf_counter() - start))
+    timings.sort()
+    return statistics.median(timings), timings[int(0.95 * (len(timings) - 1))]
+
+
+def throughput(embeddings, texts, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        embeddings.embed_documents(texts[i : i + batch_size])
+    return len(texts) / (time.perf_counter() - start)
+
+
+def report(name, embeddings, texts, batch_sizes, repeats):
+    p50, p95 = query_latency(embeddings, repeats)
+    print(f"\n[{name}] query latency: p50={p50:.1f} ms  p95={p95:.1f} ms")
+    for batch_size in batch_sizes:
+        print(f"[{name}] batch={batch_size:<4} throughput: {throughput(embeddings, texts, batch_size):8.1f} docs/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--local-model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--local-backend", default="sentence_transformers", choices=["sentence_transformers", "fastembed"])
+    parser.add_argument("--openai-model", default="text-embedding-3-small")
+    parser.add_argument("--csv", default=os.path.join("data", "product_reviews.csv"))
+    parser.add_argument("--docs", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = _texts(args.csv, args.docs)
+
+    start = time.perf_counter()
+    local = LocalEmbeddings(model_name=args.local_model, backend=args.local_backend)
+    print(f"Local model load: {time.perf_counter() - start:.2f} s (once per process)")
+    report(f"local:{args.local_model}", local, texts, args.batch_sizes, args.repeats)
+
+    if os.getenv("OPENAI_API_KEY"):
+        from langchain_openai import OpenAIEmbeddings
+
+        remote = OpenAIEmbeddings(model=args.openai_model)
+        report(f"openai:{args.openai_model}", remote, texts, args.batch_sizes, args.repeats)
+    else:
+        print("\nOPENAI_API_KEY not set, skipping the OpenAI provider.")
+
+
+if __name__ == "__main__":
+    main()
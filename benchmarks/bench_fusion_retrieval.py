@@ -0,0 +1,286 @@
+"""
+End-to-end latency and result quality: sequential rewrite loop vs multi-query fusion.
+
+Both paths run the real Retriever code (query embedding, metadata filters,
+concurrent vector searches, RRF) against a replay backend: a synthetic phone
+catalog searched exactly in memory, with each embeddings / vector search / LLM
+call delayed by a latency drawn from recorded samples. Pass --latencies with a
+JSON file of measured samples, e.g. taken from the app's logs:
+
+    {"embed_ms": [112, 131, ...], "search_ms": [74, 88, ...], "llm_ms": [840, 1210, ...]}
+
+Without it, the built-in samples below are used (placeholders, not a measurement).
+
+    python benchmarks/bench_fusion_retrieval.py --latencies latencies.json --repeats 5
+
+Paths, following the agentic workflow (retrieve -> grade -> rewrite -> retrieve -> grade):
+    single, first pass good          call_retriever + 1 grading call
+    single, rewrite fires            call_retriever, grade, rewrite, call_retriever, grade
+    fusion                           call_retriever_fused + 1 grading call
+The rewrite is simulated as the synonym-expanded variant of the query.
+
+Quality: share of returned products that match each query's intent (precision@k)
+and overlap of the returned product sets with the fused results.
+"""
+import argparse
+import copy
+import json
+import re
+import threading
+import time
+import zlib
+from unittest import mock
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from product_assistant.retriever.query_expansion import expand_query
+from product_assistant.retriever.retrieval import Retriever
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.metadata_parser import detect_brand, parse_price_inr
+
+DEFAULT_LATENCIES = {
+    "embed_ms": [95, 110, 120, 140, 185],
+    "search_ms": [60, 70, 80, 95, 130],
+    "llm_ms": [700, 850, 900, 1100, 1400],
+}
+
+MODELS = [
+    ("Apple iPhone 13", 52999), ("Apple iPhone 14", 61999), ("Apple iPhone 15", 69999),
+    ("Apple iPhone 15 Plus", 79999), ("Apple iPhone 15 Pro", 127999), ("Apple iPhone 16", 79900),
+    ("Samsung Galaxy S24", 74999), ("Samsung Galaxy A55 5G", 39999), ("Samsung Galaxy M35 5G", 19999),
+    ("Samsung Galaxy S23 FE", 35999), ("OnePlus 12", 64999), ("OnePlus Nord CE4", 24999),
+    ("Google Pixel 8", 75999), ("Google Pixel 8a", 52999), ("Xiaomi Redmi Note 13", 17999),
+    ("Xiaomi Redmi 13C", 8999), ("Motorola Edge 50 Fusion", 22999), ("realme Narzo 70", 14999),
+]
+COLORS = ["Black", "Blue", "Green", "White"]
+STORAGE = [(128, 0), (256, 10000), (512, 30000)]
+REVIEW_PHRASES = [
+    "battery easily lasts a full day", "camera is excellent in daylight", "affordable and value for money",
+    "display is bright and smooth", "gets warm while gaming", "top rated performance for the price",
+    "budget friendly smartphone", "great low light photos", "charging is fast", "premium build quality",
+]
+
+QUERIES = {
+    # query -> which products count as relevant
+    "Can you suggest good budget iPhone under 1,00,000 INR?":
+        lambda m: m.get("brand") == "apple" and m.get("price_inr", 1e9) <= 100000,
+    "affordable phone with great battery life":
+        lambda m: m.get("price_inr", 1e9) <= 30000,
+    "galaxy phone with a good camera":
+        lambda m: m.get("brand") == "samsung",
+    "pixel for photography":
+        lambda m: m.get("brand") == "google",
+}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def hashed_embedding(text, dim):
+    # Deterministic bag of words + word bigrams, signed feature hashing, unit length
+    words = _TOKEN.findall(text.lower())
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += 1.0 if (h >> 16) & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def make_catalog(rng):
+    docs = []
+    for model, base_price in MODELS:
+        for color in COLORS:
+            for storage, extra in STORAGE:
+                title = f"{model} ({color}, {storage} GB)"
+                price = base_price + extra
+                reviews = " || ".join(rng.choice(REVIEW_PHRASES, size=3, replace=False))
+                rating = round(float(rng.uniform(3.8, 4.8)), 1)
+                metadata = {
+                    "product_id": f"itm{len(docs):05d}",
+                    "product_title": title,
+                    "price": f"₹{price:,}",
+                    "price_inr": parse_price_inr(f"₹{price}"),
+                    "rating": rating,
+                    "brand": detect_brand(title),
+                }
+                content = f"Product: {title} | Price: ₹{price:,} | Rating: {rating} | Reviews: {reviews}"
+                docs.append(Document(page_content=content, metadata=metadata))
+    return docs
+
+
+def matches(metadata, condition):
+    # The subset of the AstraDB filter language that query_filters produces
+    for key, value in condition.items():
+        if key == "$and":
+            if not all(matches(metadata, c) for c in value):
+                return False
+        elif key == "$or":
+            if not any(matches(metadata, c) for c in value):
+                return False
+        elif isinstance(value, dict):
+            field = metadata.get(key)
+            for op, operand in value.items():
+                if op == "$in" and field not in operand:
+                    return False
+                if op in ("$gte", "$lte") and field is None:
+                    return False
+                if op == "$gte" and field < operand or op == "$lte" and field > operand:
+                    return False
+        elif metadata.get(key) != value:
+            return False
+    return True
+
+
+class LatencyReplay:
+    def __init__(self, samples, seed=0):
+        self.samples = samples
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+        self.calls = {name: 0 for name in samples}
+
+    def wait(self, name):
+        with self.lock:
+            seconds = float(self.rng.choice(self.samples[name])) / 1000
+            self.calls[name] += 1
+        time.sleep(seconds)
+
+
+class ReplayEmbeddings(Embeddings):
+    def __init__(self, replay, dim):
+        self.replay = replay
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        self.replay.wait("embed_ms")  # one round trip per batch
+        return [hashed_embedding(t, self.dim).tolist() for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class ReplayVectorStore:
+    """
+    Exact in-memory search with the AstraDB vector store methods the Retriever uses.
+    """
+
+    def __init__(self, docs, embeddings, replay):
+        self.docs = docs
+        self.embeddings = embeddings
+        self.replay = replay
+        self.matrix = np.stack([hashed_embedding(d.page_content, embeddings.dim) for d in docs])
+
+    def _search(self, vector, k, filter):
+        self.replay.wait("search_ms")
+        scores = (1.0 + self.matrix @ np.asarray(vector, dtype=np.float32)) / 2.0  # AstraDB cosine scale
+        order = [i for i in np.argsort(-scores) if not filter or matches(self.docs[i].metadata, filter)]
+        return order[:k], scores
+
+    def similarity_search_with_score_by_vector(self, vector, k=4, filter=None):
+        order, scores = self._search(vector, k, filter)
+        return [(self.docs[i], float(scores[i])) for i in order]
+
+    def similarity_search_with_embedding_by_vector(self, vector, k=4, filter=None):
+        order, _ = self._search(vector, k, filter)
+        return [(self.docs[i], self.matrix[i].tolist()) for i in order]
+
+
+def make_retriever(config, vstore):
+    # Real Retriever, minus credentials and the AstraDB client
+    with mock.patch.object(Retriever, "_load_env_variables"), \
+            mock.patch("product_assistant.retriever.retrieval.load_config", return_value=config):
+        retriever = Retriever()
+    retriever.vstore = vstore
+    retriever.collection_name = config["astra_db"]["collection_name"]
+    return retriever
+
+
+def single_first_pass(retriever, replay, query):
+    docs = retriever.call_retriever(query)
+    replay.wait("llm_ms")  # grade
+    return docs
+
+
+def single_with_rewrite(retriever, replay, query):
+    retriever.call_retriever(query)
+    replay.wait("llm_ms")  # grade: not relevant
+    replay.wait("llm_ms")  # rewrite
+    rewritten = expand_query(query)[-1]
+    docs = retriever.call_retriever(rewritten)
+    replay.wait("llm_ms")  # grade again
+    return docs
+
+
+def fused(retriever, replay, query):
+    docs = retriever.call_retriever_fused(query)
+    replay.wait("llm_ms")  # grade
+    return docs
+
+
+def _ids(docs):
+    return {d.metadata["product_id"] for d in docs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencies", help="JSON file with embed_ms / search_ms / llm_ms sample lists")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--search-type", choices=["similarity", "mmr"], help="override retriever.search_type")
+    args = parser.parse_args()
+
+    samples = DEFAULT_LATENCIES
+    if args.latencies:
+        with open(args.latencies, encoding="utf-8") as f:
+            samples = {**DEFAULT_LATENCIES, **json.load(f)}
+
+    config = copy.deepcopy(load_config())
+    config["astra_db"].setdefault("alias", {})["enabled"] = False
+    config["embedding_cache"] = {**config.get("embedding_cache", {}), "enabled": False}
+    retriever_cfg = config.setdefault("retriever", {})
+    retriever_cfg["score_threshold"] = 0.0  # hashed vectors score lower than real embeddings
+    retriever_cfg.setdefault("fusion", {})["use_llm"] = False
+    if args.search_type:
+        retriever_cfg["search_type"] = args.search_type
+
+    catalog = make_catalog(np.random.default_rng(0))
+    paths = [
+        ("single, first pass good", "single", single_first_pass),
+        ("single, rewrite fires", "single", single_with_rewrite),
+        ("fusion", "fusion", fused),
+    ]
+
+    print(f"catalog={len(catalog)} products, queries={len(QUERIES)}, repeats={args.repeats}, "
+          f"latency samples={'--latencies' if args.latencies else 'built-in placeholders'}")
+    results = {}
+    for name, mode, run_path in paths:
+        replay = LatencyReplay(samples)
+        path_config = copy.deepcopy(config)
+        path_config["retriever"]["mode"] = mode
+        retriever = make_retriever(path_config, ReplayVectorStore(catalog, ReplayEmbeddings(replay, args.dim), replay))
+
+        timings, precision, returned = [], [], {}
+        for query, relevant in QUERIES.items():
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                docs = run_path(retriever, replay, query)
+                timings.append(time.perf_counter() - start)
+            returned[query] = _ids(docs)
+            precision.append(np.mean([relevant(d.metadata) for d in docs]) if docs else 0.0)
+        calls = {k: round(v / (args.repeats * len(QUERIES)), 1) for k, v in replay.calls.items()}
+        results[name] = (timings, precision, returned, calls)
+
+    fused_ids = results["fusion"][2]
+    print(f"\n{'path':<26}{'p50 ms':>9}{'mean ms':>9}{'precision@k':>13}{'overlap w/ fusion':>19}  calls per query")
+    for name, (timings, precision, returned, calls) in results.items():
+        overlap = np.mean([
+            len(returned[q] & fused_ids[q]) / len(returned[q] | fused_ids[q]) if returned[q] | fused_ids[q] else 1.0
+            for q in QUERIES
+        ])
+        print(f"{name:<26}{1000 * np.median(timings):>9.0f}{1000 * np.mean(timings):>9.0f}"
+              f"{np.mean(precision):>13.2f}{overlap:>19.2f}  {calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: BeautifulSoup vs. compiled-XPath lxml extraction on saved pages.
+
+Runs FlipkartScraper's original BeautifulSoup extraction and the lxml engine
+(product_assistant.etl.html_extract) over the fixtures in benchmarks/fixtures/,
+plus variants where the known CSS classes are renamed (forcing the
+find_all / leaf-div fallbacks) and scaled-up pages. Also times the embedded
+JSON state path (page_state) against the lxml DOM walk on the *_state
+fixtures, which carry a `window.__INITIAL_STATE__` for the same products.
+Fails if any output differs:
+
+    python benchmarks/bench_html_parsers.py --scale 20 --repeat 5
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from product_assistant.etl.data_scrapper import FlipkartScraper
+from product_assistant.etl.html_extract import REVIEW_SKIP, parse_reviews, parse_search_cards
+from product_assistant.etl.page_state import extract_initial_state, products_from_state, reviews_from_state
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASE_URL = "https://www.flipkart.com"
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _rename_classes(html, names):
+    for i, name in enumerate(names):
+        html = re.sub(rf"\b{re.escape(name)}\b", f"zz{i}x", html)
+    return html
+
+
+def _scale_body(html, marker, times):
+    # Repeat everything between the container div and the closing tags
+    head, _, rest = html.partition(marker)
+    body, _, tail = rest.partition("\n    </div>\n  </div>\n  <script")
+    return head + marker + body * times + "\n    </div>\n  </div>\n  <script" + tail
+
+
+def make_pages(scale):
+    search = _fixture("flipkart_search.html")
+    reviews = _fixture("flipkart_reviews.html")
+    search_fallback = _rename_classes(search, ["Nx9bqj", "_30jeq3", "_1_WHN1", "hl05eU", "XQDdHH", "UkUFwK"])
+    reviews_fallback = _rename_classes(reviews, ["ZmyHeo", "t-ZTKy", "_27M-vq", "EPCmJX", "_6K-7Co", "gHabs0"])
+    return {
+        "search": ("search", search),
+        "search_fallback": ("search", search_fallback),
+        "search_fallback_large": ("search", _scale_body(search_fallback, '<div class="_1YokD2 _3Mn1Gg">', scale)),
+        "reviews": ("reviews", reviews),
+        "reviews_fallback_large": ("reviews", _scale_body(reviews_fallback, '<div class="_1YokD2 _3Mn1Gg col-9-12">', scale)),
+    }
+
+
+def _best_of(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=20, help="repeat factor for the *_large pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--reviews", type=int, default=10, help="review_count passed to the review parsers")
+    args = parser.parse_args()
+
+    scraper = FlipkartScraper(output_dir=tempfile.mkdtemp(), config={})
+    engines = {
+        "search": (
+            lambda html: scraper._bs4_search_cards(html, 10_000),
+            lambda html: parse_search_cards(html, 10_000, BASE_URL),
+        ),
+        "reviews": (
+            lambda html: scraper._bs4_parse_reviews(html, args.reviews),
+            lambda html: parse_reviews(html, args.reviews),
+        ),
+    }
+
+    mismatches = 0
+    print(f"{'page':>24}{'KB':>8}{'bs4 (ms)':>11}{'lxml (ms)':>11}{'speedup':>9}  identical")
+    for name, (kind, html) in make_pages(args.scale).items():
+        bs4_fn, lxml_fn = engines[kind]
+        t_bs4, expected = _best_of(lambda: bs4_fn(html), args.repeat)
+        t_lxml, actual = _best_of(lambda: lxml_fn(html), args.repeat)
+        same = expected == actual
+        mismatches += not same
+        print(f"{name:>24}{len(html) / 1024:>8.0f}{1000 * t_bs4:>11.2f}{1000 * t_lxml:>11.2f}{t_bs4 / t_lxml:>8.1f}x  {same}")
+        if not same:
+            print(f"    bs4:  {expected}\n    lxml: {actual}")
+
+    # JSON state vs. DOM. Review counts are left out on purpose (the card text only
+    # has "1,24" of "1,24,512"), and only the page's 5 reviews are asked for: past
+    # them the DOM walk moves on to whole review cards (rating + author + date)
+    state_reviews = 5
+    state_engines = {
+        "search_state": (
+            "flipkart_search_state.html",
+            lambda html: [row[:3] + row[4:] for row in parse_search_cards(html, 10_000, BASE_URL)[1]],
+            lambda html: [row[:3] + row[4:] for row in products_from_state(extract_initial_state(html), 10_000, BASE_URL)],
+        ),
+        "reviews_state": (
+            "flipkart_reviews_state.html",
+            lambda html: parse_reviews(html, state_reviews),
+            lambda html: reviews_from_state(extract_initial_state(html), state_reviews, skip=REVIEW_SKIP),
+        ),
+    }
+    print(f"\n{'page':>24}{'KB':>8}{'dom (ms)':>11}{'json (ms)':>11}{'speedup':>9}  identical")
+    for name, (fixture, dom_fn, json_fn) in state_engines.items():
+        html = _fixture(fixture)
+        t_dom, expected = _best_of(lambda: dom_fn(html), args.repeat)
+        t_json, actual = _best_of(lambda: json_fn(html), args.repeat)
+        same = expected == actual
+        mismatches += not same
+        print(f"{name:>24}{len(html) / 1024:>8.0f}{1000 * t_dom:>11.2f}{1000 * t_json:>11.2f}{t_dom / t_json:>8.1f}x  {same}")
+        if not same:
+            print(f"    dom:  {expected}\n    json: {actual}")
+
+    scraper.close()
+    if mismatches:
+        raise SystemExit(f"{mismatches} page(s) extracted differently")
+
+
+if __name__ == "__main__":
+    main()
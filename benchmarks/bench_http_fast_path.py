@@ -0,0 +1,128 @@
+"""
+Benchmark: HTTP fast path with browser fallback, offline.
+
+Serves the saved pages in benchmarks/fixtures/ from a local http.server
+(search results, a reviews page, and a bot-check page for queries containing
+"blocked"), points FlipkartScraper at it and reports which path served each
+URL, the scrape time, and the pooled keep-alive session against a new
+connection per request (near-equal on loopback; against the real site every
+new connection also pays DNS + TLS). Chrome is never launched: fallbacks to
+the browser are recorded but answered with an empty result.
+
+    python benchmarks/bench_http_fast_path.py --queries 5 --products 10 --latency-ms 20
+"""
+import argparse
+import gzip
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+
+from product_assistant.etl.data_scrapper import FlipkartScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def make_handler(latency_seconds):
+    pages = {
+        "search": _fixture("flipkart_search.html"),
+        "reviews": _fixture("flipkart_reviews.html"),
+        "blocked": _fixture("flipkart_blocked.html"),
+    }
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if "blocked" in url.query:
+                body = pages["blocked"]
+            elif url.path == "/search":
+                body = pages["search"]
+            elif "/product-reviews/" in url.path:
+                body = pages["reviews"]
+            else:
+                self.send_error(404)
+                return
+
+            if latency_seconds:
+                time.sleep(latency_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--reviews", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated server latency per page")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    config = {"scraper": {
+        "base_url": base_url,
+        "reviews": {"concurrency": args.concurrency},
+        "politeness": {"min_interval_seconds": 0},
+        "http": {"enabled": True, "pool_size": args.concurrency},
+    }}
+    scraper = FlipkartScraper(output_dir=tempfile.mkdtemp(), config=config)
+    # Fallbacks are what we measure here; don't launch Chrome for them
+    scraper._search_with_browser = lambda url, max_products: []
+
+    queries = [f"phone {i}" for i in range(args.queries)] + ["phone blocked"]
+    start = time.perf_counter()
+    rows = [row for q in queries for row in scraper.scrape_flipkart_products(q, args.products, args.reviews)]
+    elapsed = time.perf_counter() - start
+
+    entries = scraper.fetch_log.entries()
+    review_urls = [e["url"] for e in entries if e["kind"] == "reviews"]
+    t_pooled = time.perf_counter()
+    for url in review_urls:
+        scraper.http.get_html(url)
+    t_pooled = time.perf_counter() - t_pooled
+    t_fresh = time.perf_counter()
+    for url in review_urls:
+        requests.get(url, headers=scraper.http.session.headers, timeout=10).text
+    t_fresh = time.perf_counter() - t_fresh
+
+    print(f"\nqueries={len(queries)} rows={len(rows)} in {elapsed:.2f}s")
+    print(f"paths: {scraper.fetch_log.stats()}")
+    print(f"fallback reasons: {dict(Counter(e['fallback_reason'] for e in entries if e['fallback_reason']))}")
+    print(f"phases: {scraper.timings.stats()}")
+    if review_urls:
+        n = len(review_urls)
+        print(f"per page: keep-alive session {1000 * t_pooled / n:.1f} ms vs new connection {1000 * t_fresh / n:.1f} ms")
+
+    scraper.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
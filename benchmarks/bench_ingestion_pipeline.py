@@ -0,0 +1,73 @@
+"""
+Benchmark: sequential vs. concurrent embed -> upsert ingestion, fully offline.
+
+Uses a fake embedder and an in-memory vector store that sleep to simulate
+network round-trips (and can fail randomly to exercise retries):
+
+    python benchmarks/bench_ingestion_pipeline.py --docs 5000 --embed-latency-ms 120 --insert-latency-ms 60
+"""
+import argparse
+import time
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from product_assistant.etl.embed_pipeline import EmbedUpsertPipeline
+from product_assistant.etl.vector_sink import InMemoryVectorSink
+
+
+class SlowFakeEmbeddings(DeterministicFakeEmbedding):
+    latency_seconds: float = 0.1
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency_seconds)
+        return super().embed_documents(texts)
+
+
+def make_documents(n):
+    return [
+        Document(
+            page_content=f"Product: Phone {i} | Price: ₹{10000 + i} | Rating: 4.{i % 10} | Reviews: solid battery, good camera",
+            metadata={"product_id": f"p{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--embed-latency-ms", type=float, default=120)
+    parser.add_argument("--insert-latency-ms", type=float, default=60)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs)
+    embeddings = SlowFakeEmbeddings(size=256, latency_seconds=args.embed_latency_ms / 1000)
+
+    print(f"docs={args.docs} batch_size={args.batch_size} embed={args.embed_latency_ms}ms insert={args.insert_latency_ms}ms")
+    print(f"{'embed/insert workers':>22}{'seconds':>10}{'docs/s':>10}{'tokens/s':>11}{'retries':>9}{'failed':>8}")
+    for embed_workers, insert_workers in [(1, 1), (2, 2), (4, 4), (8, 4)]:
+        sink = InMemoryVectorSink(
+            latency_seconds=args.insert_latency_ms / 1000, failure_rate=args.failure_rate, seed=0
+        )
+        pipeline = EmbedUpsertPipeline(
+            embeddings,
+            sink,
+            batch_size=args.batch_size,
+            embed_workers=embed_workers,
+            insert_workers=insert_workers,
+            backoff_seconds=0.05,
+            progress_every=0,
+        )
+        report = pipeline.run(iter(documents))
+        assert len(sink.documents) + report["failed_documents"] == args.docs
+        print(
+            f"{f'{embed_workers}/{insert_workers}':>22}{report['seconds']:>10.2f}{report['docs_per_second']:>10.0f}"
+            f"{report['tokens_per_second']:>11.0f}{report['retries']:>9}{report['failed_documents']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
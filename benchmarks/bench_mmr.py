@@ -0,0 +1,57 @@
+"""
+Microbenchmark: local MMR re-ranking time at fetch_k = 20 / 100 / 1000.
+
+Compares the vectorised implementation in product_assistant.retriever.mmr with
+LangChain's reference maximal_marginal_relevance on random unit vectors:
+
+    python benchmarks/bench_mmr.py --dim 1536 --k 4 --lambda-mult 0.7
+"""
+import argparse
+import time
+
+import numpy as np
+from langchain_core.vectorstores.utils import maximal_marginal_relevance as reference_mmr
+
+from product_assistant.retriever.mmr import maximal_marginal_relevance
+
+
+def _time_ms(fn, repeats):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return 1000 * (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--lambda-mult", type=float, default=0.7)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--fetch-k", type=int, nargs="+", default=[20, 100, 1000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(args.dim).astype(np.float32)
+
+    print(f"dim={args.dim} k={args.k} lambda_mult={args.lambda_mult}")
+    print(f"{'fetch_k':>8}{'vectorised (ms)':>18}{'langchain (ms)':>17}{'same picks':>12}")
+    for fetch_k in args.fetch_k:
+        candidates = rng.standard_normal((fetch_k, args.dim)).astype(np.float32)
+        ours = maximal_marginal_relevance(query, candidates, k=args.k, lambda_mult=args.lambda_mult)
+        theirs = reference_mmr(query, list(candidates), lambda_mult=args.lambda_mult, k=args.k)
+
+        ours_ms = _time_ms(
+            lambda: maximal_marginal_relevance(query, candidates, k=args.k, lambda_mult=args.lambda_mult),
+            args.repeats,
+        )
+        theirs_ms = _time_ms(
+            lambda: reference_mmr(query, list(candidates), lambda_mult=args.lambda_mult, k=args.k),
+            args.repeats,
+        )
+        print(f"{fetch_k:>8}{ours_ms:>18.3f}{theirs_ms:>17.3f}{str(ours == list(theirs)):>12}")
+
+
+if __name__ == "__main__":
+    main()
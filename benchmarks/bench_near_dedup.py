@@ -0,0 +1,105 @@
+"""
+Benchmark: near-duplicate product collapsing (MinHash + LSH) on a synthetic catalog.
+
+Builds `--rows` product documents from families of colour/storage variants that
+share their reviews, then times shingling, MinHash, LSH clustering and the full
+collapse, and checks the clusters against the known families:
+
+    python benchmarks/bench_near_dedup.py --rows 100000 --variants 4
+"""
+import argparse
+import random
+import time
+
+from langchain_core.documents import Document
+
+from product_assistant.etl.incremental import add_fingerprints
+from product_assistant.etl.near_dedup import (
+    collapse_near_duplicates,
+    lsh_clusters,
+    minhash_signatures,
+    shingle_text,
+    shingles,
+)
+
+BRANDS = ["Apple iPhone", "SAMSUNG Galaxy S", "OnePlus Nord", "REDMI Note", "vivo T", "realme Narzo", "POCO X", "Google Pixel"]
+COLOURS = ["Black", "Blue", "Green", "White", "Ultramarine", "Titanium", "Mint", "Lavender"]
+STORAGE = ["64 GB", "128 GB", "256 GB", "512 GB"]
+WORDS = (
+    "battery camera display smooth fast heating value money gaming charging speaker build quality "
+    "design screen bright lag software update night photos selfie performance premium budget"
+).split()
+
+
+def make_documents(rows, variants, seed=0):
+    rng = random.Random(seed)
+    documents, family_of = [], {}
+    family = 0
+    while len(documents) < rows:
+        model = f"{rng.choice(BRANDS)} {rng.randint(1, 999)}{rng.choice(['', ' Pro', ' Plus', ' Lite'])}"
+        reviews = " || ".join(" ".join(rng.choices(WORDS, k=rng.randint(8, 25))) for _ in range(rng.randint(1, 4)))
+        base_price = rng.randint(80, 1500) * 100
+        for v in range(rng.randint(1, variants)):
+            title = f"{model} ({rng.choice(COLOURS)}, {STORAGE[v % len(STORAGE)]})"
+            price = base_price + v * 5000
+            product_id = f"itm{len(documents):010d}"
+            doc = Document(
+                page_content=f"Product: {title} | Price: ₹{price} | Rating: 4.3 | Total Reviews: {v} | Reviews: {reviews}",
+                metadata={"product_id": product_id, "product_title": title, "price_inr": float(price), "total_reviews": v},
+            )
+            documents.append(add_fingerprints(doc, f"{title}\x1f{reviews}"))
+            family_of[product_id] = family
+            if len(documents) >= rows:
+                break
+        family += 1
+    return documents, family_of, family
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--variants", type=int, default=4, help="max variants per product family")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=8)
+    args = parser.parse_args()
+
+    documents, family_of, families = make_documents(args.rows, args.variants)
+    print(f"rows={len(documents)} true families={families} num_perm={args.num_perm} bands={args.bands}")
+
+    start = time.perf_counter()
+    shingle_sets = [shingles(shingle_text(d)) for d in documents]
+    t_shingles = time.perf_counter() - start
+
+    start = time.perf_counter()
+    signatures = minhash_signatures(shingle_sets, num_perm=args.num_perm)
+    t_minhash = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cluster_ids = lsh_clusters(signatures, bands=args.bands, threshold=args.threshold)
+    t_lsh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    collapsed, stats = collapse_near_duplicates(
+        documents, threshold=args.threshold, num_perm=args.num_perm, bands=args.bands
+    )
+    t_total = time.perf_counter() - start
+
+    # Purity: clusters that mix families (false merges) / families split across clusters (misses)
+    clusters = {}
+    for doc, cluster_id in zip(documents, cluster_ids):
+        clusters.setdefault(cluster_id, set()).add(family_of[doc.metadata["product_id"]])
+    mixed = sum(1 for fams in clusters.values() if len(fams) > 1)
+    split = len(clusters) - families + sum(len(f) - 1 for f in clusters.values())
+
+    print(f"shingling   {t_shingles:8.2f}s")
+    print(f"minhash     {t_minhash:8.2f}s")
+    print(f"lsh+merge   {t_lsh:8.2f}s")
+    print(f"collapse    {t_total:8.2f}s end-to-end ({len(documents) / t_total:,.0f} rows/s)")
+    print(f"kept {stats['clusters']} of {stats['documents']} documents "
+          f"({stats['collapsed']} variants collapsed, {100 * stats['collapsed'] / stats['documents']:.1f}% fewer embeddings)")
+    print(f"clusters mixing families: {mixed} | families split across clusters: {split}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: CSV vs. typed Parquet handoff from scraper to ingestion.
+
+Writes the same synthetic scraper rows as CSV (save_to_csv format) and as a
+partitioned Parquet dataset (save_to_parquet format), then compares file size,
+raw load time, time to ingestion-shaped batches (string frames for CSV, typed
+Arrow record batches for Parquet) and load + transform time to Documents. CSV
+frames go through the string cleaning passes; Parquet batches were cleaned when
+written and become Documents straight from the typed columns. Content hashing
+and Document construction are the same for both sources:
+
+    python benchmarks/bench_parquet_handoff.py --rows 200000
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from product_assistant.etl.columnar import INGEST_COLUMNS, iter_parquet_batches, rows_to_table, write_parquet_dataset
+from product_assistant.etl.streaming import iter_csv_frames, iter_document_batches
+
+TITLES = ["Apple iPhone 16", "SAMSUNG Galaxy S24 5G", "OnePlus Nord CE4", "REDMI Note 13 Pro 5G", "Google Pixel 8a"]
+COLOURS = ["Black", "Blue", "Green", "White"]
+STORAGE = ["128 GB", "256 GB"]
+REVIEWS = [
+    "Great camera and battery life",
+    "Smooth performance, a bit pricey",
+    "Value for money, display is bright",
+    "Heats while gaming",
+]
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        price = rng.randint(80, 1500) * 100
+        rows.append([
+            f"itm{i:012d}",
+            f"{rng.choice(TITLES)} ({rng.choice(COLOURS)}, {rng.choice(STORAGE)})",
+            f"{rng.randint(30, 49) / 10}",
+            f"{rng.randint(1, 90000):,}",
+            f"₹{price:,}",
+            " || ".join(rng.sample(REVIEWS, rng.randint(1, 3))),
+        ])
+    return rows
+
+
+def _dir_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=4, help="scrape_date partitions to spread rows over")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    csv_path = os.path.join(workdir, "product_reviews.csv")
+    parquet_path = os.path.join(workdir, "product_reviews_parquet")
+    rows = make_rows(args.rows)
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"])
+        writer.writerows(rows)
+
+    start_day = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    per_day = -(-len(rows) // args.days)
+    for day in range(args.days):
+        chunk = rows[day * per_day : (day + 1) * per_day]
+        write_parquet_dataset(rows_to_table(chunk, scraped_at=start_day + timedelta(days=day)), parquet_path)
+
+    t_csv_load, _ = _time(lambda: pd.read_csv(csv_path))
+    t_pq_load, _ = _time(lambda: ds.dataset(parquet_path, partitioning="hive").to_table(columns=INGEST_COLUMNS))
+    t_csv_frames, _ = _time(lambda: sum(len(f) for f in iter_csv_frames(csv_path)))
+    t_pq_frames, _ = _time(lambda: sum(b.num_rows for b in iter_parquet_batches(parquet_path)))
+    t_csv_docs, csv_docs = _time(lambda: sum(len(b) for b in iter_document_batches(csv_path)))
+    t_pq_docs, pq_docs = _time(lambda: sum(len(b) for b in iter_document_batches(parquet_path)))
+
+    print(f"rows={args.rows} partitions={args.days}")
+    print(f"{'format':>8}{'size (MB)':>11}{'raw load (s)':>14}{'batches (s)':>12}{'load+transform (s)':>20}{'docs':>9}")
+    print(f"{'csv':>8}{_dir_size(csv_path) / 2**20:>11.1f}{t_csv_load:>14.2f}{t_csv_frames:>12.2f}{t_csv_docs:>20.2f}{csv_docs:>9}")
+    print(f"{'parquet':>8}{_dir_size(parquet_path) / 2**20:>11.1f}{t_pq_load:>14.2f}{t_pq_frames:>12.2f}{t_pq_docs:>20.2f}{pq_docs:>9}")
+
+
+if __name__ == "__main__":
+    main()
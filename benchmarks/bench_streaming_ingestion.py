@@ -0,0 +1,109 @@
+"""
+Benchmark: legacy in-memory CSV transform vs. the streaming, vectorised transform.
+
+Generates a synthetic product_reviews.csv (or uses --csv) and, in a fresh process
+per mode, measures time to the first batch of Documents (i.e. when the first
+upsert could start), total transform throughput and peak RSS:
+
+    python benchmarks/bench_streaming_ingestion.py --rows 200000 --batch-size 500
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import resource
+import tempfile
+import time
+
+import pandas as pd
+
+TITLES = [
+    "Apple iPhone 16 (Black, 128 GB)",
+    "SAMSUNG Galaxy S24 5G (Onyx Black, 256 GB)",
+    "OnePlus Nord CE4 (Celadon Marble, 128 GB)",
+    "REDMI Note 13 Pro 5G (Arctic White, 256 GB)",
+    "Google Pixel 8a (Obsidian, 128 GB)",
+]
+PRICES = ["₹64,900", "₹79,999", "₹24,999", "₹1,29,900", "₹9,499", "N/A"]
+RATINGS = ["4.6", "4.3", "4.1", "3.9", "N/A"]
+REVIEW_COUNTS = ["12,345 Reviews", "1,024", "87", "N/A"]
+REVIEWS = [
+    "Great camera and battery life || Smooth performance, a bit pricey",
+    "Value for money, display is bright || Heats while gaming",
+    "No reviews found",
+]
+
+
+def make_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    chunk = 50_000
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        frame = pd.DataFrame({
+            # ~2% duplicate product ids, as repeated scrapes produce
+            "product_id": [f"itm{rng.randrange(int(rows * 0.98)):012d}" for _ in range(n)],
+            "product_title": [rng.choice(TITLES) for _ in range(n)],
+            "rating": [rng.choice(RATINGS) for _ in range(n)],
+            "total_reviews": [rng.choice(REVIEW_COUNTS) for _ in range(n)],
+            "price": [rng.choice(PRICES) for _ in range(n)],
+            "top_reviews": [rng.choice(REVIEWS) * rng.randint(1, 4) for _ in range(n)],
+        })
+        frame.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def _batches(mode, csv_path, batch_size):
+    if mode == "streaming":
+        from product_assistant.etl.streaming import iter_document_batches
+
+        yield from iter_document_batches(csv_path, batch_size=batch_size)
+        return
+
+    from product_assistant.etl.data_ingestion import DataIngestion
+
+    ingestion = DataIngestion.__new__(DataIngestion)  # skip env/config loading
+    ingestion.product_data = pd.read_csv(csv_path)
+    documents = ingestion.transform_data()
+    for i in range(0, len(documents), batch_size):
+        yield documents[i : i + batch_size]
+
+
+def _run(mode, csv_path, batch_size, results):
+    start = time.perf_counter()
+    first_batch = None
+    documents = 0
+    for batch in _batches(mode, csv_path, batch_size):
+        if first_batch is None:
+            first_batch = time.perf_counter() - start
+        documents += len(batch)
+    total = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((mode, documents, first_batch, total, peak_rss_mb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--csv", help="existing product CSV to use instead of a synthetic one")
+    args = parser.parse_args()
+
+    csv_path = args.csv
+    if not csv_path:
+        csv_path = os.path.join(tempfile.mkdtemp(), "product_reviews.csv")
+        make_csv(csv_path, args.rows)
+    size_mb = os.path.getsize(csv_path) / 1024 / 1024
+    print(f"csv={csv_path} size={size_mb:.1f} MB batch_size={args.batch_size}")
+
+    ctx = mp.get_context("spawn")
+    print(f"{'mode':>10}{'docs':>10}{'first batch (s)':>17}{'total (s)':>11}{'docs/s':>10}{'peak RSS (MB)':>15}")
+    for mode in ("legacy", "streaming"):
+        results = ctx.Queue()
+        process = ctx.Process(target=_run, args=(mode, csv_path, args.batch_size, results))
+        process.start()
+        mode, documents, first_batch, total, peak_rss_mb = results.get()
+        process.join()
+        print(f"{mode:>10}{documents:>10}{first_batch:>17.2f}{total:>11.2f}{documents / total:>10.0f}{peak_rss_mb:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,13 @@
 from mcp.server.fastmcp import FastMCP
 from product_assistant.retriever.retrieval import Retriever  
 from langchain_community.tools import DuckDuckGoSearchRun
-import os
+import asyncio
 
 # Initialize MCP server
 mcp = FastMCP("hybrid_search")
 
-# Load retriever once
+# One retriever shared by all tools; its vector store is loaded on first use
 retriever_obj = Retriever()
-retriever = retriever_obj.load_retriever()
 
 # LangChain DuckDuckGo tool
 duckduckgo = DuckDuckGoSearchRun()
@@ -35,7 +34,9 @@ def format_docs(docs) -> str:
 async def get_product_info(query: str) -> str:
     """Retrieve product information for a given query from local retriever."""
     try:
-        docs = retriever.invoke(query)
+        # Run in a worker thread so concurrent requests overlap (and their
+        # query embeddings can be micro-batched) instead of blocking the loop.
+        docs = await asyncio.to_thread(retriever_obj.call_retriever, query)
         context = format_docs(docs)
         if not context.strip():
             return "No local results found."
@@ -43,6 +44,21 @@ async def get_product_info(query: str) -> str:
     except Exception as e:
         return f"Error retrieving product info: {str(e)}"
 
+@mcp.tool()
+async def get_product_info_batch(queries: list[str]) -> str:
+    """Retrieve product information for several queries in one batched lookup (e.g. comparisons)."""
+    try:
+        batch = await asyncio.to_thread(retriever_obj.call_retriever_batch, queries)
+        sections = []
+        for result in batch["results"]:
+            context = format_docs(result["documents"]) or "No local results found."
+            sections.append(f"### Query: {result['query']}\n\n{context}")
+        if not batch["documents"]:
+            return "No local results found."
+        return "\n\n===\n\n".join(sections)
+    except Exception as e:
+        return f"Error retrieving product info: {str(e)}"
+
 @mcp.tool()
 async def web_search(query: str) -> str:
     """Search the web using DuckDuckGo if retriever has no results."""
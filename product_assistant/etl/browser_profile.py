@@ -0,0 +1,71 @@
+import os
+
+# We only read text: skip what a page loads for looks and tracking
+BLOCKED_URL_PATTERNS = [
+    # images / media
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # analytics / ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*",
+    "*branch.io*", "*appsflyer.com*", "*criteo.com*",
+]
+
+# Chrome content settings: 2 = block
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+}
+
+
+def slot_profile_dir(base_dir: str, slot: int) -> str:
+    """
+    Persistent Chrome user-data dir for one driver-pool slot (profiles can't be
+    shared by two running browsers), so its disk cache survives driver recycling.
+    """
+    path = os.path.abspath(os.path.join(base_dir, f"slot-{slot}"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def apply_lean_options(options, profile_dir: str, disk_cache_mb: int = 256):
+    """
+    Lean profile on a ChromeOptions: images and media off, notification /
+    location prompts off, and a bounded disk cache inside the slot profile.
+    """
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_argument(f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
+    options.add_argument(f"--disk-cache-size={disk_cache_mb * 1024 * 1024}")
+    options.add_experimental_option("prefs", LEAN_PREFS)
+    return options
+
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """
+    Cancel matching requests (fonts, media, trackers that prefs can't turn off)
+    through CDP network interception. Lasts for the driver's session.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def page_transfer_stats(driver) -> dict:
+    """
+    Bytes over the network and load time for the current page, from the
+    Resource Timing API (blocked requests never show up; cache hits count 0 bytes).
+    """
+    return driver.execute_script("""
+        const nav = performance.getEntriesByType('navigation')[0] || {};
+        const resources = performance.getEntriesByType('resource');
+        return {
+            requests: resources.length + 1,
+            transfer_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), nav.transferSize || 0),
+            dom_content_loaded_ms: Math.round(nav.domContentLoadedEventEnd || 0),
+            load_ms: Math.round(nav.loadEventEnd || 0),
+        };
+    """)
@@ -0,0 +1,123 @@
+"""
+Inspect and prune the ingestion embedding cache and the query embedding cache.
+
+    python -m product_assistant.etl.cache_admin stats
+    python -m product_assistant.etl.cache_admin prune [--csv data/product_reviews.csv] [--dry-run]
+    python -m product_assistant.etl.cache_admin --query stats
+    python -m product_assistant.etl.cache_admin --query prune [--keep 10000] [--dry-run]
+
+--csv defaults to ingestion.source_path (a CSV or a Parquet dataset).
+
+`prune` keeps only vectors whose page_content is still produced by the current CSV.
+With --query it keeps the --keep most recently added query vectors (default:
+embedding_cache.max_entries). Pruning rewrites the store: stop the servers first.
+"""
+import os
+import json
+import argparse
+
+from product_assistant.etl.near_dedup import near_dedup_batches
+from product_assistant.etl.streaming import iter_document_batches
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.embedding_cache import DiskEmbeddingStore, make_content_key, signature_cache_dir
+from product_assistant.utils.model_loader import ModelLoader
+
+
+def _store(config, signature):
+    cache_cfg = config.get("ingestion", {}).get("embedding_cache", {})
+    cache_dir = signature_cache_dir(cache_cfg.get("cache_dir", "cache/document_embeddings"), signature)
+    if not os.path.exists(cache_dir):
+        raise SystemExit(f"No ingestion embedding cache at {cache_dir}")
+    return DiskEmbeddingStore(cache_dir, dtype=cache_cfg.get("dtype", "float32")), cache_dir
+
+
+def _query_store(config, signature):
+    cache_cfg = config.get("embedding_cache", {})
+    cache_dir = signature_cache_dir(cache_cfg.get("cache_dir", "cache/query_embeddings"), signature)
+    if not os.path.exists(cache_dir):
+        raise SystemExit(f"No query embedding cache at {cache_dir}")
+    return DiskEmbeddingStore(cache_dir, dtype=cache_cfg.get("dtype", "float16")), cache_dir
+
+
+def stats(store, cache_dir, signature):
+    return {
+        "signature": signature,
+        "cache_dir": cache_dir,
+        "entries": len(store),
+        "dimension": store.dimension,
+        "dtype": store.dtype,
+        "disk_mb": round(store.nbytes() / 1024 / 1024, 2),
+    }
+
+
+def prune(store, signature, csv_path, dry_run=False, near_dedup=None):
+    # Variants collapsed into a canonical document are never embedded: key what ingestion embeds
+    batches = iter_document_batches(csv_path)
+    if near_dedup is not None:
+        batches = near_dedup_batches(batches, 500, near_dedup)
+    live_keys = {
+        make_content_key(signature, doc.page_content)
+        for batch in batches
+        for doc in batch
+    }
+    stale = [key for key in store.keys() if key not in live_keys]
+    before = store.nbytes()
+    removed = len(stale) if dry_run else store.compact(live_keys)
+    return {
+        "live_texts": len(live_keys),
+        "stale_entries": len(stale),
+        "removed": removed,
+        "dry_run": dry_run,
+        "freed_mb": 0.0 if dry_run else round((before - store.nbytes()) / 1024 / 1024, 2),
+    }
+
+
+def prune_query_cache(store, keep, dry_run=False):
+    # Query vectors have no source of truth to diff against: keep the newest ones
+    live_keys = store.newest_keys(keep)
+    stale = len(store) - len(live_keys)
+    before = store.nbytes()
+    removed = stale if dry_run else store.compact(live_keys)
+    return {
+        "kept": len(live_keys),
+        "stale_entries": stale,
+        "removed": removed,
+        "dry_run": dry_run,
+        "freed_mb": 0.0 if dry_run else round((before - store.nbytes()) / 1024 / 1024, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", action="store_true", help="act on the query embedding cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="show cache size and entry count")
+    prune_parser = sub.add_parser("prune", help="drop vectors not used by the current CSV")
+    prune_parser.add_argument("--csv", help="product source (default: ingestion.source_path)")
+    prune_parser.add_argument("--keep", type=int, help="query vectors to keep (with --query)")
+    prune_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    config = load_config()
+    model_loader = ModelLoader()
+    # Query vectors of prefixed local models live in their own space (see ModelLoader.load_embeddings)
+    signature = model_loader.query_cache_space() if args.query else model_loader.embedding_signature()
+    store, cache_dir = (_query_store if args.query else _store)(config, signature)
+
+    if args.command == "stats":
+        result = stats(store, cache_dir, signature)
+    elif args.query:
+        keep = args.keep if args.keep is not None else config.get("embedding_cache", {}).get("max_entries", 10000)
+        result = prune_query_cache(store, keep, dry_run=args.dry_run)
+    else:
+        source = args.csv or config.get("ingestion", {}).get("source_path") or os.path.join("data", "product_reviews.csv")
+        result = prune(
+            store, signature, source,
+            dry_run=args.dry_run,
+            near_dedup=config.get("ingestion", {}).get("near_dedup", {}),
+        )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
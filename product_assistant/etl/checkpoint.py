@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import uuid
+import threading
+
+
+class IngestionCheckpoint:
+    """
+    Local progress record for one ingestion run, so a crashed run can resume.
+
+    Two files:
+        <path>                -> run info and status (rewritten atomically)
+        <path>.batches.jsonl  -> one {"batch": n, "ids": [...]} line per committed
+                                 batch, appended as batches land in the store
+
+    A torn last line (crash mid-write) is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.batches_path = f"{path}.batches.jsonl"
+        self.state = None
+        self.committed = {}
+        self._lock = threading.Lock()
+
+    # ---------- Load ----------
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.state = json.load(f)
+
+        self.committed = {}
+        if os.path.exists(self.batches_path):
+            with open(self.batches_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self.committed[entry["batch"]] = entry["ids"]
+        return self.state
+
+    def resumable(self, **expected) -> bool:
+        """
+        True if the stored run was interrupted and matches `expected` run info
+        (same source file, mode, embedding space, ...).
+        """
+        if not self.state or self.state.get("status") == "completed":
+            return False
+        return all(self.state.get(key) == value for key, value in expected.items())
+
+    # ---------- Write ----------
+    def _write_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def start(self, **run_info):
+        with self._lock:
+            self.state = {
+                "run_id": uuid.uuid4().hex[:12],
+                "status": "running",
+                "started_at": time.time(),
+                **run_info,
+            }
+            self.committed = {}
+            self._write_state()
+            if os.path.exists(self.batches_path):
+                os.remove(self.batches_path)
+
+    def resume(self):
+        with self._lock:
+            self.state["status"] = "running"
+            self.state["resumed_at"] = time.time()
+            self.state["resume_count"] = self.state.get("resume_count", 0) + 1
+            self._write_state()
+
+    def update(self, **fields):
+        with self._lock:
+            self.state.update(fields)
+            self._write_state()
+
+    def commit_batch(self, batch_no: int, ids):
+        with self._lock:
+            self.committed[batch_no] = list(ids)
+            with open(self.batches_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"batch": batch_no, "ids": self.committed[batch_no]}) + "\n")
+                f.flush()
+
+    def finish(self, status: str, **summary):
+        with self._lock:
+            self.state.update(status=status, finished_at=time.time(), **summary)
+            self._write_state()
+
+    # ---------- Queries ----------
+    def committed_batches(self) -> set:
+        with self._lock:
+            return set(self.committed)
+
+    def committed_documents(self) -> int:
+        with self._lock:
+            return sum(len(ids) for ids in self.committed.values())
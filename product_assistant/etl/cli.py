@@ -0,0 +1,200 @@
+"""
+Ingestion CLI: run, resume or cost-estimate a product catalog load.
+
+    python -m product_assistant.etl.cli                       # ingest with config defaults
+    python -m product_assistant.etl.cli --workers 8 --mode full
+    python -m product_assistant.etl.cli --resume              # continue an interrupted run
+    python -m product_assistant.etl.cli --dry-run             # size / cost estimate, no writes
+    python -m product_assistant.etl.cli --retire-versions     # drop blue/green versions past their grace period
+
+Progress is checkpointed to --state-file as batches are committed. A JSON
+summary (throughput, failures) is printed at the end and optionally written to
+--summary. The exit code is non-zero when any batch failed.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from product_assistant.etl.checkpoint import IngestionCheckpoint
+from product_assistant.etl.embed_pipeline import estimate_tokens
+from product_assistant.etl.near_dedup import near_dedup_batches
+from product_assistant.etl.streaming import iter_document_batches
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.embedding_cache import DiskEmbeddingStore, make_content_key, signature_cache_dir
+from product_assistant.utils.model_loader import OPENAI_DIMENSIONS, ModelLoader
+
+def _csv_fingerprint(csv_path):
+    stat = os.stat(csv_path)
+    return {"csv_path": os.path.abspath(csv_path), "csv_size": stat.st_size, "csv_mtime": int(stat.st_mtime)}
+
+
+def dry_run(config, csv_path):
+    """
+    Transform the CSV without touching the store and estimate what a load would cost.
+    Vectors already in the ingestion embedding cache are counted as free.
+    """
+    embedding_cfg = config.get("embedding_model", {})
+    signature = ModelLoader().embedding_signature()
+    streaming_cfg = config.get("ingestion", {}).get("streaming", {})
+
+    cache_cfg = config.get("ingestion", {}).get("embedding_cache", {})
+    store = None
+    if cache_cfg.get("enabled", False):
+        cache_dir = signature_cache_dir(cache_cfg.get("cache_dir", "cache/document_embeddings"), signature)
+        if os.path.exists(cache_dir):
+            store = DiskEmbeddingStore(cache_dir, dtype=cache_cfg.get("dtype", "float32"))
+
+    documents = tokens = tokens_to_embed = cached = content_bytes = 0
+    start = time.perf_counter()
+    batch_size = streaming_cfg.get("batch_size", 500)
+    # Same near-duplicate collapsing as ingestion, so counts and cost match what gets embedded
+    batches = near_dedup_batches(
+        iter_document_batches(csv_path, batch_size=batch_size),
+        batch_size,
+        config.get("ingestion", {}).get("near_dedup", {}),
+    )
+    for batch in batches:
+        for doc in batch:
+            doc_tokens = estimate_tokens(doc.page_content)
+            documents += 1
+            tokens += doc_tokens
+            content_bytes += len(doc.page_content.encode("utf-8")) + len(json.dumps(doc.metadata))
+            if store is not None and make_content_key(signature, doc.page_content) in store:
+                cached += 1
+            else:
+                tokens_to_embed += doc_tokens
+
+    local = embedding_cfg.get("provider", "openai") == "local"
+    price = 0.0 if local else embedding_cfg.get("cost_per_million_tokens", 0.02)
+    # `dimensions` only applies to OpenAI models
+    dimension = (
+        (None if local else embedding_cfg.get("dimensions"))
+        or (store.dimension if store is not None else None)
+        or (None if local else OPENAI_DIMENSIONS.get(embedding_cfg.get("model_name", "text-embedding-3-small")))
+    )
+    return {
+        "dry_run": True,
+        "csv": os.path.abspath(csv_path),
+        "embedding_signature": signature,
+        "documents": documents,
+        "estimated_tokens": tokens,
+        "cached_documents": cached,
+        "estimated_tokens_to_embed": tokens_to_embed,
+        "estimated_cost_usd": round(tokens_to_embed / 1_000_000 * price, 4),
+        "embedding_dimension": dimension,
+        "estimated_storage_mb": round((content_bytes + documents * (dimension or 0) * 4) / 1024 / 1024, 2),
+        "transform_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run(args, config):
+    # Imported here so --dry-run works without vector store credentials / clients
+    from product_assistant.etl.data_ingestion import DataIngestion
+
+    ingestion = DataIngestion(csv_path=args.csv)
+    ingestion.config = config
+
+    pipeline_cfg = config["ingestion"]["pipeline"]
+    run_info = {
+        **_csv_fingerprint(ingestion.csv_path),
+        "mode": config["ingestion"].get("mode", "incremental"),
+        "embedding_signature": ingestion.model_loader.embedding_signature(),
+        "collection": config["astra_db"]["collection_name"],
+        "batch_size": pipeline_cfg.get("batch_size", 64),
+    }
+
+    checkpoint = IngestionCheckpoint(args.state_file)
+    checkpoint.load()
+    resumed = False
+    if args.resume and checkpoint.resumable(**run_info):
+        checkpoint.resume()
+        resumed = True
+        print(
+            f"Resuming run {checkpoint.state['run_id']}: "
+            f"{len(checkpoint.committed_batches())} batches already committed."
+        )
+    else:
+        if args.resume:
+            print("Nothing to resume (no interrupted run with the same source and settings); starting fresh.")
+        elif checkpoint.resumable(**run_info):
+            print("An interrupted run exists for this source; starting over (use --resume to continue it).")
+        checkpoint.start(**run_info)
+
+    start = time.perf_counter()
+    try:
+        vstore, _ = ingestion.store_batches(ingestion.iter_document_batches(), checkpoint=checkpoint)
+    except Exception as e:
+        checkpoint.finish("failed", error=str(e))
+        raise
+
+    report = ingestion.last_report or {}
+    pipeline = report.get("pipeline", {})
+    failed = pipeline.get("failed_documents", 0)
+    status = "completed" if vstore is not None and failed == 0 else "failed"
+
+    summary = {
+        "run_id": checkpoint.state["run_id"],
+        "status": status,
+        "resumed": resumed,
+        "mode": run_info["mode"],
+        "csv": run_info["csv_path"],
+        "embedding_signature": run_info["embedding_signature"],
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+        "committed_documents": checkpoint.committed_documents(),
+        "pipeline": {k: v for k, v in pipeline.items() if not k.endswith("_ids")},
+        "failed_ids": pipeline.get("failed_ids", []),
+    }
+    if "sync" in report:
+        summary["sync"] = report["sync"]
+    if ingestion.document_cache is not None:
+        summary["embedding_cache"] = ingestion.document_cache.stats()
+
+    checkpoint.finish(status, summary={k: v for k, v in summary.items() if k != "failed_ids"})
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", help="product CSV or Parquet dataset (default: ingestion.source_path)")
+    parser.add_argument("--mode", choices=["incremental", "full", "blue_green"], help="override ingestion.mode")
+    parser.add_argument("--workers", type=int, help="embedding and insert workers (each)")
+    parser.add_argument("--batch-size", type=int, help="documents per embed/upsert batch")
+    parser.add_argument("--resume", action="store_true", help="continue the last interrupted run")
+    parser.add_argument("--dry-run", action="store_true", help="estimate size and embedding cost only")
+    parser.add_argument("--retire-versions", action="store_true", help="drop retired blue/green collection versions only")
+    parser.add_argument("--state-file", default=os.path.join("cache", "ingestion_state.json"))
+    parser.add_argument("--summary", help="also write the JSON summary to this path")
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    ingestion_cfg = config.setdefault("ingestion", {})
+    pipeline_cfg = ingestion_cfg.setdefault("pipeline", {})
+    if args.mode:
+        ingestion_cfg["mode"] = args.mode
+    if args.workers:
+        pipeline_cfg["embed_workers"] = pipeline_cfg["insert_workers"] = args.workers
+    if args.batch_size:
+        pipeline_cfg["batch_size"] = args.batch_size
+
+    if args.retire_versions:
+        from product_assistant.etl.data_ingestion import DataIngestion
+
+        summary = {"retired_collections": DataIngestion(records=[]).retire_collection_versions()}
+    elif args.dry_run:
+        source = args.csv or ingestion_cfg.get("source_path") or os.path.join("data", "product_reviews.csv")
+        summary = dry_run(config, source)
+    else:
+        summary = run(args, config)
+
+    output = json.dumps(summary, indent=2, default=str)
+    print(output)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    return 0 if summary.get("status", "completed") == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
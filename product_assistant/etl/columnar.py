@@ -0,0 +1,104 @@
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from product_assistant.utils.metadata_parser import parse_count, parse_price_inr, parse_rating
+
+# Typed scraper output. Price, rating and review count keep their display strings
+# ("₹64,900", "4", "12,345") next to the numeric values: documents are rendered from
+# those, so their content and hashes don't depend on the source format (see etl.streaming).
+# Values are cleaned when written (stripped, missing -> null), so readers don't clean them again.
+PRODUCT_SCHEMA = pa.schema([
+    ("product_id", pa.string()),
+    ("product_title", pa.string()),
+    ("rating", pa.float64()),
+    ("rating_text", pa.string()),
+    ("total_reviews", pa.int64()),
+    ("total_reviews_text", pa.string()),
+    ("price", pa.string()),
+    ("price_inr", pa.float64()),
+    ("top_reviews", pa.list_(pa.string())),
+    ("scraped_at", pa.timestamp("ms", tz="UTC")),
+    ("scrape_date", pa.string()),
+])
+
+INVALID_TITLES = ("", "Unknown Title", "N/A")
+
+# Columns ingestion actually reads (projection: scraped_at / scrape_date are never loaded)
+INGEST_COLUMNS = [
+    "product_id", "product_title", "rating", "rating_text", "total_reviews", "total_reviews_text",
+    "price", "price_inr", "top_reviews",
+]
+
+
+def is_parquet_source(path: str) -> bool:
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+def _display(value):
+    # Stripped display string; missing values are stored as null and read back as "N/A"
+    value = (value or "").strip()
+    return value if value and value != "N/A" else None
+
+
+def rows_to_table(rows, scraped_at=None) -> pa.Table:
+    """
+    Scraper rows ([product_id, title, rating, total_reviews, price, top_reviews])
+    to a typed Arrow table. Numbers are parsed and strings cleaned once here
+    instead of at every ingestion; invalid titles are stored as null.
+    """
+    scraped_at = scraped_at or datetime.now(timezone.utc)
+    columns = {name: [] for name in PRODUCT_SCHEMA.names}
+    for product_id, title, rating, total_reviews, price, top_reviews in rows:
+        title = (title or "").strip()
+        top_reviews = _display(top_reviews)
+        columns["product_id"].append((product_id or "").strip() or None)
+        columns["product_title"].append(title if title not in INVALID_TITLES else None)
+        columns["rating"].append(parse_rating(rating))
+        columns["rating_text"].append(_display(rating))
+        columns["total_reviews"].append(parse_count(total_reviews))
+        columns["total_reviews_text"].append(_display(total_reviews))
+        columns["price"].append(_display(price))
+        columns["price_inr"].append(parse_price_inr(price))
+        # Joined back with " || " this gives the scraped string exactly
+        columns["top_reviews"].append(top_reviews.split(" || ") if top_reviews else [])
+        columns["scraped_at"].append(scraped_at)
+        columns["scrape_date"].append(scraped_at.strftime("%Y-%m-%d"))
+    return pa.table(columns, schema=PRODUCT_SCHEMA)
+
+
+def write_parquet_dataset(table: pa.Table, root_path: str, partition_cols=("scrape_date",)) -> str:
+    """
+    Append a table to a Hive-partitioned Parquet dataset (e.g. root/scrape_date=2026-10-19/part-*.parquet).
+    """
+    os.makedirs(root_path, exist_ok=True)
+    pq.write_to_dataset(
+        table,
+        root_path=root_path,
+        partition_cols=list(partition_cols),
+        basename_template=f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return root_path
+
+
+def iter_parquet_batches(path: str, batch_size: int = 65_536):
+    """
+    Stream a Parquet file or partitioned dataset as Arrow record batches of the
+    ingestion columns. Newest scrapes come first so de-duplication keeps the
+    freshest row per product.
+    """
+    # The full schema lets files written before a column was added read it as null
+    dataset = ds.dataset(path, schema=PRODUCT_SCHEMA, format="parquet", partitioning="hive")
+    # Partition and file names sort by scrape time (see write_parquet_dataset)
+    fragments = sorted(dataset.get_fragments(), key=lambda f: f.path, reverse=True)
+
+    for fragment in fragments:
+        for batch in fragment.to_batches(schema=dataset.schema, columns=INGEST_COLUMNS, batch_size=batch_size):
+            if batch.num_rows:
+                yield batch
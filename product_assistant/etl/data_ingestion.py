@@ -1,5 +1,6 @@
 import os
 import math
+import time
 import pandas as pd
 
 from dotenv import load_dotenv
@@ -9,23 +10,57 @@ from langchain_core.documents import Document
 from langchain_astradb import AstraDBVectorStore
 
 from product_assistant.utils.model_loader import ModelLoader
+from product_assistant.utils.embedding_cache import DocumentEmbeddingCache, signature_cache_dir
 from product_assistant.utils.config_loader import load_config
+from product_assistant.etl.columnar import is_parquet_source
+from product_assistant.etl.embed_pipeline import EmbedUpsertPipeline
+from product_assistant.etl.incremental import add_fingerprints, plan_sync
+from product_assistant.etl.near_dedup import near_dedup_batches
+from product_assistant.etl.streaming import iter_document_batches, iter_record_batches
+from product_assistant.etl.vector_sink import AstraVectorSink
+from product_assistant.utils.collection_pointer import CollectionPointer, check_collection_dimension
+from product_assistant.utils.metadata_parser import (
+    detect_brand,
+    parse_count,
+    parse_price_inr,
+    parse_rating,
+)
 
 
 class DataIngestion:
 
-    def __init__(self):
+    def __init__(self, csv_path=None, records=None):
+        """
+        `records`: in-memory scraper rows (a list or any iterable, e.g. the output of
+        FlipkartScraper.scrape_flipkart_products) to ingest instead of a source file.
+        """
         print("Initializing DataIngestion pipeline...")
         self.model_loader = ModelLoader()
         self._load_env_variables()
-        self.csv_path = self._get_csv_path()
-        self.product_data = self._load_csv()
         self.config = load_config()
+        self.records = records
+        if records is not None:
+            self.csv_path = None
+            self.streaming = True
+        else:
+            self.csv_path = self._get_csv_path(csv_path or self.config.get("ingestion", {}).get("source_path"))
+            # Streaming mode reads the source block by block at ingestion time instead;
+            # Parquet sources (typed scraper output) are always streamed through Arrow.
+            self.streaming = (
+                self.config.get("ingestion", {}).get("streaming", {}).get("enabled", False)
+                or is_parquet_source(self.csv_path)
+            )
+        self.product_data = None if self.streaming else self._load_csv()
+        self.document_cache = None
+        self.last_report = None
+        self._live_vstore = None
 
     def _load_env_variables(self):
         load_dotenv()
-        required_vars = ["OPENAI_API_KEY", "ASTRA_DB_API_ENDPOINT",
-                         "ASTRA_DB_APPLICATION_TOKEN", "ASTRA_DB_KEYSPACE"]
+        required_vars = ["ASTRA_DB_API_ENDPOINT", "ASTRA_DB_APPLICATION_TOKEN", "ASTRA_DB_KEYSPACE"]
+        # A CPU-local embedding model needs no OpenAI key for ingestion
+        if self.model_loader.config.get("embedding_model", {}).get("provider", "openai") == "openai":
+            required_vars.insert(0, "OPENAI_API_KEY")
         missing = [v for v in required_vars if not os.getenv(v)]
         if missing:
             raise EnvironmentError(f"Missing environment variables: {missing}")
@@ -34,10 +69,10 @@ class DataIngestion:
         self.db_application_token = os.getenv("ASTRA_DB_APPLICATION_TOKEN")
         self.db_keyspace = os.getenv("ASTRA_DB_KEYSPACE")
 
-    def _get_csv_path(self):
-        path = os.path.join(os.getcwd(), "data", "product_reviews.csv")
+    def _get_csv_path(self, path=None):
+        path = path or os.path.join(os.getcwd(), "data", "product_reviews.csv")
         if not os.path.exists(path):
-            raise FileNotFoundError(f"CSV not found: {path}")
+            raise FileNotFoundError(f"Product source not found: {path}")
         return path
 
     def _load_csv(self):
@@ -56,6 +91,23 @@ class DataIngestion:
             return "N/A"
         return str(value).strip()
 
+    def _build_metadata(self, product_id, title, rating, total_reviews, price):
+        # Numeric fields are stored normalised so the retriever can filter on them;
+        # unparseable values are left out rather than stored as "N/A".
+        metadata = {
+            "product_id": product_id,
+            "product_title": title,
+            "price": price,
+        }
+        numeric = {
+            "price_inr": parse_price_inr(price),
+            "rating": parse_rating(rating),
+            "total_reviews": parse_count(total_reviews),
+            "brand": detect_brand(title),
+        }
+        metadata.update({k: v for k, v in numeric.items() if v is not None})
+        return metadata
+
     def transform_data(self):
         documents = []
         seen_ids = set()
@@ -86,59 +138,342 @@ class DataIngestion:
 
             doc = Document(
                 page_content=" | ".join(parts),
-                metadata={
-                    "product_id": product_id,
-                    "product_title": title,
-                    "rating": rating,
-                    "total_reviews": total_reviews,
-                    "price": price,
-                },
+                metadata=self._build_metadata(product_id, title, rating, total_reviews, price),
             )
+            # Title + reviews drive the embedding; price/rating changes alone don't need a re-embed
+            add_fingerprints(doc, f"{title}\x1f{top_reviews}")
             documents.append(doc)
 
         print(f"Transformed {len(documents)} valid documents.")
         return documents
 
+    def _collection_pointer(self):
+        astra_cfg = self.config["astra_db"]
+        return CollectionPointer(
+            api_endpoint=self.db_api_endpoint,
+            token=self.db_application_token,
+            keyspace=self.db_keyspace,
+            alias=astra_cfg["collection_name"],
+            pointer_collection=astra_cfg.get("alias", {}).get("pointer_collection"),
+        )
+
+    def _active_collection_name(self):
+        astra_cfg = self.config["astra_db"]
+        if astra_cfg.get("alias", {}).get("enabled", False):
+            return self._collection_pointer().resolve()
+        return astra_cfg["collection_name"]
+
+    def _vector_store(self, collection_name=None):
+        collection_name = collection_name or self._active_collection_name()
+        embeddings = self.model_loader.load_embeddings()
+        # Never write vectors of another dimension into an existing collection
+        check_collection_dimension(
+            self.db_api_endpoint,
+            self.db_application_token,
+            self.db_keyspace,
+            collection_name,
+            self.model_loader.embedding_dimension(embeddings),
+            self.model_loader.embedding_signature(),
+        )
+        return AstraDBVectorStore(
+            embedding=embeddings,
+            collection_name=collection_name,
+            api_endpoint=self.db_api_endpoint,
+            token=self.db_application_token,
+            namespace=self.db_keyspace,
+        )
+
+    def iter_document_batches(self, batch_size=None, records=None):
+        """
+        Yield Documents in batches for the embed/upsert stage.
+        In streaming mode the CSV is read block by block and never held in memory.
+        `records` (or the records given to the constructor) replace the source file.
+        """
+        streaming_cfg = self.config.get("ingestion", {}).get("streaming", {})
+        batch_size = batch_size or streaming_cfg.get("batch_size", 500)
+        records = records if records is not None else self.records
+
+        if records is not None:
+            batches = iter_record_batches(records, batch_size=batch_size)
+        elif self.product_data is None:
+            batches = iter_document_batches(
+                self.csv_path,
+                batch_size=batch_size,
+                block_size_mb=streaming_cfg.get("block_size_mb", 16),
+            )
+        else:
+            documents = self.transform_data()
+            batches = (documents[i : i + batch_size] for i in range(0, len(documents), batch_size))
+
+        yield from near_dedup_batches(batches, batch_size, self.config.get("ingestion", {}).get("near_dedup", {}))
+
     def store_in_vector_db(self, documents: List[Document]):
         if not documents:
             print("No valid documents to insert.")
             return None, []
+        return self.store_batches([documents])
 
-        collection_name = self.config["astra_db"]["collection_name"]
-        embeddings = self.model_loader.load_embeddings()
+    def store_batches(self, batches, checkpoint=None):
+        """
+        Write document batches with the configured ingestion mode.
+
+        With an IngestionCheckpoint, committed batches are recorded as they land;
+        a resumed full / blue-green run skips them (and doesn't clear the
+        collection or start a new shadow again). Incremental runs are naturally
+        resumable: already-upserted documents come back as unchanged.
+        """
+        print(f"Embedding space: {self.model_loader.embedding_signature()}")
+        mode = self.config.get("ingestion", {}).get("mode", "incremental")
+        if mode == "blue_green":
+            return self.rebuild_blue_green(batches, checkpoint=checkpoint)
+
+        vstore = self._vector_store()
+        if mode == "full":
+            if checkpoint is not None and checkpoint.state.get("cleared"):
+                print(f"Resuming: {checkpoint.committed_documents()} documents already committed.")
+            else:
+                vstore.clear()
+                print("🗑️ Cleared old collection data.")
+                if checkpoint is not None:
+                    checkpoint.update(cleared=True)
+            report = self._insert_batches(vstore, batches, checkpoint=checkpoint)
+            print(f"Successfully inserted {len(report['inserted_ids'])} documents into AstraDB.")
+            return vstore, report["inserted_ids"]
+
+        report = self.sync_batches(vstore, batches, checkpoint=checkpoint)
+        return vstore, report["upserted_ids"]
+
+    def ingest_records(self, records) -> dict:
+        """
+        Upsert freshly scraped rows into the live collection right away, e.g. after
+        each scraper query, so they are searchable without waiting for a full run.
 
-        # Clear old data first
-        try:
-            vstore = AstraDBVectorStore(
-                embedding=embeddings,
-                collection_name=collection_name,
-                api_endpoint=self.db_api_endpoint,
-                token=self.db_application_token,
-                namespace=self.db_keyspace,
+        Whatever ingestion.mode says, this is an incremental upsert: new / re-worded
+        products are embedded, metadata-only changes updated in place, unchanged
+        ones skipped, and nothing is deleted (the rows are only part of the catalog).
+        Fingerprints are looked up for the ingested product_ids only.
+        """
+        if self._live_vstore is None:
+            print(f"Embedding space: {self.model_loader.embedding_signature()}")
+            self._live_vstore = self._vector_store()
+        return self.sync_batches(
+            self._live_vstore, self.iter_document_batches(records=records), delete_missing=False
+        )
+
+    def _sink(self, vstore):
+        return AstraVectorSink(vstore)
+
+    def _document_cache(self, embeddings):
+        """
+        Wrap the ingestion embeddings with the content-addressed disk cache, if enabled.
+        """
+        cache_cfg = self.config.get("ingestion", {}).get("embedding_cache", {})
+        if not cache_cfg.get("enabled", False):
+            return embeddings
+
+        if self.document_cache is None:
+            signature = self.model_loader.embedding_signature()
+            self.document_cache = DocumentEmbeddingCache(
+                underlying=embeddings,
+                signature=signature,
+                cache_dir=signature_cache_dir(cache_cfg.get("cache_dir", "cache/document_embeddings"), signature),
+                dtype=cache_cfg.get("dtype", "float32"),
             )
-            vstore.clear()
-            print("🗑️ Cleared old collection data.")
-        except Exception as e:
-            print(f"⚠️ Could not clear collection: {e}")
+        return self.document_cache
 
-        vstore = AstraDBVectorStore(
-            embedding=embeddings,
-            collection_name=collection_name,
-            api_endpoint=self.db_api_endpoint,
-            token=self.db_application_token,
-            namespace=self.db_keyspace,
+    def _embed_pipeline(self, vstore, sink):
+        pipeline_cfg = self.config.get("ingestion", {}).get("pipeline", {})
+        return EmbedUpsertPipeline(
+            embeddings=self._document_cache(vstore.embeddings),
+            sink=sink,
+            batch_size=pipeline_cfg.get("batch_size", 64),
+            embed_workers=pipeline_cfg.get("embed_workers", 4),
+            insert_workers=pipeline_cfg.get("insert_workers", 4),
+            max_retries=pipeline_cfg.get("max_retries", 3),
+            backoff_seconds=pipeline_cfg.get("backoff_seconds", 1.0),
+        )
+
+    def _print_pipeline_report(self, report):
+        print(
+            f"Embed/upsert: {report['documents']} documents in {report['seconds']}s | "
+            f"{report['docs_per_second']} docs/s | ~{report['tokens_per_second']} tokens/s | "
+            f"retries={report['retries']} failed={report['failed_documents']}"
+        )
+        if self.document_cache is not None:
+            print(f"Ingestion embedding cache: {self.document_cache.stats()}")
+
+    def _insert_batches(self, vstore, batches, checkpoint=None):
+        sink = self._sink(vstore)
+        report = self._embed_pipeline(vstore, sink).run(
+            (doc for batch in batches for doc in batch),
+            skip_batches=checkpoint.committed_batches() if checkpoint is not None else frozenset(),
+            on_batch_committed=checkpoint.commit_batch if checkpoint is not None else None,
         )
-        inserted_ids = vstore.add_documents(documents)
-        print(f"Successfully inserted {len(inserted_ids)} documents into AstraDB.")
+        self._print_pipeline_report(report)
+        self.last_report = {"pipeline": report}
+        return report
+
+    def rebuild_blue_green(self, batches, checkpoint=None):
+        """
+        Build a new versioned collection next to the live one, validate it, then
+        switch the alias to it. Chat traffic keeps reading the old collection until
+        the switch. Versions retired more than the grace period ago are dropped
+        just before it.
+        """
+        bg_cfg = self.config.get("ingestion", {}).get("blue_green", {})
+        pointer = self._collection_pointer()
+        shadow_name = checkpoint.state.get("shadow_collection") if checkpoint is not None else None
+        if shadow_name:
+            print(f"Resuming shadow collection: {shadow_name}")
+        else:
+            shadow_name = pointer.new_version_name()
+            print(f"Building shadow collection: {shadow_name}")
+            if checkpoint is not None:
+                checkpoint.update(shadow_collection=shadow_name)
+        previously_committed = checkpoint.committed_documents() if checkpoint is not None else 0
+
+        start = time.perf_counter()
+        vstore = self._vector_store(shadow_name)
+        report = self._insert_batches(vstore, batches, checkpoint=checkpoint)
+        inserted_ids = report["inserted_ids"]
+        print(f"Inserted {len(inserted_ids)} documents into {shadow_name} in {time.perf_counter() - start:.1f}s")
+
+        if report["failed_documents"]:
+            # Keep the shadow so a resumed run only has to redo the failed batches
+            print(
+                f"❌ {report['failed_documents']} documents failed; alias not switched. "
+                f"Re-run with --resume to finish {shadow_name}."
+            )
+            return None, inserted_ids
+
+        expected_count = previously_committed + len(inserted_ids)
+        problems = self._validate_collection(vstore, expected_count=expected_count, config=bg_cfg)
+        if problems:
+            print(f"❌ Shadow collection failed validation, live collection left untouched: {problems}")
+            if bg_cfg.get("drop_failed", True):
+                pointer.database.drop_collection(shadow_name)
+            return None, []
+
+        # Versions retired by earlier switches whose grace period is over go first;
+        # the one this switch retires starts its own grace period now
+        self.retire_collection_versions(pointer, exclude=(shadow_name,))
+        previous = pointer.switch(shadow_name)
+        print(f"✅ Alias '{pointer.alias}' now points to {shadow_name} (was {previous or pointer.alias})")
         return vstore, inserted_ids
 
-    def run_pipeline(self):
-        documents = self.transform_data()
-        if not documents:
-            print("No documents available for vector search.")
-            return
+    def retire_collection_versions(self, pointer=None, exclude=()):
+        """
+        Drop versioned collections retired longer than blue_green.grace_seconds ago
+        (keeping blue_green.keep_versions for rollback). Also run on its own by
+        `python -m product_assistant.etl.cli --retire-versions`.
+        """
+        bg_cfg = self.config.get("ingestion", {}).get("blue_green", {})
+        pointer = pointer or self._collection_pointer()
+        retired = pointer.retire_old_versions(
+            grace_seconds=bg_cfg.get("grace_seconds", 3600),
+            keep=bg_cfg.get("keep_versions", 1),
+            exclude=exclude,
+        )
+        if retired:
+            print(f"🗑️ Retired old collection versions: {retired}")
+        return retired
+
+    def _validate_collection(self, vstore, expected_count: int, config: dict) -> list:
+        if expected_count == 0:
+            return ["no documents were ingested"]
+        problems = []
 
-        vstore, _ = self.store_in_vector_db(documents)
+        count = self._sink(vstore).count()
+        min_ratio = config.get("min_document_ratio", 1.0)
+        if count < expected_count * min_ratio:
+            problems.append(f"document count {count} < {expected_count * min_ratio:.0f}")
+
+        for query in config.get("sample_queries", []):
+            if not vstore.similarity_search(query, k=1):
+                problems.append(f"no results for sample query '{query}'")
+
+        return problems
+
+    def sync_documents(self, vstore, documents: List[Document]) -> dict:
+        return self.sync_batches(vstore, [documents])
+
+    def sync_batches(self, vstore, batches, checkpoint=None, delete_missing=True) -> dict:
+        """
+        Incrementally sync documents into the collection, keyed by product_id:
+            new / re-worded -> embed + upsert
+            metadata-only   -> update content and metadata, keep the stored vector
+            unchanged       -> skipped
+            disappeared     -> deleted (once every batch has been seen), unless
+                               `delete_missing` is False
+        """
+        sink = self._sink(vstore)
+        timings = {"diff": 0.0, "metadata_update": 0.0, "delete": 0.0}
+        counts = {"added": 0, "changed": 0, "metadata_only": 0, "unchanged": 0}
+        seen_ids = set()
+
+        # Without deletes only the batches' own ids matter, so skip the full scan
+        start = time.perf_counter()
+        existing = sink.fetch_fingerprints() if delete_missing else {}
+        timings["diff"] += time.perf_counter() - start
+
+        def documents_to_embed():
+            # Diffing and metadata-only updates happen as the pipeline pulls documents
+            for batch in batches:
+                start = time.perf_counter()
+                if not delete_missing:
+                    existing.update(sink.fetch_fingerprints(ids=[d.metadata["product_id"] for d in batch]))
+                plan = plan_sync(batch, existing, include_deletes=False)
+                seen_ids.update(d.metadata["product_id"] for d in batch)
+                timings["diff"] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                sink.update_content([(d.metadata["product_id"], d) for d in plan["to_update"]])
+                timings["metadata_update"] += time.perf_counter() - start
+
+                added = sum(1 for d in plan["to_embed"] if d.metadata["product_id"] not in existing)
+                counts["added"] += added
+                counts["changed"] += len(plan["to_embed"]) - added
+                counts["metadata_only"] += len(plan["to_update"])
+                counts["unchanged"] += len(plan["unchanged"])
+                yield from plan["to_embed"]
+
+        pipeline_report = self._embed_pipeline(vstore, sink).run(
+            documents_to_embed(),
+            on_batch_committed=checkpoint.commit_batch if checkpoint is not None else None,
+        )
+        self._print_pipeline_report(pipeline_report)
+        timings["embed_upsert"] = pipeline_report["seconds"]
+
+        deleted = 0
+        if delete_missing and seen_ids:
+            start = time.perf_counter()
+            deleted = sink.delete([doc_id for doc_id in existing if doc_id not in seen_ids])
+            timings["delete"] += time.perf_counter() - start
+        elif delete_missing:
+            # An empty source is far more likely a broken scrape than an empty catalog
+            print("No valid documents in the source; skipping deletes.")
+
+        report = {
+            **counts,
+            "deleted": deleted,
+            "failed": pipeline_report["failed_documents"],
+            "timings_seconds": {k: round(v, 3) for k, v in timings.items()},
+            "pipeline": {k: v for k, v in pipeline_report.items() if not k.endswith("_ids")},
+            "upserted_ids": pipeline_report["inserted_ids"],
+        }
+        self.last_report = {
+            "pipeline": pipeline_report,
+            "sync": {k: v for k, v in report.items() if k not in ("upserted_ids", "pipeline")},
+        }
+        print(
+            f"Incremental sync: added={report['added']} changed={report['changed']} "
+            f"metadata_only={report['metadata_only']} unchanged={report['unchanged']} "
+            f"deleted={report['deleted']} failed={report['failed']} | timings={report['timings_seconds']}"
+        )
+        return report
+
+    def run_pipeline(self):
+        vstore, inserted_ids = self.store_batches(self.iter_document_batches())
         if not vstore:
             return
 
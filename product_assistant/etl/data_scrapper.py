@@ -2,6 +2,8 @@ import csv
 import time
 import re
 import os
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
@@ -9,18 +11,92 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from product_assistant.etl.browser_profile import (
+    BLOCKED_URL_PATTERNS,
+    apply_lean_options,
+    block_resources,
+    slot_profile_dir,
+)
+from product_assistant.etl.columnar import rows_to_table, write_parquet_dataset
+from product_assistant.etl.driver_pool import DriverPool
+from product_assistant.etl.html_extract import REVIEW_SKIP, parse_reviews, parse_search_cards
+from product_assistant.etl.http_fetcher import HttpFetcher
+from product_assistant.etl.page_state import extract_initial_state, products_from_state, reviews_from_state
+from product_assistant.etl.scrape_metrics import FetchPathLog, PhaseTimings
+from product_assistant.etl.throttle import DomainThrottle
+from product_assistant.utils.config_loader import load_config
+
+REVIEW_SELECTORS = ["div.ZmyHeo", "div.t-ZTKy", "div._27M-vq",
+                    "div.col.EPCmJX", "div._6K-7Co", "div.row.gHabs0"]
+_REVIEW_CSS = ", ".join(REVIEW_SELECTORS)
+_CLOSE_POPUP_XPATH = "//button[contains(text(),'✕')]"
+
+# Upper bounds for the readiness waits (see scraper.waits in config.yaml)
+DEFAULT_WAITS = {
+    "search_timeout_seconds": 20,
+    "search_settle_seconds": 3,
+    "reviews_timeout_seconds": 5,
+    "scroll_timeout_seconds": 1.5,
+    "max_scrolls": 3,
+    "stable_seconds": 0.5,
+    "poll_seconds": 0.1,
+}
 
 
 class FlipkartScraper:
 
-    def __init__(self, output_dir="data"):
+    def __init__(self, output_dir="data", config=None):
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
-
-    def _make_driver(self):
+        self.config = (config if config is not None else load_config()).get("scraper", {})
+        pool_cfg = self.config.get("driver_pool", {})
+        # Chrome startup is the expensive part: keep a few drivers warm across queries
+        self.driver_pool = DriverPool(
+            self._make_driver,
+            max_size=pool_cfg.get("max_drivers", 2),
+            max_pages_per_driver=pool_cfg.get("max_pages_per_driver", 50),
+            acquire_timeout=pool_cfg.get("acquire_timeout_seconds"),
+        )
+        self.review_concurrency = self.config.get("reviews", {}).get("concurrency", 3)
+        self.throttle = DomainThrottle(self.config.get("politeness", {}).get("min_interval_seconds", 1.0))
+        self.waits = {**DEFAULT_WAITS, **self.config.get("waits", {})}
+        self.timings = PhaseTimings()
+        self.base_url = self.config.get("base_url", "https://www.flipkart.com").rstrip("/")
+        # Server-rendered pages are tried with plain HTTP first; Chrome is the fallback
+        http_cfg = self.config.get("http", {})
+        self.http = None
+        if http_cfg.get("enabled", True):
+            self.http = HttpFetcher(
+                timeout_seconds=http_cfg.get("timeout_seconds", 10),
+                pool_size=http_cfg.get("pool_size", 10),
+            )
+        self.fetch_log = FetchPathLog()
+        # "lxml": compiled XPath extraction (html_extract); "bs4": the original BeautifulSoup walk
+        self.parser = self.config.get("parser", "lxml")
+        # Read products / reviews from the page's embedded JSON state when present
+        self.use_page_state = self.config.get("page_state", True)
+        discovery_cfg = self.config.get("discovery", {})
+        self.page_concurrency = max(1, discovery_cfg.get("page_concurrency", 3))
+        self.max_pages = discovery_cfg.get("max_pages", 25)
+
+    def close(self):
+        self.driver_pool.close()
+        if self.http is not None:
+            self.http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _make_driver(self, slot=0):
+        browser_cfg = self.config.get("browser", {})
+        lean = browser_cfg.get("lean", True)
         for attempt in range(3):
             try:
-                time.sleep(2)
                 options = uc.ChromeOptions()
                 options.add_argument("--no-sandbox")
                 options.add_argument("--disable-dev-shm-usage")
@@ -28,8 +104,21 @@ class FlipkartScraper:
                 options.add_argument("--window-size=1920,1080")
                 options.add_argument("--disable-extensions")
                 options.add_argument("--disable-gpu")
-                driver = uc.Chrome(options=options, use_subprocess=True, version_main=145)
-                time.sleep(1)
+
+                profile_dir = None
+                if lean:
+                    profile_dir = slot_profile_dir(browser_cfg.get("profile_dir", "cache/chrome_profiles"), slot)
+                    apply_lean_options(options, profile_dir, browser_cfg.get("disk_cache_mb", 256))
+
+                driver = uc.Chrome(
+                    options=options,
+                    use_subprocess=True,
+                    version_main=145,
+                    headless=browser_cfg.get("headless", True),
+                    user_data_dir=profile_dir,
+                )
+                if lean:
+                    block_resources(driver, BLOCKED_URL_PATTERNS + browser_cfg.get("extra_blocked_urls", []))
                 return driver
             except Exception as e:
                 print(f"⚠️ Driver launch attempt {attempt + 1} failed: {e}")
@@ -39,13 +128,68 @@ class FlipkartScraper:
     def _safe_get(self, driver, url, retries=2):
         for attempt in range(retries):
             try:
+                self.throttle.wait(url)
+                start = time.perf_counter()
                 driver.get(url)
+                self.driver_pool.record_page(driver, time.perf_counter() - start)
                 return True
             except Exception as e:
                 print(f"⚠️ Navigation attempt {attempt + 1} failed: {e}")
                 time.sleep(2)
         return False
 
+    def _wait_for_elements(self, driver, css, target, timeout):
+        """
+        Wait until at least `target` elements match `css`, or the loaded page's
+        match count has stopped changing for `stable_seconds`, or `timeout` runs out.
+        Returns the last count seen.
+        """
+        state = {"count": -1, "changed_at": time.monotonic()}
+
+        def ready(d):
+            count = len(d.find_elements(By.CSS_SELECTOR, css))
+            now = time.monotonic()
+            if count != state["count"]:
+                state["count"], state["changed_at"] = count, now
+            if count >= target:
+                return True
+            return (now - state["changed_at"] >= self.waits["stable_seconds"]
+                    and d.execute_script("return document.readyState") == "complete")
+
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=self.waits["poll_seconds"]).until(ready)
+        except TimeoutException:
+            pass
+        return max(state["count"], 0)
+
+    def _scroll_until_enough(self, driver, css, target, found):
+        """
+        Scroll to the end until `target` elements match `css` or the page stops
+        growing (lazy-loaded reviews), at most `max_scrolls` times.
+        """
+        for _ in range(self.waits["max_scrolls"]):
+            if found >= target:
+                break
+            height = driver.execute_script("return document.body.scrollHeight")
+            ActionChains(driver).send_keys(Keys.END).perform()
+            try:
+                WebDriverWait(driver, self.waits["scroll_timeout_seconds"], poll_frequency=self.waits["poll_seconds"]).until(
+                    lambda d: d.execute_script("return document.body.scrollHeight") > height
+                    or len(d.find_elements(By.CSS_SELECTOR, css)) >= target
+                )
+            except TimeoutException:
+                break
+            found = len(driver.find_elements(By.CSS_SELECTOR, css))
+        return found
+
+    def _close_popup(self, driver):
+        # find_elements returns immediately when there is no login popup
+        for button in driver.find_elements(By.XPATH, _CLOSE_POPUP_XPATH):
+            try:
+                button.click()
+            except Exception:
+                pass
+
     def _extract_price(self, card):
         for sel in ["div.Nx9bqj", "div._30jeq3", "div._1_WHN1", "div.hl05eU"]:
             tag = card.select_one(sel)
@@ -83,153 +227,318 @@ class FlipkartScraper:
     def _get_reviews_with_driver(self, driver, product_url, count=2):
         try:
             reviews_url = self._to_reviews_url(product_url)
-            ok = self._safe_get(driver, reviews_url)
+            with self.timings.time("reviews_load"):
+                ok = self._safe_get(driver, reviews_url)
             if not ok:
                 return ""
 
-            time.sleep(5)
-
-            try:
-                driver.find_element(By.XPATH, "//button[contains(text(),'✕')]").click()
-                time.sleep(1)
-            except Exception:
-                pass
-
-            for _ in range(3):
-                ActionChains(driver).send_keys(Keys.END).perform()
-                time.sleep(1.5)
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-
-            SKIP = ["warranty", "flipkart internet", "bengaluru", "face id",
-                    "barometer", "hevc", "aac lc", "handset", "sar limit",
-                    "contrast ratio", "true tone", "lightning connector"]
-
-            reviews = []
-            seen = set()
-
-            # Strategy 1: known selectors
-            for sel in ["div.ZmyHeo", "div.t-ZTKy", "div._27M-vq",
-                        "div.col.EPCmJX", "div._6K-7Co", "div.row.gHabs0"]:
-                for block in soup.select(sel):
-                    text = block.get_text(separator=" ", strip=True)
-                    if (text and text not in seen and 30 < len(text) < 600
-                            and not any(k in text.lower() for k in SKIP)):
-                        reviews.append(text)
-                        seen.add(text)
-                    if len(reviews) >= count:
-                        break
-                if len(reviews) >= count:
-                    break
-
-            # Strategy 2: scan all leaf divs as fallback
-            if not reviews:
-                for tag in soup.find_all("div"):
-                    if tag.find("div"):
-                        continue
-                    text = tag.get_text(separator=" ", strip=True)
-                    if (text and text not in seen and 40 < len(text) < 500
-                            and not any(k in text.lower() for k in SKIP)):
-                        reviews.append(text)
-                        seen.add(text)
-                    if len(reviews) >= count:
-                        break
+            with self.timings.time("reviews_ready"):
+                found = self._wait_for_elements(driver, _REVIEW_CSS, count, self.waits["reviews_timeout_seconds"])
+                self._close_popup(driver)
+            with self.timings.time("reviews_scroll"):
+                self._scroll_until_enough(driver, _REVIEW_CSS, count, found)
 
+            with self.timings.time("reviews_parse"):
+                reviews = self._parse_reviews(driver.page_source, count)
             print(f"    📝 Reviews fetched: {len(reviews)}")
-            return " || ".join(reviews) if reviews else ""
+            return " || ".join(reviews)
 
         except Exception as e:
             print(f"    ❌ Review fetch error: {e}")
             return ""
 
+    def _parse_reviews(self, html, count):
+        start = time.perf_counter()
+        state = extract_initial_state(html) if self.use_page_state else None
+        reviews = reviews_from_state(state, count, skip=REVIEW_SKIP) if state else []
+        if reviews:
+            self.timings.record("reviews_extract_json", time.perf_counter() - start)
+            return reviews
+
+        if self.parser == "lxml":
+            reviews = parse_reviews(html, count)
+        else:
+            reviews = self._bs4_parse_reviews(html, count)
+        self.timings.record("reviews_extract_dom", time.perf_counter() - start)
+        return reviews
+
+    def _bs4_parse_reviews(self, html, count):
+        soup = BeautifulSoup(html, "html.parser")
+
+        reviews = []
+        seen = set()
+
+        # Strategy 1: known selectors
+        for sel in REVIEW_SELECTORS:
+            for block in soup.select(sel):
+                text = block.get_text(separator=" ", strip=True)
+                if (text and text not in seen and 30 < len(text) < 600
+                        and not any(k in text.lower() for k in REVIEW_SKIP)):
+                    reviews.append(text)
+                    seen.add(text)
+                if len(reviews) >= count:
+                    break
+            if len(reviews) >= count:
+                break
+
+        # Strategy 2: scan all leaf divs as fallback
+        if not reviews:
+            for tag in soup.find_all("div"):
+                if tag.find("div"):
+                    continue
+                text = tag.get_text(separator=" ", strip=True)
+                if (text and text not in seen and 40 < len(text) < 500
+                        and not any(k in text.lower() for k in REVIEW_SKIP)):
+                    reviews.append(text)
+                    seen.add(text)
+                if len(reviews) >= count:
+                    break
+
+        return reviews
+
     # ------------------------------------------------------------------ #
     # PRODUCTS
     # ------------------------------------------------------------------ #
 
-    def scrape_flipkart_products(self, query, max_products=3, review_count=2):
-        driver = None
-        try:
-            driver = self._make_driver()
-            search_url = "https://www.flipkart.com/search?q=" + query.replace(" ", "+")
+    def scrape_flipkart_products(self, query, max_products=3, review_count=2, seen=None):
+        """
+        Up to `max_products` products for `query`, with reviews, following result
+        pages as needed (see iter_products).
+        """
+        return [row for rows in self.iter_products(query, max_products, review_count, seen) for row in rows]
+
+    def iter_products(self, query, max_products=3, review_count=2, seen=None):
+        """
+        Discover products for `query` page by page (&page=N) until `max_products`
+        new ones are found, the results run out or scraper.discovery.max_pages is
+        reached. Yields the rows of each results page as soon as its reviews are in.
+
+        Products are de-duplicated by product_id against `seen`, which is updated in
+        place: pass the same set for several queries to skip products already found.
+        After the first page, up to scraper.discovery.page_concurrency pages are
+        fetched at once; the per-domain politeness delay still applies.
+        """
+        seen = set() if seen is None else seen
+        query_keys = set()
+        found = 0
+        page = 1
+        pages_fetched = 0
+        per_page = None
+
+        with ThreadPoolExecutor(max_workers=self.page_concurrency, thread_name_prefix="search") as executor:
+            while found < max_products and page <= self.max_pages:
+                # Page 1 alone (its size tells how many more pages are needed), then waves
+                if per_page is None:
+                    wave_size = 1
+                else:
+                    pages_needed = -(-(max_products - found) // per_page)
+                    wave_size = min(self.page_concurrency, pages_needed)
+                wave = list(range(page, min(page + wave_size, self.max_pages + 1)))
+                page = wave[-1] + 1
+
+                exhausted = False
+                for page_no, product_info in zip(wave, executor.map(lambda n: self._search_page(query, n), wave)):
+                    if found >= max_products:
+                        break
+                    pages_fetched += 1
+                    keys = [self._product_key(product) for product in product_info]
+                    if not keys or query_keys.issuperset(keys):
+                        # Empty page, or past the last one (the site repeats it)
+                        print(f"  🏁 No more results for '{query}' on page {page_no} ({pages_fetched} page(s) fetched)")
+                        exhausted = True
+                        break
+                    query_keys.update(keys)
+                    per_page = per_page or len(product_info)
+
+                    new = []
+                    for key, product in zip(keys, product_info):
+                        if key not in seen and len(new) < max_products - found:
+                            seen.add(key)
+                            new.append(product)
+                    print(f"  📄 Page {page_no}: {len(new)} new of {len(product_info)} products")
+                    if not new:
+                        continue
+                    found += len(new)
+
+                    reviews = self._fetch_reviews([(title, link) for _, title, _, _, _, link in new], review_count)
+                    yield [
+                        [product_id, title, rating, total_reviews, price, top_reviews]
+                        for (product_id, title, rating, total_reviews, price, _), top_reviews in zip(new, reviews)
+                    ]
+                if exhausted:
+                    break
 
-            ok = self._safe_get(driver, search_url)
+    @staticmethod
+    def _product_key(product):
+        product_id, _, _, _, _, product_link = product
+        return product_id if product_id != "N/A" else product_link
+
+    def _search_url(self, query, page=1):
+        search_url = f"{self.base_url}/search?q=" + query.replace(" ", "+")
+        return search_url if page == 1 else f"{search_url}&page={page}"
+
+    def _search_page(self, query, page):
+        """
+        All products on one search results page: plain HTTP first, Chrome as the fallback.
+        """
+        search_url = self._search_url(query, page)
+
+        product_info = None
+        fallback_reason = None
+        if self.http is not None:
+            product_info, fallback_reason = self._search_with_http(search_url, None)
+        if product_info is None:
+            start = time.perf_counter()
+            product_info = self._search_with_browser(search_url, None)
+            self.fetch_log.record(search_url, "search", "browser", time.perf_counter() - start, fallback_reason)
+        return product_info
+
+    def _search_with_http(self, search_url, max_products):
+        """
+        Fast path: plain HTTP GET + the same card parsing as the browser path.
+        Returns (product_info, None), or (None, reason) to fall back to the browser.
+        """
+        start = time.perf_counter()
+        self.throttle.wait(search_url)
+        with self.timings.time("search_http"):
+            html, reason = self.http.get_html(search_url)
+        if html is None:
+            return None, reason
+        product_info = self._parse_search_results(html, max_products)
+        if not product_info:
+            return None, "no product cards"
+        self.fetch_log.record(search_url, "search", "http", time.perf_counter() - start)
+        return product_info, None
+
+    def _search_with_browser(self, search_url, max_products):
+        with self.driver_pool.driver() as driver:
+            with self.timings.time("search_load"):
+                ok = self._safe_get(driver, search_url)
             if not ok:
                 print("❌ Could not load Flipkart search page.")
                 return []
 
-            try:
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-id]"))
-                )
-            except Exception:
-                print("⚠️ Timed out waiting for products to load.")
-                return []
-
-            time.sleep(3)
-
-            try:
-                driver.find_element(By.XPATH, "//button[contains(text(),'✕')]").click()
-                time.sleep(1)
-            except Exception:
-                pass
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            cards = soup.select("div[data-id]")[:max_products]
-            print(f"=== FOUND {len(cards)} product cards ===")
-
-            product_info = []
-            for card in cards:
+            with self.timings.time("search_ready"):
                 try:
-                    img = card.select_one("img.UCc1lI, img[alt]")
-                    title = img["alt"].strip() if img and img.get("alt") else "Unknown Title"
-
-                    link_tag = card.select_one("a[href*='/p/']")
-                    if not link_tag:
-                        continue
-                    href = link_tag.get("href", "")
-                    product_link = (
-                        href if href.startswith("http")
-                        else "https://www.flipkart.com" + href
+                    WebDriverWait(driver, self.waits["search_timeout_seconds"]).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-id]"))
                     )
-                    match = re.findall(r"/p/(itm[0-9A-Za-z]+)", href)
-                    product_id = match[0] if match else "N/A"
-
-                    price = self._extract_price(card)
-                    rating = self._extract_rating(card)
-
-                    reviews_tag = card.select_one("span.Wphh3N, span._2_R_DZ, span._13vcmD")
-                    total_reviews = "N/A"
-                    if reviews_tag:
-                        m = re.search(r"\d+(,\d+)?", reviews_tag.get_text(strip=True))
-                        total_reviews = m.group(0) if m else "N/A"
-
-                    print(f"  ✅ {title} | {price} | ⭐{rating} | {product_id}")
-                    product_info.append((product_id, title, rating, total_reviews, price, product_link))
+                except Exception:
+                    print("⚠️ Timed out waiting for products to load.")
+                    return []
+
+                # Done as soon as enough cards are there or the result list stops growing
+                target = max_products if max_products is not None else float("inf")
+                self._wait_for_elements(driver, "div[data-id]", target, self.waits["search_settle_seconds"])
+                self._close_popup(driver)
+
+            return self._parse_search_results(driver.page_source, max_products)
+
+    def _parse_search_results(self, html, max_products):
+        start = time.perf_counter()
+        state = extract_initial_state(html) if self.use_page_state else None
+        product_info = products_from_state(state, max_products, self.base_url) if state else []
+        if product_info:
+            self.timings.record("search_extract_json", time.perf_counter() - start)
+            print(f"=== FOUND {len(product_info)} products in page state ===")
+        else:
+            # No (usable) embedded state: walk the product cards
+            if self.parser == "lxml":
+                card_count, product_info = parse_search_cards(html, max_products, self.base_url)
+            else:
+                card_count, product_info = self._bs4_search_cards(html, max_products)
+            self.timings.record("search_extract_dom", time.perf_counter() - start)
+            print(f"=== FOUND {card_count} product cards ===")
+        for product_id, title, rating, _, price, _ in product_info:
+            print(f"  ✅ {title} | {price} | ⭐{rating} | {product_id}")
+        return product_info
+
+    def _bs4_search_cards(self, html, max_products):
+        soup = BeautifulSoup(html, "html.parser")
+        cards = soup.select("div[data-id]")[:max_products]
+
+        product_info = []
+        for card in cards:
+            try:
+                img = card.select_one("img.UCc1lI, img[alt]")
+                title = img["alt"].strip() if img and img.get("alt") else "Unknown Title"
 
-                except Exception as e:
-                    print(f"  ❌ Card error: {e}")
+                link_tag = card.select_one("a[href*='/p/']")
+                if not link_tag:
                     continue
+                href = link_tag.get("href", "")
+                product_link = (
+                    href if href.startswith("http")
+                    else self.base_url + href
+                )
+                match = re.findall(r"/p/(itm[0-9A-Za-z]+)", href)
+                product_id = match[0] if match else "N/A"
 
-            products = []
-            for product_id, title, rating, total_reviews, price, product_link in product_info:
-                print(f"  🔍 Getting reviews: {title}")
-                top_reviews = self._get_reviews_with_driver(driver, product_link, count=review_count)
-                products.append([product_id, title, rating, total_reviews, price, top_reviews])
+                price = self._extract_price(card)
+                rating = self._extract_rating(card)
 
-            return products
+                reviews_tag = card.select_one("span.Wphh3N, span._2_R_DZ, span._13vcmD")
+                total_reviews = "N/A"
+                if reviews_tag:
+                    m = re.search(r"\d+(,\d+)?", reviews_tag.get_text(strip=True))
+                    total_reviews = m.group(0) if m else "N/A"
 
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
+                product_info.append((product_id, title, rating, total_reviews, price, product_link))
+
+            except Exception as e:
+                print(f"  ❌ Card error: {e}")
+                continue
+
+        return len(cards), product_info
+
+    def _fetch_reviews(self, products, count):
+        """
+        Fetch review pages for (title, product_url) pairs concurrently, at most
+        scraper.reviews.concurrency at a time and within the per-domain politeness
+        delay. Each page is tried over plain HTTP first, then on a pooled driver.
+        Results keep the order of `products`.
+        """
+        def fetch(product):
+            title, product_url = product
+            print(f"  🔍 Getting reviews: {title}")
+            reviews_url = self._to_reviews_url(product_url)
+            start = time.perf_counter()
+
+            fallback_reason = None
+            if self.http is not None:
+                self.throttle.wait(reviews_url)
+                with self.timings.time("reviews_http"):
+                    html, fallback_reason = self.http.get_html(reviews_url)
+                if html is not None:
+                    reviews = self._parse_reviews(html, count)
+                    if reviews:
+                        self.fetch_log.record(reviews_url, "reviews", "http", time.perf_counter() - start)
+                        print(f"    📝 Reviews fetched: {len(reviews)}")
+                        return " || ".join(reviews)
+                    fallback_reason = "no review blocks"
+
+            with self.driver_pool.driver() as driver:
+                top_reviews = self._get_reviews_with_driver(driver, product_url, count=count)
+            self.fetch_log.record(reviews_url, "reviews", "browser", time.perf_counter() - start, fallback_reason)
+            return top_reviews
+
+        start = time.perf_counter()
+        workers = max(1, min(self.review_concurrency, len(products)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reviews") as executor:
+            reviews = list(executor.map(fetch, products))
+        print(f"  ⏱️ Reviews for {len(products)} products in {time.perf_counter() - start:.1f}s ({workers} workers)")
+        return reviews
 
     # ------------------------------------------------------------------ #
     # CSV
     # ------------------------------------------------------------------ #
 
-    def save_to_csv(self, data, filename="product_reviews.csv"):
+    @contextmanager
+    def csv_stream(self, filename="product_reviews.csv"):
+        """
+        Open a CSV (header written) and yield a `write(rows)` function that appends
+        and flushes rows, so output grows while scraping is still going on.
+        """
         if os.path.isabs(filename) or os.path.dirname(filename):
             path = filename
             os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -239,6 +548,30 @@ class FlipkartScraper:
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"])
-            writer.writerows(data)
+
+            def write(rows):
+                writer.writerows(rows)
+                f.flush()
+
+            yield write
 
         print(f"Saved CSV at -> {path}")
+
+    def save_to_csv(self, data, filename="product_reviews.csv"):
+        with self.csv_stream(filename) as write:
+            write(data)
+
+    def save_to_parquet(self, data, dataset_name="product_reviews_parquet", scraped_at=None):
+        """
+        Append rows to a typed, date-partitioned Parquet dataset
+        (numeric price/rating/review counts, list-typed reviews, scrape timestamp).
+        Point ingestion.source_path at the dataset directory to ingest it.
+        """
+        if os.path.isabs(dataset_name) or os.path.dirname(dataset_name):
+            path = dataset_name
+        else:
+            path = os.path.join(self.output_dir, dataset_name)
+
+        write_parquet_dataset(rows_to_table(data, scraped_at=scraped_at), path)
+        print(f"Saved Parquet dataset at -> {path}")
+        return path
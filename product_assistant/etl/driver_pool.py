@@ -0,0 +1,197 @@
+import time
+import threading
+from contextlib import contextmanager
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "slot", "pages")
+
+    def __init__(self, driver, slot: int):
+        self.driver = driver
+        self.slot = slot
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of warm browser drivers shared across scraper queries.
+
+    `factory(slot)` launches a driver; `slot` (0 .. max_size - 1) is unique among
+    live drivers, e.g. for a per-slot browser profile. At most `max_size` drivers
+    exist at once; callers borrow one with `with pool.driver() as driver:` and
+    block while all are leased. Idle drivers are health-checked before being handed out, and a
+    driver is quit and replaced after `max_pages_per_driver` page loads, when a
+    health check fails, or when the code holding it crashed the session.
+    """
+
+    def __init__(self, factory, max_size: int = 2, max_pages_per_driver: int = 50, acquire_timeout: float | None = None):
+        self._factory = factory
+        self.max_size = max_size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.acquire_timeout = acquire_timeout
+
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: list[_PooledDriver] = []   # LIFO: the most recently used driver is the warmest
+        self._leased: dict[int, _PooledDriver] = {}
+        self._free_slots = list(range(max_size - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._metrics = {
+            "leases": 0,
+            "acquire_wait_seconds": 0.0,
+            "drivers_started": 0,
+            "startup_seconds": 0.0,
+            "startup_failures": 0,
+            "pages": 0,
+            "page_seconds": 0.0,
+            "recycled": 0,
+            "unhealthy": 0,
+        }
+
+    # ---------- Leasing ----------
+    @contextmanager
+    def driver(self):
+        entry = self._acquire()
+        crashed = False
+        try:
+            yield entry.driver
+        except BaseException:
+            crashed = True
+            raise
+        finally:
+            self._release(entry, check_health=crashed)
+
+    def _acquire(self) -> _PooledDriver:
+        if self._closed:
+            raise RuntimeError("Driver pool is closed.")
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No browser driver available after {self.acquire_timeout}s.")
+
+        try:
+            entry = self._take_idle()
+            if entry is None:
+                entry = self._start()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._leased[id(entry.driver)] = entry
+            self._metrics["leases"] += 1
+            self._metrics["acquire_wait_seconds"] += time.perf_counter() - start
+        return entry
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                entry = self._idle.pop()
+            if self._is_healthy(entry.driver):
+                return entry
+            self._discard(entry, "unhealthy")
+
+    def _start(self) -> _PooledDriver:
+        with self._lock:
+            slot = self._free_slots.pop()
+        start = time.perf_counter()
+        try:
+            driver = self._factory(slot)
+        except Exception:
+            with self._lock:
+                self._metrics["startup_failures"] += 1
+                self._free_slots.append(slot)
+            raise
+        with self._lock:
+            self._metrics["drivers_started"] += 1
+            self._metrics["startup_seconds"] += time.perf_counter() - start
+        return _PooledDriver(driver, slot)
+
+    def _release(self, entry: _PooledDriver, check_health: bool = False):
+        with self._lock:
+            self._leased.pop(id(entry.driver), None)
+        try:
+            if check_health and not self._is_healthy(entry.driver):
+                self._discard(entry, "unhealthy")
+            elif self._closed or entry.pages >= self.max_pages_per_driver:
+                self._discard(entry, "recycled")
+            else:
+                with self._lock:
+                    self._idle.append(entry)
+        finally:
+            self._slots.release()
+
+    def record_page(self, driver, seconds: float):
+        """
+        Count one page load on a leased driver (drives recycling and page-time metrics).
+        """
+        with self._lock:
+            entry = self._leased.get(id(driver))
+            if entry is not None:
+                entry.pages += 1
+            self._metrics["pages"] += 1
+            self._metrics["page_seconds"] += seconds
+
+    # ---------- Health / teardown ----------
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            driver.execute_script("return document.readyState")
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _discard(self, entry: _PooledDriver, reason: str):
+        with self._lock:
+            self._metrics[reason] += 1
+        self._quit(entry)
+
+    def _quit(self, entry: _PooledDriver):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+        # Only reuse the slot (and its profile) once the browser is gone
+        with self._lock:
+            self._free_slots.append(entry.slot)
+
+    def close(self):
+        """
+        Quit idle drivers now; drivers still leased are quit when returned.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._quit(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- Metrics ----------
+    def stats(self) -> dict:
+        with self._lock:
+            m = dict(self._metrics)
+            idle, leased = len(self._idle), len(self._leased)
+        started, pages, leases = m["drivers_started"], m["pages"], m["leases"]
+        busy = m["startup_seconds"] + m["page_seconds"]
+        return {
+            "leases": leases,
+            "drivers_started": started,
+            "startup_failures": m["startup_failures"],
+            "reuse_ratio": round(1 - started / leases, 4) if leases else 0.0,
+            "avg_startup_seconds": round(m["startup_seconds"] / started, 3) if started else 0.0,
+            "pages": pages,
+            "avg_page_seconds": round(m["page_seconds"] / pages, 3) if pages else 0.0,
+            "startup_share": round(m["startup_seconds"] / busy, 4) if busy else 0.0,
+            "avg_acquire_wait_seconds": round(m["acquire_wait_seconds"] / leases, 3) if leases else 0.0,
+            "recycled": m["recycled"],
+            "unhealthy": m["unhealthy"],
+            "idle": idle,
+            "leased": leased,
+        }
@@ -0,0 +1,199 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; good enough for throughput and cost reporting
+    return max(1, len(text) // 4)
+
+
+class EmbedUpsertPipeline:
+    """
+    Concurrent, batched embed -> upsert stage for ingestion.
+
+    Documents are cut into batches of `batch_size`; up to `embed_workers` batches
+    are embedded at once, and each embedded batch is handed to one of
+    `insert_workers` writers, so embedding of batch N+1 overlaps the insert of
+    batch N. Each call is retried with exponential backoff and jitter.
+    The number of batches held in memory is bounded.
+
+    `sink` is anything with `upsert_vectors(documents, vectors, ids)`
+    (AstraVectorSink, InMemoryVectorSink).
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        sink,
+        batch_size: int = 64,
+        embed_workers: int = 4,
+        insert_workers: int = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        id_key: str = "product_id",
+        progress_every: int = 20,
+    ):
+        self.embeddings = embeddings
+        self.sink = sink
+        self.batch_size = batch_size
+        self.embed_workers = embed_workers
+        self.insert_workers = insert_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.id_key = id_key
+        self.progress_every = progress_every
+
+        self._lock = threading.Lock()
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self._metrics = {
+            "documents": 0,
+            "tokens": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "failed_documents": 0,
+            "retries": 0,
+            "skipped_batches": 0,
+            "embed_seconds": 0.0,
+            "insert_seconds": 0.0,
+        }
+        self._inserted_ids = []
+        self._failed_ids = []
+        self._start = time.perf_counter()
+
+    # ---------- Helpers ----------
+    def _batches(self, documents):
+        batch = []
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _with_retry(self, fn, what: str):
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                attempt += 1
+                with self._lock:
+                    self._metrics["retries"] += 1
+                print(f"⚠️ {what} failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _record_failure(self, batch, stage: str, error: Exception):
+        with self._lock:
+            self._metrics["failed_batches"] += 1
+            self._metrics["failed_documents"] += len(batch)
+            self._failed_ids += [doc.metadata.get(self.id_key) for doc in batch]
+        print(f"❌ {stage} gave up on a batch of {len(batch)} documents: {error}")
+
+    # ---------- Stages ----------
+    def _embed_batch(self, batch_no, batch, insert_pool, slots, on_batch_committed):
+        start = time.perf_counter()
+        try:
+            texts = [doc.page_content for doc in batch]
+            vectors = self._with_retry(lambda: self.embeddings.embed_documents(texts), "embedding")
+        except Exception as e:
+            self._record_failure(batch, "embedding", e)
+            slots.release()
+            return None
+        with self._lock:
+            self._metrics["embed_seconds"] += time.perf_counter() - start
+        return insert_pool.submit(self._insert_batch, batch_no, batch, vectors, slots, on_batch_committed)
+
+    def _insert_batch(self, batch_no, batch, vectors, slots, on_batch_committed):
+        start = time.perf_counter()
+        try:
+            ids = [doc.metadata[self.id_key] for doc in batch]
+            inserted = self._with_retry(lambda: self.sink.upsert_vectors(batch, vectors, ids), "upsert")
+        except Exception as e:
+            self._record_failure(batch, "upsert", e)
+            return
+        finally:
+            slots.release()
+
+        if on_batch_committed is not None:
+            on_batch_committed(batch_no, inserted)
+        with self._lock:
+            self._metrics["insert_seconds"] += time.perf_counter() - start
+            self._metrics["documents"] += len(batch)
+            self._metrics["tokens"] += sum(estimate_tokens(doc.page_content) for doc in batch)
+            self._metrics["batches"] += 1
+            self._inserted_ids += inserted
+            batches = self._metrics["batches"]
+        if self.progress_every and batches % self.progress_every == 0:
+            report = self.report()
+            print(
+                f"Ingested {report['documents']} documents | "
+                f"{report['docs_per_second']} docs/s | {report['tokens_per_second']} tokens/s"
+            )
+
+    # ---------- Public ----------
+    def run(self, documents, skip_batches=frozenset(), on_batch_committed=None) -> dict:
+        """
+        Embed and upsert every document from the (possibly lazy) iterable.
+        Returns the final report; failed batches are reported, not raised.
+
+        Batches are numbered in stream order, so for a deterministic source the
+        numbers are stable across runs: `skip_batches` (e.g. from a checkpoint)
+        are not re-embedded, and `on_batch_committed(batch_no, ids)` is called
+        once a batch is in the store.
+        """
+        self._reset_metrics()
+        # Bounds batches read-but-not-yet-written, so a streamed source stays streamed
+        slots = threading.BoundedSemaphore(2 * (self.embed_workers + self.insert_workers))
+        pending = []
+
+        with ThreadPoolExecutor(max_workers=self.insert_workers, thread_name_prefix="ingest-insert") as insert_pool:
+            with ThreadPoolExecutor(max_workers=self.embed_workers, thread_name_prefix="ingest-embed") as embed_pool:
+                for batch_no, batch in enumerate(self._batches(documents)):
+                    if batch_no in skip_batches:
+                        with self._lock:
+                            self._metrics["skipped_batches"] += 1
+                        continue
+                    slots.acquire()
+                    pending.append(
+                        embed_pool.submit(self._embed_batch, batch_no, batch, insert_pool, slots, on_batch_committed)
+                    )
+                insert_futures = [future.result() for future in pending]
+            for future in insert_futures:
+                if future is not None:
+                    future.result()
+
+        return self.report()
+
+    def report(self) -> dict:
+        with self._lock:
+            m = dict(self._metrics)
+            inserted_ids = list(self._inserted_ids)
+            failed_ids = list(self._failed_ids)
+        elapsed = time.perf_counter() - self._start
+        return {
+            "documents": m["documents"],
+            "batches": m["batches"],
+            "estimated_tokens": m["tokens"],
+            "failed_batches": m["failed_batches"],
+            "failed_documents": m["failed_documents"],
+            "retries": m["retries"],
+            "skipped_batches": m["skipped_batches"],
+            "seconds": round(elapsed, 3),
+            "docs_per_second": round(m["documents"] / elapsed, 1) if elapsed else 0.0,
+            "tokens_per_second": round(m["tokens"] / elapsed, 1) if elapsed else 0.0,
+            "embed_seconds": round(m["embed_seconds"], 3),
+            "insert_seconds": round(m["insert_seconds"], 3),
+            "inserted_ids": inserted_ids,
+            "failed_ids": failed_ids,
+        }
@@ -0,0 +1,194 @@
+import re
+
+from lxml import etree, html as lxml_html
+
+# Same selectors as the BeautifulSoup path in FlipkartScraper, as compiled XPath.
+# Class selectors match whole class tokens, like CSS.
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_CARDS = etree.XPath("//div[@data-id]")
+_TITLE_IMG = etree.XPath(f"(.//img[{_has_class('UCc1lI')} or @alt])[1]")
+_PRODUCT_LINK = etree.XPath(".//a[contains(@href, '/p/')][1]")
+_PRICE_TAGS = [etree.XPath(f"(.//div[{_has_class(c)}])[1]") for c in ("Nx9bqj", "_30jeq3", "_1_WHN1", "hl05eU")]
+_RATING_TAGS = [
+    etree.XPath(f"(.//div[{_has_class('XQDdHH')}])[1]"),
+    etree.XPath(f"(.//div[{_has_class('_3LWZlK')}])[1]"),
+    etree.XPath(f"(.//div[{_has_class('UkUFwK')}]//span)[1]"),
+    etree.XPath(f"(.//span[{_has_class('_2_R_DZ')}])[1]"),
+]
+_REVIEW_COUNT_TAG = etree.XPath(
+    f"(.//span[{_has_class('Wphh3N')} or {_has_class('_2_R_DZ')} or {_has_class('_13vcmD')}])[1]"
+)
+_REVIEW_BLOCKS = [
+    etree.XPath(f"//div[{_has_class('ZmyHeo')}]"),
+    etree.XPath(f"//div[{_has_class('t-ZTKy')}]"),
+    etree.XPath(f"//div[{_has_class('_27M-vq')}]"),
+    etree.XPath(f"//div[{_has_class('col')} and {_has_class('EPCmJX')}]"),
+    etree.XPath(f"//div[{_has_class('_6K-7Co')}]"),
+    etree.XPath(f"//div[{_has_class('row')} and {_has_class('gHabs0')}]"),
+]
+_LEAF_DIVS = etree.XPath("//div[not(.//div)]")
+
+_PRICE_RE = re.compile(r"₹[\d,]+")
+_RATING_RE = re.compile(r"^\d\.\d$")
+_COUNT_RE = re.compile(r"\d+(,\d+)?")
+_PRODUCT_ID_RE = re.compile(r"/p/(itm[0-9A-Za-z]+)")
+
+REVIEW_SKIP = ("warranty", "flipkart internet", "bengaluru", "face id",
+               "barometer", "hevc", "aac lc", "handset", "sar limit",
+               "contrast ratio", "true tone", "lightning connector")
+
+# Like BeautifulSoup's get_text(), text inside these (and comments) is left out of
+# an ancestor's text; only get_text() on the tag itself returns it
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+
+def _own_text(element) -> str:
+    return (element.text or "").strip()
+
+
+def _pieces(element, out: list):
+    # Stripped, non-empty strings under `element` in document order (not its tail)
+    if not isinstance(element.tag, str) or element.tag in _NON_TEXT_TAGS:
+        return out
+    if element.text:
+        text = element.text.strip()
+        if text:
+            out.append(text)
+    for child in element:
+        _pieces(child, out)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                out.append(tail)
+    return out
+
+
+def get_text(element, separator: str = "") -> str:
+    """
+    Same result as BeautifulSoup's tag.get_text(separator=separator, strip=True).
+    """
+    if element.tag in _NON_TEXT_TAGS:
+        return _own_text(element)
+    return separator.join(_pieces(element, []))
+
+
+def _all_texts(root) -> dict:
+    """
+    get_text(strip=True) of every element under `root` in one bottom-up pass,
+    instead of one subtree walk per element.
+    """
+    texts = {}
+
+    def walk(element):
+        if not isinstance(element.tag, str):
+            return ""
+        if element.tag in _NON_TEXT_TAGS:
+            texts[element] = _own_text(element)
+            return ""
+        parts = [element.text.strip()] if element.text else []
+        for child in element:
+            parts.append(walk(child))
+            if child.tail:
+                parts.append(child.tail.strip())
+        text = "".join(parts)
+        texts[element] = text
+        return text
+
+    walk(root)
+    return texts
+
+
+def _first_price(card) -> str:
+    for xpath in _PRICE_TAGS:
+        tags = xpath(card)
+        if tags:
+            match = _PRICE_RE.search(get_text(tags[0]))
+            if match:
+                return match.group(0)
+    texts = _all_texts(card)
+    for tag in card.iterdescendants(tag=etree.Element):
+        match = _PRICE_RE.search(texts[tag])
+        if match:
+            return match.group(0)
+    return "N/A"
+
+
+def _first_rating(card) -> str:
+    for xpath in _RATING_TAGS:
+        tags = xpath(card)
+        if tags:
+            text = get_text(tags[0])
+            if _RATING_RE.match(text):
+                return text
+    texts = _all_texts(card)
+    for tag in card.iterdescendants(tag=etree.Element):
+        if _RATING_RE.match(texts[tag]):
+            return texts[tag]
+    return "N/A"
+
+
+def parse_search_cards(html: str, max_products: int, base_url: str):
+    """
+    Product cards of a search results page, as
+    (product_id, title, rating, total_reviews, price, product_link) tuples.
+    Returns (number of cards on the page considered, products).
+    """
+    root = lxml_html.fromstring(html)
+    cards = _CARDS(root)[:max_products]
+
+    products = []
+    for card in cards:
+        img = _TITLE_IMG(card)
+        alt = img[0].get("alt") if img else None
+        title = alt.strip() if alt else "Unknown Title"
+
+        link = _PRODUCT_LINK(card)
+        if not link:
+            continue
+        href = link[0].get("href", "")
+        product_link = href if href.startswith("http") else base_url + href
+        match = _PRODUCT_ID_RE.findall(href)
+        product_id = match[0] if match else "N/A"
+
+        total_reviews = "N/A"
+        reviews_tag = _REVIEW_COUNT_TAG(card)
+        if reviews_tag:
+            m = _COUNT_RE.search(get_text(reviews_tag[0]))
+            total_reviews = m.group(0) if m else "N/A"
+
+        products.append((product_id, title, _first_rating(card), total_reviews, _first_price(card), product_link))
+    return len(cards), products
+
+
+def parse_reviews(html: str, count: int) -> list[str]:
+    """
+    Up to `count` review texts from a reviews page: known review blocks first,
+    leaf <div>s as a fallback.
+    """
+    root = lxml_html.fromstring(html)
+    reviews = []
+    seen = set()
+
+    def accept(text, low, high):
+        if (text and text not in seen and low < len(text) < high
+                and not any(k in text.lower() for k in REVIEW_SKIP)):
+            reviews.append(text)
+            seen.add(text)
+
+    for xpath in _REVIEW_BLOCKS:
+        for block in xpath(root):
+            accept(get_text(block, " "), 30, 600)
+            if len(reviews) >= count:
+                return reviews
+
+    if not reviews:
+        for tag in _LEAF_DIVS(root):
+            accept(get_text(tag, " "), 40, 500)
+            if len(reviews) >= count:
+                break
+    return reviews
@@ -0,0 +1,61 @@
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+BLOCKED_STATUS = {403, 429, 503}
+# Bot-check / block pages are small; full product pages are far bigger than this
+_BLOCK_PAGE_MAX_BYTES = 50_000
+_BLOCKED_RE = re.compile(
+    r"captcha|are you a human|access denied|unusual traffic|request blocked|verify you are human",
+    re.IGNORECASE,
+)
+
+
+class HttpFetcher:
+    """
+    Pooled keep-alive HTTP client for server-rendered pages.
+
+    get_html(url) returns (html, None) on success, or (None, reason) when the
+    page can't be used and the caller should fall back to a real browser:
+    network error, non-200 status, non-HTML body, or a bot-check page.
+    """
+
+    def __init__(self, timeout_seconds: float = 10.0, pool_size: int = 10, headers: dict | None = None):
+        self.timeout = timeout_seconds
+        self.session = requests.Session()
+        self.session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_html(self, url: str):
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            return None, f"error: {type(e).__name__}"
+
+        if response.status_code in BLOCKED_STATUS:
+            return None, f"blocked: HTTP {response.status_code}"
+        if response.status_code != 200:
+            return None, f"HTTP {response.status_code}"
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            return None, "not html"
+
+        html = response.text
+        if len(html) < _BLOCK_PAGE_MAX_BYTES and _BLOCKED_RE.search(html):
+            return None, "blocked: bot check"
+        return html, None
+
+    def close(self):
+        self.session.close()
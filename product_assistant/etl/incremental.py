@@ -0,0 +1,65 @@
+import json
+import hashlib
+
+# Metadata keys written by ingestion itself; excluded from the content hash.
+FINGERPRINT_KEYS = ("embed_hash", "content_hash")
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def add_fingerprints(doc, semantic_text: str):
+    """
+    Stamp a document with two hashes:
+        embed_hash   -> the text that drives the embedding (title + reviews)
+        content_hash -> everything stored (page_content + metadata)
+
+    A change in embed_hash needs a re-embed; a change in content_hash alone
+    (e.g. a new price) only needs the stored content/metadata updated.
+    """
+    doc.metadata["embed_hash"] = fingerprint(semantic_text)
+    return refresh_content_hash(doc)
+
+
+def refresh_content_hash(doc):
+    """
+    Recompute content_hash after metadata has been changed (e.g. variant collapsing).
+    """
+    metadata = {k: v for k, v in doc.metadata.items() if k not in FINGERPRINT_KEYS}
+    doc.metadata["content_hash"] = fingerprint(
+        doc.page_content + "\x1f" + json.dumps(metadata, sort_keys=True, default=str)
+    )
+    return doc
+
+
+def plan_sync(documents, existing: dict, include_deletes: bool = True) -> dict:
+    """
+    Compare freshly transformed documents against what the store holds.
+
+    Args:
+        documents: Documents with product_id / embed_hash / content_hash metadata.
+        existing: {document_id: {"embed_hash": ..., "content_hash": ...}} from the store.
+        include_deletes: False when `documents` is only one batch of the source.
+
+    Returns:
+        {"to_embed": [...], "to_update": [...], "unchanged": [...], "to_delete": [ids]}
+    """
+    plan = {"to_embed": [], "to_update": [], "unchanged": [], "to_delete": []}
+    seen = set()
+
+    for doc in documents:
+        doc_id = doc.metadata["product_id"]
+        seen.add(doc_id)
+        stored = existing.get(doc_id)
+
+        if stored is None or stored.get("embed_hash") != doc.metadata["embed_hash"]:
+            plan["to_embed"].append(doc)
+        elif stored.get("content_hash") != doc.metadata["content_hash"]:
+            plan["to_update"].append(doc)
+        else:
+            plan["unchanged"].append(doc)
+
+    if include_deletes:
+        plan["to_delete"] = [doc_id for doc_id in existing if doc_id not in seen]
+    return plan
@@ -0,0 +1,191 @@
+import re
+import time
+import zlib
+
+import numpy as np
+
+from product_assistant.etl.incremental import refresh_content_hash
+from product_assistant.utils.embedding_cache import normalize_text
+
+# Smallest prime above 2**32: with 32-bit shingle hashes and a, b < 2**32,
+# a * x + b stays below 2**64 and the modulo actually permutes the hash order.
+_PRIME = np.uint64(4294967311)
+_VARIANT_SPEC = re.compile(r"\([^)]*\)")  # "(Black, 128 GB)"
+_WORD = re.compile(r"\w+")
+
+
+def shingle_text(doc) -> str:
+    """
+    Text that identifies a product family: title without the variant spec,
+    plus the reviews (Flipkart shows the same reviews on every variant).
+    """
+    title = _VARIANT_SPEC.sub(" ", doc.metadata.get("product_title", ""))
+    reviews = doc.page_content.partition(" | Reviews: ")[2]
+    return f"{title} {reviews}"
+
+
+def shingles(text: str, size: int = 2) -> set:
+    words = _WORD.findall(normalize_text(text))
+    if len(words) < size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signatures(shingle_sets, num_perm: int = 64, seed: int = 1) -> np.ndarray:
+    """
+    MinHash signatures (n_docs x num_perm, uint64) for a list of shingle sets.
+
+    All shingles are hashed once (crc32), then each permutation h(x) = (a*x + b) mod p
+    is applied to the whole flat array and reduced per document with
+    np.minimum.reduceat, so there is no per-document Python loop.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, (1 << 32) - 1, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, (1 << 32) - 1, size=num_perm, dtype=np.uint64)
+
+    lengths = np.fromiter((max(len(s), 1) for s in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+    hashes = np.fromiter(
+        (zlib.crc32(sh.encode("utf-8")) for s in shingle_sets for sh in (s or {""})),
+        dtype=np.uint64,
+        count=int(lengths.sum()),
+    )
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint64)
+    for i in range(num_perm):
+        permuted = (a[i] * hashes + b[i]) % _PRIME
+        signatures[:, i] = np.minimum.reduceat(permuted, offsets)
+    return signatures
+
+
+def lsh_clusters(signatures: np.ndarray, bands: int = 8, threshold: float = 0.8) -> list[int]:
+    """
+    Cluster ids (one per row) from LSH banding over MinHash signatures.
+    Candidate pairs sharing a band bucket are confirmed with the estimated
+    Jaccard similarity and merged with union-find.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        buckets = {}
+        for idx, key in enumerate(map(bytes, block)):
+            buckets.setdefault(key, []).append(idx)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            head = members[0]
+            for other in members[1:]:
+                root_head, root_other = find(head), find(other)
+                if root_head == root_other:
+                    continue
+                if np.mean(signatures[head] == signatures[other]) >= threshold:
+                    parent[root_other] = root_head
+
+    return [find(i) for i in range(n)]
+
+
+def _canonical_rank(doc):
+    # Prefer the variant with the most reviews, then the richest text
+    return (doc.metadata.get("total_reviews") or 0, len(doc.page_content))
+
+
+def collapse_near_duplicates(documents, threshold: float = 0.8, num_perm: int = 64, bands: int = 8):
+    """
+    Keep one canonical Document per cluster of near-duplicate products.
+
+    The canonical document gets variant metadata:
+        variant_count, variant_product_ids, variant_prices_inr, min_price_inr, max_price_inr
+
+    Returns (documents, stats).
+    """
+    documents = list(documents)
+    if len(documents) < 2:
+        return documents, {"documents": len(documents), "clusters": len(documents), "collapsed": 0}
+
+    signatures = minhash_signatures([shingles(shingle_text(d)) for d in documents], num_perm=num_perm)
+    cluster_ids = lsh_clusters(signatures, bands=bands, threshold=threshold)
+
+    clusters = {}
+    for doc, cluster_id in zip(documents, cluster_ids):
+        clusters.setdefault(cluster_id, []).append(doc)
+
+    canonical_docs = []
+    for members in clusters.values():
+        canonical = max(members, key=_canonical_rank)
+        if len(members) > 1:
+            prices = [m.metadata["price_inr"] for m in members if m.metadata.get("price_inr") is not None]
+            canonical.metadata["variant_count"] = len(members)
+            canonical.metadata["variant_product_ids"] = [m.metadata["product_id"] for m in members]
+            if prices:
+                canonical.metadata["variant_prices_inr"] = sorted(set(prices))
+                canonical.metadata["min_price_inr"] = min(prices)
+                canonical.metadata["max_price_inr"] = max(prices)
+            refresh_content_hash(canonical)
+        canonical_docs.append(canonical)
+
+    # Keep source order so checkpointed batch numbering stays deterministic
+    order = {id(doc): i for i, doc in enumerate(documents)}
+    canonical_docs.sort(key=lambda d: order[id(d)])
+    stats = {
+        "documents": len(documents),
+        "clusters": len(canonical_docs),
+        "collapsed": len(documents) - len(canonical_docs),
+    }
+    return canonical_docs, stats
+
+
+def near_dedup_batches(batches, batch_size: int, config: dict):
+    """
+    Apply ingestion.near_dedup to a stream of Document batches, yielding batches of
+    `batch_size`. Used by ingestion and by the dry-run / cache-prune tools so they
+    all see the same documents.
+
+    `window_documents` bounds memory: documents are collapsed window by window, so
+    variants further apart in the source than one window are not merged.
+    0 clusters the whole catalog in memory (and delays the first upsert until the
+    whole source is read).
+    """
+    if not config.get("enabled", False):
+        yield from batches
+        return
+
+    window = config.get("window_documents", 5000) or None
+    totals = {"documents": 0, "clusters": 0, "collapsed": 0}
+    start = time.perf_counter()
+
+    def collapse(documents):
+        canonical, stats = collapse_near_duplicates(
+            documents,
+            threshold=config.get("threshold", 0.8),
+            num_perm=config.get("num_perm", 64),
+            bands=config.get("bands", 8),
+        )
+        for key in totals:
+            totals[key] += stats[key]
+        return canonical
+
+    pending = []
+    buffer = []
+    for batch in batches:
+        buffer.extend(batch)
+        if window and len(buffer) >= window:
+            pending.extend(collapse(buffer))
+            buffer = []
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                pending = pending[batch_size:]
+    if buffer:
+        pending.extend(collapse(buffer))
+    for i in range(0, len(pending), batch_size):
+        yield pending[i : i + batch_size]
+    print(f"Near-duplicate collapsing: {totals} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,126 @@
+import json
+import re
+
+# Flipkart server-renders the page state as `window.__INITIAL_STATE__ = {...};`
+STATE_MARKER = "window.__INITIAL_STATE__"
+_ASSIGNMENT_RE = re.compile(r"\s*=\s*")
+_PRODUCT_ID_RE = re.compile(r"/p/(itm[0-9A-Za-z]+)")
+_decoder = json.JSONDecoder()
+
+
+def extract_initial_state(html: str, marker: str = STATE_MARKER):
+    """
+    Parse the JSON object assigned to `marker` in an inline script, in one pass
+    (raw_decode stops at the end of the object). Returns None when it is missing
+    or not valid JSON.
+    """
+    start = html.find(marker)
+    if start < 0:
+        return None
+    assignment = _ASSIGNMENT_RE.match(html, start + len(marker))
+    if not assignment:
+        return None
+    try:
+        state, _ = _decoder.raw_decode(html, assignment.end())
+    except ValueError:
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _iter_dicts(value):
+    # Depth-first, in document order
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def _indian_grouping(number: int) -> str:
+    # 124999 -> "1,24,999", the way Flipkart displays prices and counts
+    digits = str(number)
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    return ",".join(groups + [tail])
+
+
+def _number(value):
+    if isinstance(value, dict):
+        value = value.get("value")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _product_row(info: dict, base_url: str):
+    title = (info.get("titles") or {}).get("title")
+    url = info.get("baseUrl") or info.get("smartUrl") or ""
+    match = _PRODUCT_ID_RE.search(url)
+    product_id = info.get("itemId") or (match.group(1) if match else None)
+    if not title or not product_id or not url:
+        return None
+
+    rating_info = info.get("rating") or {}
+    average = _number(rating_info.get("average"))
+    count = _number(rating_info.get("count"))
+    price = _number(((info.get("pricing") or {}).get("finalPrice") or {}).get("value"))
+
+    return (
+        product_id,
+        title.strip(),
+        f"{average:.1f}" if average else "N/A",
+        _indian_grouping(int(count)) if count is not None else "N/A",
+        f"₹{_indian_grouping(int(price))}" if price is not None else "N/A",
+        url if url.startswith("http") else base_url + url,
+    )
+
+
+def products_from_state(state: dict, max_products: int, base_url: str) -> list:
+    """
+    Search-result products from the page state, as the same
+    (product_id, title, rating, total_reviews, price, product_link) tuples the
+    DOM extraction produces, in page order and de-duplicated by product_id.
+    `max_products=None` returns all of them.
+    """
+    products, seen = [], set()
+    for node in _iter_dicts(state):
+        if "titles" not in node or not ("baseUrl" in node or "smartUrl" in node):
+            continue
+        row = _product_row(node, base_url)
+        if row is None or row[0] in seen:
+            continue
+        seen.add(row[0])
+        products.append(row)
+        if max_products is not None and len(products) >= max_products:
+            break
+    return products
+
+
+def reviews_from_state(state: dict, count: int, skip=()) -> list[str]:
+    """
+    Review texts from a reviews page state, with the DOM path's length and
+    boilerplate filters.
+    """
+    reviews, seen = [], set()
+    for node in _iter_dicts(state):
+        text = node.get("text")
+        if not isinstance(text, str) or "rating" not in node or "author" not in node:
+            continue
+        text = " ".join(text.split())
+        if (text and text not in seen and 30 < len(text) < 600
+                and not any(k in text.lower() for k in skip)):
+            reviews.append(text)
+            seen.add(text)
+            if len(reviews) >= count:
+                break
+    return reviews
@@ -0,0 +1,74 @@
+import time
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+
+
+class PhaseTimings:
+    """
+    Thread-safe wall-clock timings per scraper phase (page load, readiness wait,
+    scrolling, parsing, ...), aggregated as count / total / average / max.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: dict[str, list] = {}
+
+    @contextmanager
+    def time(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def record(self, phase: str, seconds: float):
+        with self._lock:
+            entry = self._phases.setdefault(phase, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            phases = {name: list(entry) for name, entry in self._phases.items()}
+        return {
+            name: {
+                "count": count,
+                "total_seconds": round(total, 3),
+                "avg_seconds": round(total / count, 3) if count else 0.0,
+                "max_seconds": round(longest, 3),
+            }
+            for name, (count, total, longest) in phases.items()
+        }
+
+
+class FetchPathLog:
+    """
+    Which path served each URL ("http" fast path or "browser"), with the reason
+    the fast path was not used. Keeps the latest `max_entries` records.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=max_entries)
+        self._counts = Counter()
+
+    def record(self, url: str, kind: str, path: str, seconds: float, fallback_reason: str | None = None):
+        with self._lock:
+            self._entries.append({
+                "url": url,
+                "kind": kind,
+                "path": path,
+                "seconds": round(seconds, 3),
+                "fallback_reason": fallback_reason,
+            })
+            self._counts[(kind, path)] += 1
+
+    def entries(self) -> list[dict]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {f"{kind}_{path}": count for (kind, path), count in sorted(self._counts.items())}
@@ -0,0 +1,220 @@
+from itertools import islice
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from langchain_core.documents import Document
+
+from product_assistant.etl.columnar import INVALID_TITLES, is_parquet_source, iter_parquet_batches
+from product_assistant.etl.incremental import add_fingerprints
+from product_assistant.utils.metadata_parser import (
+    detect_brand,
+    parse_count,
+    parse_price_inr,
+    parse_rating,
+)
+
+CSV_COLUMNS = ["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"]
+_EMPTY_REVIEWS = ("N/A", "No reviews found", "")
+
+
+def iter_csv_frames(path: str, block_size_mb: int = 16):
+    """
+    Stream a product CSV as pandas DataFrames, one per pyarrow block.
+    Every column is read as a string; nulls come back as None.
+    """
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_size_mb * 1024 * 1024),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=CSV_COLUMNS,
+            column_types={column: pa.string() for column in CSV_COLUMNS},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def clean_frame(frame: pd.DataFrame, seen_ids: set) -> pd.DataFrame:
+    """
+    Column-wise equivalent of DataIngestion._clean plus the row filters of
+    transform_data: strip values, "N/A" for missing or blank ones, drop invalid
+    titles and product_ids already seen (in this frame or an earlier one).
+    """
+    frame = frame.copy()
+    for column in CSV_COLUMNS:
+        # Blank values are missing too, as empty CSV fields already are (read as null)
+        frame[column] = frame[column].fillna("N/A").str.strip().replace("", "N/A")
+
+    frame = frame.drop_duplicates("product_id")
+    frame = frame[~frame["product_id"].isin(seen_ids)]
+    seen_ids.update(frame["product_id"])
+
+    return frame[~frame["product_title"].isin(INVALID_TITLES)]
+
+
+def _map_unique(series: pd.Series, fn) -> list:
+    # Catalog columns repeat a lot (prices, ratings, brands): parse each distinct value once.
+    # Returned as a plain list so ints stay ints (pandas would upcast them next to None).
+    uniques = series.unique()
+    parsed = dict(zip(uniques, map(fn, uniques)))
+    return [parsed[value] for value in series]
+
+
+def _make_document(product_id, title, price, rating, total_reviews, top_reviews, numeric) -> Document:
+    # Single definition of page_content / metadata, shared by the CSV and Parquet paths
+    page_content = f"Product: {title} | Price: {price} | Rating: {rating} | Total Reviews: {total_reviews}"
+    if top_reviews not in _EMPTY_REVIEWS:
+        page_content += f" | Reviews: {top_reviews}"
+    metadata = {"product_id": product_id, "product_title": title, "price": price}
+    metadata.update((key, value) for key, value in numeric.items() if value is not None)
+    return add_fingerprints(Document(page_content=page_content, metadata=metadata), title + "\x1f" + top_reviews)
+
+
+def frame_to_documents(frame: pd.DataFrame) -> list[Document]:
+    """
+    Build Documents for a cleaned frame; content and metadata match transform_data.
+    """
+    if frame.empty:
+        return []
+
+    title, price, rating = frame["product_title"], frame["price"], frame["rating"]
+    total_reviews, top_reviews = frame["total_reviews"], frame["top_reviews"]
+
+    price_inr = _map_unique(price, parse_price_inr)
+    ratings = _map_unique(rating, parse_rating)
+    counts = _map_unique(total_reviews, parse_count)
+    brands = _map_unique(title, detect_brand)
+
+    return [
+        _make_document(
+            *row[:6],
+            {"price_inr": row[6], "rating": row[7], "total_reviews": row[8], "brand": row[9]},
+        )
+        for row in zip(
+            frame["product_id"], title, price, rating, total_reviews, top_reviews,
+            price_inr, ratings, counts, brands,
+        )
+    ]
+
+
+def _formatted(values, fn) -> list:
+    # Titles repeat a lot: compute each distinct value once
+    cache = {}
+    return [cache[v] if v in cache else cache.setdefault(v, fn(v)) for v in values]
+
+
+def _display_column(batch: pa.RecordBatch, name: str, typed: str) -> list:
+    """
+    Display strings as scraped. Files written before the column existed fall back
+    to the typed value, rendered as str() would (4.0 -> "4.0", 12345 -> "12345").
+    """
+    text = batch.column(name).to_pylist()
+    values = batch.column(typed).to_pylist()
+    return [t if t is not None else ("N/A" if v is None else str(v)) for t, v in zip(text, values)]
+
+
+def record_batch_to_documents(batch: pa.RecordBatch, seen_ids: set) -> list[Document]:
+    """
+    Build Documents straight from a typed Parquet record batch (see etl.columnar).
+    The columns were cleaned when written, so none of clean_frame's string passes
+    run here; numeric metadata comes from the typed columns as-is and content is
+    rendered from the stored display strings. Content and metadata match
+    frame_to_documents for the same scraper rows.
+    """
+    ids = batch.column("product_id").to_pylist()
+    titles = batch.column("product_title").to_pylist()
+    prices = batch.column("price").to_pylist()
+    price_inr = batch.column("price_inr").to_pylist()
+    ratings = batch.column("rating").to_pylist()
+    counts = batch.column("total_reviews").to_pylist()
+    reviews = pc.binary_join(batch.column("top_reviews"), " || ").to_pylist()
+
+    rating_text = _display_column(batch, "rating_text", "rating")
+    count_text = _display_column(batch, "total_reviews_text", "total_reviews")
+    brands = _formatted(titles, detect_brand)
+
+    documents = []
+    for i, (product_id, title) in enumerate(zip(ids, titles)):
+        product_id = product_id or "N/A"
+        if product_id in seen_ids:
+            continue
+        seen_ids.add(product_id)
+        if title is None:  # invalid titles are stored as null
+            continue
+        documents.append(_make_document(
+            product_id, title, prices[i] or "N/A", rating_text[i], count_text[i], reviews[i] or "N/A",
+            {"price_inr": price_inr[i], "rating": ratings[i], "total_reviews": counts[i], "brand": brands[i]},
+        ))
+    return documents
+
+
+def _record_value(value):
+    if value is None:
+        return None
+    value = str(value)
+    return value if value.strip() else None
+
+
+def iter_record_frames(records, chunk_size: int = 500):
+    """
+    Turn in-memory scraper rows ([product_id, title, rating, total_reviews, price,
+    top_reviews] lists, or dicts with those keys) into CSV-shaped string frames.
+    `records` can be any iterable, e.g. rows as FlipkartScraper produces them.
+    """
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        rows = [
+            [row.get(column) for column in CSV_COLUMNS] if isinstance(row, dict) else list(row)
+            for row in chunk
+        ]
+        frame = pd.DataFrame(rows, columns=CSV_COLUMNS, dtype=object)
+        # "" / whitespace-only is missing, as in the CSV the scraper would have written
+        yield frame.apply(lambda column: column.map(_record_value))
+
+
+def _rebatch(document_lists, batch_size: int):
+    pending: list[Document] = []
+    for documents in document_lists:
+        pending.extend(documents)
+        if len(pending) < batch_size:
+            continue
+        full = len(pending) - len(pending) % batch_size
+        for start in range(0, full, batch_size):
+            yield pending[start : start + batch_size]
+        pending = pending[full:]
+    if pending:
+        yield pending
+
+
+def _iter_batches(frames, batch_size: int):
+    seen_ids: set = set()
+    yield from _rebatch((frame_to_documents(clean_frame(frame, seen_ids)) for frame in frames), batch_size)
+
+
+def iter_document_batches(path: str, batch_size: int = 500, block_size_mb: int = 16):
+    """
+    Stream Documents from a product CSV, or a Parquet file / dataset written by
+    the scraper, in batches of `batch_size`.
+    Memory stays bounded by one block plus one batch, whatever the file size.
+    """
+    if is_parquet_source(path):
+        seen_ids: set = set()
+        batches = iter_parquet_batches(path)
+        yield from _rebatch((record_batch_to_documents(batch, seen_ids) for batch in batches), batch_size)
+    else:
+        yield from _iter_batches(iter_csv_frames(path, block_size_mb=block_size_mb), batch_size)
+
+
+def iter_record_batches(records, batch_size: int = 500):
+    """
+    Same as iter_document_batches, for in-memory scraper rows instead of a file.
+    """
+    yield from _iter_batches(iter_record_frames(records, chunk_size=batch_size), batch_size)
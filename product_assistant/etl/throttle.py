@@ -0,0 +1,41 @@
+import time
+import threading
+from urllib.parse import urlparse
+
+
+class DomainThrottle:
+    """
+    Per-domain politeness delay shared by concurrent fetchers.
+
+    `wait(url)` reserves the next start slot for the URL's host and sleeps until
+    it comes up, so requests to one domain start at least `min_interval_seconds`
+    apart whatever the number of workers; other domains are not held up.
+    """
+
+    def __init__(self, min_interval_seconds: float = 1.0):
+        self.min_interval = min_interval_seconds
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._waited_seconds = 0.0
+        self._requests = 0
+
+    def wait(self, url: str) -> float:
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.min_interval
+            self._requests += 1
+            self._waited_seconds += slot - now
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "waited_seconds": round(self._waited_seconds, 3),
+                "domains": len(self._next_slot),
+            }
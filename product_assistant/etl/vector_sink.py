@@ -0,0 +1,206 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from astrapy.exceptions import (
+    CollectionInsertManyException,
+    DataAPIResponseException,
+    TooManyDocumentsToCountException,
+)
+
+DOCUMENT_ALREADY_EXISTS = "DOCUMENT_ALREADY_EXISTS"
+# Data API limit on the number of values in an $in filter
+MAX_IN_VALUES = 100
+
+
+class AstraVectorSink:
+    """
+    Thin write-side wrapper around an AstraDBVectorStore for ingestion.
+
+    Goes through the store's document codec, so it works whatever the
+    collection's document layout (nested or flat metadata).
+    """
+
+    def __init__(self, vstore, concurrency: int = 10):
+        self.vstore = vstore
+        self.codec = vstore.document_codec
+        self.concurrency = concurrency
+
+    @property
+    def collection(self):
+        self.vstore.astra_env.ensure_db_setup()
+        return self.vstore.astra_env.collection
+
+    def _field(self, metadata_key: str) -> str:
+        return self.codec.metadata_key_to_field_identifier(metadata_key)
+
+    @staticmethod
+    def _dig(document: dict, dotted_path: str):
+        value = document
+        for part in dotted_path.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    def fetch_fingerprints(self, keys=("embed_hash", "content_hash"), ids=None) -> dict:
+        """
+        Return {document_id: {key: value}} for every stored document (or only
+        those in `ids`), projecting only the requested metadata fields (no
+        content, no vectors).
+        """
+        fields = {key: self._field(key) for key in keys}
+        projection = {field: True for field in fields.values()}
+        if ids is None:
+            filters = [{}]
+        else:
+            ids = list(dict.fromkeys(ids))
+            filters = [{"_id": {"$in": ids[i : i + MAX_IN_VALUES]}} for i in range(0, len(ids), MAX_IN_VALUES)]
+        return {
+            doc["_id"]: {key: self._dig(doc, field) for key, field in fields.items()}
+            for filter_ in filters
+            for doc in self.collection.find(filter_, projection=projection)
+        }
+
+    def upsert_vectors(self, documents, vectors, ids) -> list:
+        """
+        Write already-embedded documents, replacing any existing document with the same id.
+        Same semantics as AstraDBVectorStore.add_documents, minus the embedding call.
+        """
+        encoded = [
+            self.codec.encode(content=doc.page_content, document_id=doc_id, vector=vector, metadata=doc.metadata)
+            for doc, vector, doc_id in zip(documents, vectors, ids)
+        ]
+        try:
+            return list(self.collection.insert_many(encoded, ordered=False).inserted_ids)
+        except CollectionInsertManyException as err:
+            # Only "already exists" errors are expected: those ids get replaced below
+            if not all(isinstance(exc, DataAPIResponseException) for exc in err.exceptions):
+                raise
+            codes = {descriptor.error_code for exc in err.exceptions for descriptor in exc.error_descriptors}
+            if codes != {DOCUMENT_ALREADY_EXISTS}:
+                raise
+            inserted = set(err.inserted_ids)
+
+        def _replace(document):
+            doc_id = self.codec.get_id(document)
+            self.collection.replace_one(self.codec.encode_query(ids=[doc_id]), document)
+            return doc_id
+
+        to_replace = [doc for doc in encoded if self.codec.get_id(doc) not in inserted]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(inserted) + list(executor.map(_replace, to_replace))
+
+    def update_content(self, updates) -> int:
+        """
+        Overwrite page_content and metadata of existing documents without re-embedding.
+        `updates` is a list of (document_id, Document). The stored metadata is replaced
+        as a whole: keys missing from the new metadata (e.g. a rating that no longer
+        parses) are removed, so metadata filters never match stale values.
+        """
+        # Nested layout keeps metadata under one field ("metadata.<key>"); flat puts it top level
+        metadata_field = self._field("_").rpartition(".")[0]
+        reserved = {"_id", "$vector", "$vectorize", "$lexical", self.codec.content_field}
+
+        def _update(item):
+            document_id, doc = item
+            query = self.codec.encode_query(ids=[document_id])
+            update = {}
+            if metadata_field:
+                fields = {metadata_field: dict(doc.metadata)}
+            else:
+                fields = dict(doc.metadata)
+                stored = self.collection.find_one(query, projection={"$vector": False}) or {}
+                stale = [key for key in stored if key not in fields and key not in reserved]
+                if stale:
+                    update["$unset"] = {key: "" for key in stale}
+            fields[self.codec.content_field] = doc.page_content
+            if getattr(self.codec, "has_lexical", False):
+                fields["$lexical"] = doc.page_content
+            update["$set"] = fields
+            result = self.collection.update_one(query, update)
+            return result.update_info["n"]
+
+        if not updates:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return sum(executor.map(_update, updates))
+
+    def delete(self, ids) -> int:
+        if not ids:
+            return 0
+        self.vstore.delete(ids=list(ids))
+        return len(ids)
+
+    def count(self, upper_bound: int = 1000) -> int:
+        """
+        Exact document count. Uses count_documents up to the Data API's counting
+        limit and pages through `_id`-only projections beyond it: the estimated
+        count is approximate and lags right after bulk inserts, so it can't be
+        used to validate a freshly loaded collection.
+        """
+        try:
+            return self.collection.count_documents({}, upper_bound=upper_bound)
+        except TooManyDocumentsToCountException:
+            return sum(1 for _ in self.collection.find({}, projection={"_id": True}))
+
+
+class InMemoryVectorSink:
+    """
+    Local stand-in for AstraVectorSink (same interface), for dry runs and for
+    exercising the ingestion pipeline without a database. Optional per-call
+    latency and random failures simulate a remote store.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, failure_rate: float = 0.0, seed: int | None = None):
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.documents = {}
+        self.vectors = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+        if failed:
+            raise ConnectionError("simulated vector store failure")
+
+    def fetch_fingerprints(self, keys=("embed_hash", "content_hash"), ids=None) -> dict:
+        ids = None if ids is None else set(ids)
+        with self._lock:
+            return {
+                doc_id: {k: doc.metadata.get(k) for k in keys}
+                for doc_id, doc in self.documents.items()
+                if ids is None or doc_id in ids
+            }
+
+    def upsert_vectors(self, documents, vectors, ids) -> list:
+        self._call()
+        with self._lock:
+            for doc, vector, doc_id in zip(documents, vectors, ids):
+                self.documents[doc_id] = doc
+                self.vectors[doc_id] = vector
+        return list(ids)
+
+    def update_content(self, updates) -> int:
+        if not updates:
+            return 0
+        self._call()
+        with self._lock:
+            updated = [doc_id for doc_id, _ in updates if doc_id in self.documents]
+            self.documents.update((doc_id, doc) for doc_id, doc in updates if doc_id in self.documents)
+        return len(updated)
+
+    def delete(self, ids) -> int:
+        if not ids:
+            return 0
+        self._call()
+        with self._lock:
+            return sum(self.documents.pop(doc_id, None) is not None for doc_id in ids)
+
+    def count(self, upper_bound: int = 1000) -> int:
+        return len(self.documents)
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def cosine_scores(query_vector, candidate_vectors) -> np.ndarray:
+    """
+    Cosine similarity of every candidate to the query.
+    """
+    query = _normalize_rows(np.asarray(query_vector, dtype=np.float32)[None, :])[0]
+    candidates = _normalize_rows(np.asarray(candidate_vectors, dtype=np.float32))
+    return candidates @ query
+
+
+def maximal_marginal_relevance(query_vector, candidate_vectors, k: int = 4, lambda_mult: float = 0.5) -> list[int]:
+    """
+    Select `k` candidate indices with Maximal Marginal Relevance.
+
+    Picks greedily while keeping a running "max similarity to anything selected"
+    vector, so each step is one matrix-vector product plus a vectorised update
+    instead of a loop over the selected items. Only the k rows of the
+    candidate/candidate similarity matrix that are actually needed are computed.
+
+    lambda_mult = 1 -> pure relevance, lambda_mult = 0 -> pure diversity.
+    """
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    if candidates.ndim != 2 or candidates.shape[0] == 0 or k <= 0:
+        return []
+
+    k = min(k, candidates.shape[0])
+    candidates = _normalize_rows(candidates)
+    query = _normalize_rows(np.asarray(query_vector, dtype=np.float32)[None, :])[0]
+
+    relevance = candidates @ query
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    max_redundancy = candidates @ candidates[first]
+    available = np.ones(candidates.shape[0], dtype=bool)
+    available[first] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_redundancy, candidates @ candidates[best], out=max_redundancy)
+
+    return selected
@@ -0,0 +1,114 @@
+import re
+
+from langchain_core.messages import HumanMessage
+
+# Bare model/series names -> brand-qualified form used in product titles.
+BRAND_NORMALIZATIONS = {
+    "iphone": "Apple iPhone",
+    "ipad": "Apple iPad",
+    "macbook": "Apple MacBook",
+    "airpods": "Apple AirPods",
+    "galaxy": "Samsung Galaxy",
+    "pixel": "Google Pixel",
+    "redmi": "Xiaomi Redmi",
+    "iqoo": "vivo iQOO",
+    "moto": "Motorola",
+}
+
+# Shopping vocabulary -> wording more common in titles and reviews.
+SYNONYMS = {
+    "budget": "affordable",
+    "cheap": "affordable",
+    "low budget": "affordable",
+    "inexpensive": "affordable",
+    "phone": "smartphone",
+    "phones": "smartphones",
+    "mobile": "smartphone",
+    "mobiles": "smartphones",
+    "earphones": "earbuds",
+    "headphone": "headphones",
+    "laptop": "notebook",
+    "best": "top rated",
+    "good": "top rated",
+}
+
+
+def _replace_words(text: str, mapping: dict) -> str:
+    # Longest keys first so "low budget" wins over "budget".
+    keys = sorted(mapping, key=len, reverse=True)
+    pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keys) + r")\b", re.IGNORECASE)
+    return pattern.sub(lambda m: mapping[m.group(0).lower()], text)
+
+
+def _normalize_brands(text: str) -> str:
+    def _sub(match):
+        word = match.group(0)
+        replacement = BRAND_NORMALIZATIONS[word.lower()]
+        # Skip if the brand is already written right before the model name.
+        prefix = text[: match.start()].rstrip().lower()
+        brand = replacement.split()[0].lower()
+        return word if prefix.endswith(brand) else replacement
+
+    pattern = re.compile(
+        r"\b(" + "|".join(re.escape(k) for k in BRAND_NORMALIZATIONS) + r")\b", re.IGNORECASE
+    )
+    return pattern.sub(_sub, text)
+
+
+def expand_query(query: str, max_variants: int = 3) -> list[str]:
+    """
+    Cheap deterministic query variants: the original query, a brand-normalised
+    form and a synonym-expanded form. Duplicates are dropped, order is kept.
+    """
+    query = " ".join((query or "").split())
+    brand_normalized = _normalize_brands(query)
+    candidates = [
+        query,
+        brand_normalized,
+        _replace_words(brand_normalized, SYNONYMS),
+    ]
+
+    variants = []
+    seen = set()
+    for candidate in candidates:
+        key = candidate.lower()
+        if candidate and key not in seen:
+            seen.add(key)
+            variants.append(candidate)
+    return variants[:max_variants]
+
+
+def llm_query_variants(llm, query: str, n: int = 2) -> list[str]:
+    """
+    Ask the LLM for `n` alternative phrasings of the query in a single call.
+    """
+    prompt = (
+        f"Write {n} alternative search queries for an e-commerce product search engine "
+        "that capture the same intent as the query below. Keep any price, rating or brand "
+        "constraints. Return one query per line with no numbering or extra text.\n\n"
+        f"Query: {query}"
+    )
+    response = llm.invoke([HumanMessage(content=prompt)])
+    lines = [line.strip(" -*\t").strip() for line in str(response.content).splitlines()]
+    return [line for line in lines if line][:n]
+
+
+def reciprocal_rank_fusion(ranked_lists, k: int = 60, top_n: int | None = None):
+    """
+    Fuse several ranked document lists with Reciprocal Rank Fusion.
+
+    score(doc) = sum over lists of 1 / (k + rank), rank starting at 1.
+    Documents are identified by metadata product_id (page_content as fallback).
+    """
+    scores = {}
+    docs_by_key = {}
+    for docs in ranked_lists:
+        for rank, doc in enumerate(docs, start=1):
+            key = (doc.metadata or {}).get("product_id") or doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            docs_by_key.setdefault(key, doc)
+
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    if top_n is not None:
+        ordered = ordered[:top_n]
+    return [docs_by_key[key] for key in ordered]
@@ -0,0 +1,189 @@
+import re
+
+from product_assistant.utils.metadata_parser import detect_brands, parse_amount
+
+# Units that make a number a spec or a count, not a price ("512GB", "5000 mAh", "1000 reviews")
+_NOT_PRICE_UNITS = r"(?:gb|tb|mb|mah|mp|inch(?:es)?|hz|reviews?|ratings?)"
+
+_AMOUNT = (
+    r"(?:₹|rs\.?|inr|rupees)?\s*"
+    r"(\d{1,3}(?:,\d{2,3})+|\d+(?:\.\d+)?)(?:\s*(k|thousand|lakhs?|lacs?|l))?\b"
+    r"(?!\s*" + _NOT_PRICE_UNITS + r"\b)"
+    r"(?:\s*(?:₹|rs\.?|inr|rupees|/-))?"
+)
+
+_MAX_PRICE_RE = re.compile(
+    r"\b(?:under|below|less than|cheaper than|within|upto|up to|maximum|not more than)\s*" + _AMOUNT,
+    re.IGNORECASE,
+)
+_MIN_PRICE_RE = re.compile(
+    r"\b(?:above|over|more than|greater than|at least|min(?:imum)?|starting(?: from| at)?)\s*" + _AMOUNT,
+    re.IGNORECASE,
+)
+_RANGE_PRICE_RE = re.compile(
+    r"\b(?:between\s*)?" + _AMOUNT + r"\s*(?:and|to|-)\s*" + _AMOUNT,
+    re.IGNORECASE,
+)
+_RATING_RES = [
+    re.compile(r"\b([0-5](?:\.\d)?)\s*(?:\+|stars?|★)", re.IGNORECASE),
+    re.compile(
+        r"\brat(?:ing|ed)\s*(?:of\s*)?(?:above|over|at least|min(?:imum)?|>=?|\+)?\s*([0-5](?:\.\d)?)\b",
+        re.IGNORECASE,
+    ),
+]
+_CURRENCY_HINT_RE = re.compile(r"₹|\brs\b|\binr\b|rupees|/-", re.IGNORECASE)
+# Words that make a bare "X to Y" range a price range ("budget 20000 to 30000")
+_PRICE_CONTEXT_RE = re.compile(r"\b(?:price[ds]?|pricing|budget|cost(?:s|ing)?)\b", re.IGNORECASE)
+
+# Bare numbers smaller than this are not treated as prices ("iPhone 15", "rated 4").
+_MIN_BARE_PRICE = 500
+_YEAR_RE = re.compile(r"(?:19|20)\d\d")
+
+
+def _to_price(match, number_group=1, unit_group=2, default_unit=""):
+    """
+    Turn an _AMOUNT match into rupees, or None if it does not look like a price.
+    """
+    number = match.group(number_group)
+    unit = match.group(unit_group) or default_unit
+    value = parse_amount(f"{number} {unit}".strip())
+    if value is None:
+        return None
+    if unit or value >= _MIN_BARE_PRICE or _CURRENCY_HINT_RE.search(match.group(0)):
+        return value
+    return None
+
+
+def _is_bare_price_range(match) -> bool:
+    """
+    "between 10000 and 20000", "10000 to 20000": both ends are price-sized and not years.
+    """
+    low, high = match.group(1), match.group(3)
+    values = [parse_amount(number) for number in (low, high)]
+    if any(value is None or value < _MIN_BARE_PRICE for value in values):
+        return False
+    return not all(_YEAR_RE.fullmatch(number) for number in (low, high))
+
+
+def parse_query_constraints(query: str) -> dict:
+    """
+    Extract structured constraints from a free-text product query.
+
+    Returns a dict with any of: max_price, min_price, min_rating, brands.
+    """
+    constraints = {}
+    text = query or ""
+
+    range_match = _RANGE_PRICE_RE.search(text)
+    # A bare range is a price with a currency, a unit, price wording or price-sized ends
+    # ("phones between 10000 and 20000"), but not a year range ("from 2023 to 2024")
+    if range_match and not (
+        range_match.group(2) or range_match.group(4)
+        or _CURRENCY_HINT_RE.search(text, max(range_match.start() - 4, 0), range_match.end() + 4)
+        or _PRICE_CONTEXT_RE.search(text)
+        or _is_bare_price_range(range_match)
+    ):
+        range_match = None
+    if range_match:
+        high = _to_price(range_match, 3, 4)
+        # "20-30k", "between 2 and 3 lakh": the low end takes the high end's unit
+        low = None
+        if high is not None and range_match.group(4) and not range_match.group(2):
+            low = _to_price(range_match, 1, 2, default_unit=range_match.group(4))
+            if low is not None and low >= high:
+                low = None
+        if low is None:
+            low = _to_price(range_match, 1, 2)
+        if low is not None and high is not None and low < high:
+            constraints["min_price"], constraints["max_price"] = low, high
+
+    if "max_price" not in constraints:
+        match = _MAX_PRICE_RE.search(text)
+        price = _to_price(match) if match else None
+        if price is not None:
+            constraints["max_price"] = price
+
+    if "min_price" not in constraints:
+        match = _MIN_PRICE_RE.search(text)
+        price = _to_price(match) if match else None
+        if price is not None:
+            constraints["min_price"] = price
+
+    for pattern in _RATING_RES:
+        match = pattern.search(text)
+        if match:
+            constraints["min_rating"] = float(match.group(1))
+            break
+
+    brands = detect_brands(text)
+    if brands:
+        constraints["brands"] = brands
+
+    return constraints
+
+
+def without_price(constraints: dict) -> dict:
+    """
+    Copy of constraints with the price bounds removed (rating and brand kept).
+    """
+    return {key: value for key, value in constraints.items() if key not in ("min_price", "max_price")}
+
+
+def relaxation_plan(constraints: dict) -> list:
+    """
+    Metadata filters to try in order until one returns products: the parsed
+    constraints, then without the price bounds, then unfiltered as the last resort.
+    """
+    plan = [build_metadata_filter(constraints)]
+    if plan[0] is None:
+        return plan
+    relaxed = without_price(constraints)
+    if relaxed != constraints:
+        plan.append(build_metadata_filter(relaxed))
+    if plan[-1] is not None:
+        plan.append(None)
+    return plan
+
+
+def build_metadata_filter(constraints: dict):
+    """
+    Convert parsed constraints into an AstraDB metadata filter (or None).
+    """
+    clauses = []
+
+    price_clause = {}
+    if "min_price" in constraints:
+        price_clause["$gte"] = constraints["min_price"]
+    if "max_price" in constraints:
+        price_clause["$lte"] = constraints["max_price"]
+    if price_clause:
+        # Collapsed variant groups (see etl.near_dedup) match if their price range overlaps
+        range_clauses = []
+        if "max_price" in constraints:
+            range_clauses.append({"min_price_inr": {"$lte": constraints["max_price"]}})
+        if "min_price" in constraints:
+            range_clauses.append({"max_price_inr": {"$gte": constraints["min_price"]}})
+        variant_clause = range_clauses[0] if len(range_clauses) == 1 else {"$and": range_clauses}
+        clauses.append({"$or": [{"price_inr": price_clause}, variant_clause]})
+
+    if "min_rating" in constraints:
+        clauses.append({"rating": {"$gte": constraints["min_rating"]}})
+
+    brands = constraints.get("brands") or []
+    if len(brands) == 1:
+        clauses.append({"brand": brands[0]})
+    elif brands:
+        clauses.append({"brand": {"$in": brands}})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def parse_query_filters(query: str):
+    """
+    Parse a user query straight into an AstraDB metadata filter (or None).
+    """
+    return build_metadata_filter(parse_query_constraints(query))
@@ -127,12 +127,27 @@
 
 
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from langchain_astradb import AstraDBVectorStore
 
 from product_assistant.utils.config_loader import load_config
 from product_assistant.utils.model_loader import ModelLoader
+from product_assistant.utils.embedding_cache import CachedEmbeddings
+from product_assistant.utils.embedding_batcher import MicroBatchingEmbeddings
+from product_assistant.utils.local_embeddings import embed_query_texts
+from product_assistant.utils.collection_pointer import CollectionPointer, check_collection_dimension
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.retriever.query_filters import parse_query_constraints, relaxation_plan
+from product_assistant.retriever.mmr import cosine_scores, maximal_marginal_relevance
+from product_assistant.retriever.query_expansion import (
+    expand_query,
+    llm_query_variants,
+    reciprocal_rank_fusion,
+)
 from product_assistant.evaluation.ragas_eval import (
     evaluate_context_precision,
     evaluate_response_relevancy,
@@ -148,7 +163,23 @@ class Retriever:
         self.config = load_config()
         self._load_env_variables()
         self.vstore = None
-        self.retriever_instance = None
+        self.llm = None
+
+        self.collection_pointer = None
+        self.collection_name = None
+        self._pointer_checked_at = 0.0
+        self._reload_lock = threading.Lock()
+
+        retriever_cfg = self.config.get("retriever", {})
+        self.search_type = retriever_cfg.get("search_type", "similarity")
+        self.search_kwargs = {
+            "k": retriever_cfg.get("top_k", 3),
+            "score_threshold": retriever_cfg.get("score_threshold", 0.5),
+        }
+        self.mmr_kwargs = {
+            "fetch_k": retriever_cfg.get("fetch_k", 20),
+            "lambda_mult": retriever_cfg.get("lambda_mult", 0.7),
+        }
 
     def _load_env_variables(self):
         """
@@ -173,57 +204,268 @@ class Retriever:
         self.db_application_token = os.getenv("ASTRA_DB_APPLICATION_TOKEN")
         self.db_keyspace = os.getenv("ASTRA_DB_KEYSPACE")
 
+    def _active_collection_name(self):
+        """
+        Collection currently behind the configured alias.
+        The pointer is re-read at most every `alias.refresh_seconds`, so a blue/green
+        switch made by ingestion is picked up without restarting the process.
+        Only one caller per refresh interval reads the pointer; the others keep the
+        current collection instead of waiting on that round trip.
+        """
+        astra_cfg = self.config["astra_db"]
+        alias_cfg = astra_cfg.get("alias", {})
+        if not alias_cfg.get("enabled", False):
+            return astra_cfg["collection_name"]
+
+        with self._reload_lock:
+            now = time.monotonic()
+            if self.collection_name and now - self._pointer_checked_at < alias_cfg.get("refresh_seconds", 30):
+                return self.collection_name
+            self._pointer_checked_at = now
+            if self.collection_pointer is None:
+                self.collection_pointer = CollectionPointer(
+                    api_endpoint=self.db_api_endpoint,
+                    token=self.db_application_token,
+                    keyspace=self.db_keyspace,
+                    alias=astra_cfg["collection_name"],
+                    pointer_collection=alias_cfg.get("pointer_collection"),
+                )
+            pointer = self.collection_pointer
+
+        try:
+            return pointer.resolve()
+        except Exception as e:
+            # Keep serving from the current collection if the pointer can't be read
+            log.warning("Could not resolve collection alias, keeping current collection | error=%s", e)
+            return self.collection_name or astra_cfg["collection_name"]
+
     def load_retriever(self):
         """
-        Load AstraDB vector store and create MMR retriever.
+        Load the AstraDB vector store searched by call_retriever.
+        Rebuilt when the collection alias has been switched to a new version.
         """
-        if not self.vstore:
-            collection_name = self.config["astra_db"]["collection_name"]
-
-            self.vstore = AstraDBVectorStore(
-                embedding=self.model_loader.load_embeddings(),
-                collection_name=collection_name,
-                api_endpoint=self.db_api_endpoint,
-                token=self.db_application_token,
-                namespace=self.db_keyspace,
-            )
+        # Resolved outside the lock: the pointer read is a network call
+        collection_name = self._active_collection_name()
+        if self.vstore and collection_name == self.collection_name:
+            return self.vstore
+
+        with self._reload_lock:
+            if not self.vstore or collection_name != self.collection_name:
+                embeddings = self.model_loader.load_embeddings()
+                check_collection_dimension(
+                    self.db_api_endpoint,
+                    self.db_application_token,
+                    self.db_keyspace,
+                    collection_name,
+                    self.model_loader.embedding_dimension(embeddings),
+                    self.model_loader.embedding_signature(),
+                )
+                vstore = AstraDBVectorStore(
+                    embedding=embeddings,
+                    collection_name=collection_name,
+                    api_endpoint=self.db_api_endpoint,
+                    token=self.db_application_token,
+                    namespace=self.db_keyspace,
+                )
+                if self.collection_name:
+                    log.info(
+                        "Switching retriever collection | previous=%s | active=%s",
+                        self.collection_name,
+                        collection_name,
+                    )
+                # Threshold, metadata filters and MMR are applied in call_retriever, see _vector_hits.
+                self.vstore = vstore
+                self.collection_name = collection_name
+
+                log.info("Retriever loaded | collection=%s", collection_name)
+
+        return self.vstore
+
+    def _query_constraints(self, query):
+        """
+        Parse price/rating/brand constraints from the query, if metadata filters are enabled.
+        """
+        if not self.config.get("retriever", {}).get("metadata_filters", True):
+            return {}
+        return parse_query_constraints(query)
 
-        if not self.retriever_instance:
-            top_k = (
-                self.config["retriever"]["top_k"]
-                if "retriever" in self.config
-                else 3
-            )
+    def _embed_queries(self, queries):
+        """
+        Embed several queries in a single embeddings call (cache-aware when enabled).
+        """
+        return embed_query_texts(self.vstore.embeddings, queries)
+
+    def _vector_hits(self, vector, k, metadata_filter=None):
+        """
+        Run one vector search and drop hits below the score threshold.
+
+        With search_type "mmr", `fetch_k` candidates are fetched together with their
+        vectors in one round trip; those above the threshold are re-ranked locally with MMR.
+        """
+        threshold = self.search_kwargs["score_threshold"]
 
-            # self.retriever_instance = self.vstore.as_retriever(
-            #     search_type="mmr",
-            #     search_kwargs={
-            #         "k": top_k,
-            #         "fetch_k": 20,
-            #         "lambda_mult": 0.7,
-            #         "score_threshold": 0.6,
-            #     },
-            # )
-            self.retriever_instance = self.vstore.as_retriever(
-                search_type="similarity_score_threshold",
-                search_kwargs={
-                    "k": 3,
-                    "score_threshold": 0.5
-                }
+        if self.search_type == "mmr":
+            fetch_k = max(self.mmr_kwargs["fetch_k"], k)
+            hits = self.vstore.similarity_search_with_embedding_by_vector(
+                vector, k=fetch_k, filter=metadata_filter
+            )
+            if not hits:
+                return []
+            # AstraDB reports cosine similarity as (1 + cos) / 2
+            scores = (1.0 + cosine_scores(vector, [emb for _, emb in hits])) / 2.0
+            # Threshold first, so irrelevant-but-diverse candidates can't take MMR slots
+            relevant = [hit for hit, score in zip(hits, scores) if score >= threshold]
+            if not relevant:
+                return []
+            selected = maximal_marginal_relevance(
+                vector, [emb for _, emb in relevant], k=k, lambda_mult=self.mmr_kwargs["lambda_mult"]
             )
+            return [relevant[i][0] for i in selected]
+
+        hits = self.vstore.similarity_search_with_score_by_vector(
+            vector, k=k, filter=metadata_filter
+        )
+        return [doc for doc, score in hits if score >= threshold]
+
+    def _search_vectors(self, vectors, k, constraints, max_workers=8):
+        """
+        Search several query vectors under the same constraints.
 
-            print("Retriever loaded successfully.")
+        Every vector is searched with the same metadata filter; it is relaxed (see
+        relaxation_plan) only when no vector found anything, so all result lists
+        are ranked under one filter.
+        """
+        def _search_all(metadata_filter):
+            if len(vectors) == 1:
+                return [self._vector_hits(vectors[0], k, metadata_filter)]
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(vectors))) as executor:
+                return list(executor.map(lambda v: self._vector_hits(v, k, metadata_filter), vectors))
+
+        plan = relaxation_plan(constraints)
+        per_query = _search_all(plan[0])
+        for previous, metadata_filter in zip(plan, plan[1:]):
+            if any(per_query):
+                break
+            log.info(
+                "No products matched filter, relaxing it | filter=%s | relaxed=%s",
+                previous,
+                metadata_filter,
+            )
+            per_query = _search_all(metadata_filter)
+        return per_query
 
-        return self.retriever_instance
+    def _search_by_vector(self, query, vector, k=None):
+        """
+        Vector search for one query, applying its metadata filter and the score threshold.
+        """
+        k = k or self.search_kwargs["k"]
+        return self._search_vectors([vector], k, self._query_constraints(query))[0]
 
     def call_retriever(self, query):
         """
         Invoke retriever with user query.
+        Structured constraints in the query (price, rating, brand) are pushed down
+        to the vector store as metadata filters.
         """
-        retriever = self.load_retriever()
-        output = retriever.invoke(query)
+        if self.config.get("retriever", {}).get("mode", "single") == "fusion":
+            return self.call_retriever_fused(query)
+
+        self.load_retriever()
+        vector = self._embed_queries([query])[0]
+        output = self._search_by_vector(query, vector)
         return output
 
+    def call_retriever_fused(self, query):
+        """
+        Multi-query retrieval: expand the query into a few variants (deterministic
+        rewrites, optionally one LLM call), retrieve them all in one batch and fuse
+        the ranked lists with Reciprocal Rank Fusion.
+        """
+        fusion_cfg = self.config.get("retriever", {}).get("fusion", {})
+        max_variants = fusion_cfg.get("max_variants", 3)
+
+        variants = expand_query(query, max_variants=max_variants)
+        if fusion_cfg.get("use_llm", False):
+            if self.llm is None:
+                self.llm = self.model_loader.load_llm()
+            try:
+                variants += llm_query_variants(self.llm, query, n=fusion_cfg.get("llm_variants", 2))
+            except Exception as e:
+                log.warning("LLM query expansion failed, using deterministic variants only | error=%s", e)
+
+        k = self.search_kwargs["k"]
+        # Rewrites can drop the price wording ("budget" -> "affordable"): filter every
+        # variant with the constraints of the original query
+        batch = self.call_retriever_batch(
+            variants,
+            k=fusion_cfg.get("per_query_k", k * 2),
+            constraints=self._query_constraints(query),
+        )
+        ranked_lists = [result["documents"] for result in batch["results"]]
+        return reciprocal_rank_fusion(ranked_lists, k=fusion_cfg.get("rrf_k", 60), top_n=k)
+
+    def call_retriever_batch(self, queries, max_workers=8, k=None, constraints=None):
+        """
+        Retrieve for several queries at once.
+        All queries are embedded in one call and the vector searches run concurrently.
+        Each query is filtered on its own constraints, or on `constraints` for all
+        of them when given (variants of one query, see call_retriever_fused).
+
+        Returns:
+            {"results": [{"query": str, "documents": [...]}, ...],
+             "documents": merged documents, deduplicated by product_id}
+        """
+        if not queries:
+            return {"results": [], "documents": []}
+
+        self.load_retriever()
+        vectors = self._embed_queries(list(queries))
+
+        if constraints is not None:
+            per_query = self._search_vectors(vectors, k or self.search_kwargs["k"], constraints, max_workers)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+                per_query = list(
+                    executor.map(lambda q, v: self._search_by_vector(q, v, k), queries, vectors)
+                )
+
+        merged = []
+        seen = set()
+        for docs in per_query:
+            for doc in docs:
+                key = (doc.metadata or {}).get("product_id") or doc.page_content
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(doc)
+
+        return {
+            "results": [
+                {"query": query, "documents": docs}
+                for query, docs in zip(queries, per_query)
+            ],
+            "documents": merged,
+        }
+
+    def embedding_cache_stats(self):
+        """
+        Return query embedding cache metrics (hit rate, latency), if caching is enabled.
+        """
+        embeddings = self.vstore.embeddings if self.vstore else None
+        if isinstance(embeddings, CachedEmbeddings):
+            return embeddings.stats()
+        return {}
+
+    def embedding_batcher_stats(self):
+        """
+        Return query micro-batching metrics (batch fill, queueing delay), if enabled.
+        """
+        embeddings = self.vstore.embeddings if self.vstore else None
+        if isinstance(embeddings, CachedEmbeddings):
+            embeddings = embeddings.underlying
+        if isinstance(embeddings, MicroBatchingEmbeddings):
+            return embeddings.stats()
+        return {}
+
 
 if __name__ == "__main__":
     user_query = "Can you suggest good budget iPhone under 1,00,000 INR?"
@@ -267,6 +509,10 @@ if __name__ == "__main__":
     print("\n--- Evaluation Metrics ---")
     print("Context Precision Score:", context_score)
     print("Response Relevancy Score:", relevancy_score)
+
+    print("\n--- Embedding Cache ---")
+    print(retriever_obj.embedding_cache_stats())
+    print(retriever_obj.embedding_batcher_stats())
     
     
     
@@ -0,0 +1,134 @@
+import time
+from datetime import datetime, timezone
+
+from astrapy import DataAPIClient
+
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+
+class CollectionPointer:
+    """
+    Alias for the live vector collection, kept in a small non-vector collection.
+
+    One document per alias:
+        {"_id": <alias>, "collection": <active versioned collection>,
+         "previous": <collection it replaced>, "switched_at": <epoch seconds>,
+         "retired": {<collection>: <epoch seconds it stopped being active>}}
+
+    Switching is a single-document update, so readers see either the old or
+    the new collection, never a partially written one.
+    """
+
+    def __init__(self, api_endpoint: str, token: str, keyspace: str, alias: str, pointer_collection: str | None = None):
+        self.alias = alias
+        self.pointer_collection = pointer_collection or f"{alias}_pointer"
+        self.database = DataAPIClient().get_database(api_endpoint, token=token, keyspace=keyspace)
+        self._collection = None
+
+    def _exists(self) -> bool:
+        return self.pointer_collection in self.database.list_collection_names()
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            if not self._exists():
+                self.database.create_collection(self.pointer_collection)
+            self._collection = self.database.get_collection(self.pointer_collection)
+        return self._collection
+
+    def resolve(self) -> str:
+        """
+        Name of the active collection; the alias itself when no switch has happened yet.
+        Read-only: never creates the pointer collection.
+        """
+        if self._collection is None and not self._exists():
+            return self.alias
+        doc = self.collection.find_one({"_id": self.alias}, projection={"collection": True})
+        return doc["collection"] if doc else self.alias
+
+    def new_version_name(self) -> str:
+        return f"{self.alias}_v{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
+
+    def switch(self, collection_name: str) -> str | None:
+        """
+        Point the alias at `collection_name`. Returns the previously active collection,
+        which is stamped as retired now (see retire_old_versions). Before the first
+        switch that is the original, unversioned collection named like the alias.
+        """
+        now = time.time()
+        previous = self.collection.find_one_and_update(
+            {"_id": self.alias},
+            {"$set": {"collection": collection_name, "switched_at": now}},
+            upsert=True,
+            return_document="before",
+        )
+        previous_name = previous["collection"] if previous else self.alias
+        retired = dict((previous or {}).get("retired") or {})
+        retired.pop(collection_name, None)  # switching back to an older version revives it
+        if previous_name and previous_name != collection_name:
+            retired[previous_name] = now
+        self.collection.update_one({"_id": self.alias}, {"$set": {"previous": previous_name, "retired": retired}})
+        log.info("Collection alias switched | alias=%s | active=%s | previous=%s", self.alias, collection_name, previous_name)
+        return previous_name
+
+    def versions(self) -> list[str]:
+        """
+        Collections behind this alias: the versioned ones and the original unversioned one.
+        """
+        prefix = f"{self.alias}_v"
+        return sorted(
+            name for name in self.database.list_collection_names() if name.startswith(prefix) or name == self.alias
+        )
+
+    def retire_old_versions(self, grace_seconds: float, keep: int = 1, exclude=()) -> list[str]:
+        """
+        Drop inactive collection versions that stopped being active more than
+        `grace_seconds` ago. The `keep` most recently retired versions are kept for
+        rollback, and `exclude` (e.g. a shadow still being built) is never touched.
+        Versions with no retirement time yet (from before it was tracked) are
+        stamped now and age from here.
+        """
+        doc = self.collection.find_one({"_id": self.alias})
+        if not doc:
+            return []
+
+        retired = dict(doc.get("retired") or {})
+        now = time.time()
+        inactive = [name for name in self.versions() if name != doc["collection"] and name not in exclude]
+        unstamped = {name: now for name in inactive if name not in retired}
+        if unstamped:
+            retired.update(unstamped)
+            self.collection.update_one({"_id": self.alias}, {"$set": {"retired": retired}})
+
+        newest_first = sorted(inactive, key=lambda name: (retired[name], name), reverse=True)
+        to_drop = [name for name in newest_first[keep:] if now - retired[name] >= grace_seconds]
+        for name in to_drop:
+            self.database.drop_collection(name)
+            retired.pop(name)
+            log.info("Retired collection version | alias=%s | collection=%s", self.alias, name)
+        if to_drop:
+            self.collection.update_one({"_id": self.alias}, {"$set": {"retired": retired}})
+        return to_drop
+
+
+def check_collection_dimension(
+    api_endpoint: str, token: str, keyspace: str, collection_name: str, dimension: int | None, signature: str
+):
+    """
+    Fail fast if an existing collection holds vectors of another dimension than the
+    configured embedding space (e.g. provider switched to a 384-dim local model while
+    collection_name still points at 1536-dim OpenAI vectors). Missing collections pass.
+    """
+    if not dimension:
+        return
+    database = DataAPIClient().get_database(api_endpoint, token=token, keyspace=keyspace)
+    if collection_name not in database.list_collection_names():
+        return
+    vector_options = database.get_collection(collection_name).options().vector
+    stored = vector_options.dimension if vector_options else None
+    if stored and stored != dimension:
+        raise ValueError(
+            f"Collection '{collection_name}' stores {stored}-dim vectors, but the embedding "
+            f"space '{signature}' produces {dimension}-dim vectors. Point astra_db.collection_name "
+            f"at a collection for this model (and ingest into it) or switch the model back."
+        )
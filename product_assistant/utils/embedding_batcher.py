@@ -0,0 +1,176 @@
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.utils.local_embeddings import aembed_query_texts, embed_query_texts
+
+# Queued by close(): the collector dispatches what it holds and exits
+_STOP = object()
+
+
+class MicroBatchingEmbeddings(Embeddings):
+    """
+    Micro-batcher in front of an embeddings client.
+
+    Concurrent callers' queries are queued; a collector thread waits at most
+    `max_wait_ms` after the first queued query (or until `max_batch_size` queries
+    are waiting) and sends them in one batch query call (see embed_query_texts),
+    then resolves each caller's future. Works for threads and asyncio callers alike.
+
+    Document embedding (ingestion) and query lists larger than a batch bypass the queue.
+    close() dispatches the queries still queued and stops the collector.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 4,
+    ):
+        self.underlying = underlying
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="embed-batch"
+        )
+        self._collector = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "batches": 0,
+            "items": 0,
+            "queue_delay_seconds": 0.0,
+            "max_queue_delay_seconds": 0.0,
+            "errors": 0,
+        }
+
+    # ---------- Batching ----------
+    def _submit(self, text: str) -> Future:
+        future: Future = Future()
+        # Under the lock so nothing is queued behind close()'s stop marker
+        with self._start_lock:
+            if self._closed:
+                raise RuntimeError("Embedding micro-batcher is closed")
+            if self._collector is None:
+                self._collector = threading.Thread(
+                    target=self._collect, name="embed-batch-collector", daemon=True
+                )
+                self._collector.start()
+            self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def _collect(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._executor.submit(self._dispatch, batch)
+            if stop:
+                return
+
+    def close(self):
+        """
+        Dispatch the queries still queued, wait for in-flight batches and stop the
+        collector thread. Later queries through the queue raise RuntimeError.
+        """
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            collector = self._collector
+            if collector is not None:
+                self._queue.put(_STOP)
+        if collector is not None:
+            collector.join()
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self, batch):
+        dispatched_at = time.perf_counter()
+        delays = [dispatched_at - enqueued_at for _, _, enqueued_at in batch]
+        with self._metrics_lock:
+            self._metrics["batches"] += 1
+            self._metrics["items"] += len(batch)
+            self._metrics["queue_delay_seconds"] += sum(delays)
+            self._metrics["max_queue_delay_seconds"] = max(
+                self._metrics["max_queue_delay_seconds"], max(delays)
+            )
+
+        try:
+            vectors = embed_query_texts(self.underlying, [text for text, _, _ in batch])
+        except Exception as e:
+            with self._metrics_lock:
+                self._metrics["errors"] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+    # ---------- Embeddings interface ----------
+    def embed_query(self, text: str) -> list[float]:
+        return self._submit(text).result()
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await asyncio.wrap_future(self._submit(text))
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        if len(texts) > self.max_batch_size:
+            return embed_query_texts(self.underlying, texts)
+        futures = [self._submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        if len(texts) > self.max_batch_size:
+            return await aembed_query_texts(self.underlying, texts)
+        futures = [asyncio.wrap_future(self._submit(text)) for text in texts]
+        return list(await asyncio.gather(*futures))
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.underlying.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.underlying.aembed_documents(texts)
+
+    # ---------- Metrics ----------
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            m = dict(self._metrics)
+        batches = m["batches"]
+        return {
+            "batches": batches,
+            "items": m["items"],
+            "avg_batch_size": round(m["items"] / batches, 2) if batches else 0.0,
+            "avg_batch_fill": round(m["items"] / (batches * self.max_batch_size), 4) if batches else 0.0,
+            "avg_queue_delay_ms": round(1000 * m["queue_delay_seconds"] / m["items"], 3) if m["items"] else 0.0,
+            "max_queue_delay_ms": round(1000 * m["max_queue_delay_seconds"], 3),
+            "errors": m["errors"],
+        }
+
+    def log_stats(self):
+        log.info("Embedding micro-batcher stats | %s", self.stats())
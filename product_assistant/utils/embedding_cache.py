@@ -0,0 +1,502 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.utils.local_embeddings import aembed_query_texts, embed_query_texts
+from product_assistant.utils.quantization import dequantize_int8, quantize_int8
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise text before hashing: unicode NFKC, collapsed whitespace, casefold.
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split()).casefold()
+
+
+def make_cache_key(model_name: str, text: str) -> str:
+    """
+    Cache key for a (model, text) pair. Text is expected to be normalised already.
+    """
+    return hashlib.sha1(f"{model_name}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+def signature_cache_dir(base_dir: str, signature: str) -> str:
+    """
+    Per-embedding-space subdirectory: a store holds vectors of a single dimension.
+    """
+    return os.path.join(base_dir, re.sub(r"[^0-9A-Za-z._-]+", "_", signature))
+
+
+def make_content_key(signature: str, content: str) -> str:
+    """
+    Content-addressed key for a document embedding: exact text, no normalisation.
+    """
+    return hashlib.sha256(f"{signature}\x1f{content}".encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk vector store.
+
+    Layout inside `directory`:
+        meta.json    -> {"dimension": int, "dtype": "float16" | "float32" | "int8"}
+        vectors.bin  -> fixed-width rows, read back through a numpy memmap
+        index.tsv    -> one "<key>\\t<row>" line per stored vector
+
+    int8 rows are stored as a float32 scale followed by `dimension` int8 codes.
+
+    Appends hold an exclusive flock on `store.lock`, so several processes (server
+    workers) can share one directory without misaligning index rows and vector rows.
+    Each process only sees the entries that existed when it loaded, plus its own.
+
+    With `max_entries` set, appends stop once the file holds that many rows; rows
+    are never rewritten in place, so trimming is left to `compact` (run offline,
+    see etl.cache_admin).
+    """
+
+    SUPPORTED_DTYPES = ("float16", "float32", "int8")
+
+    def __init__(self, directory: str, dtype: str = "float16", max_entries: int | None = None):
+        if dtype not in self.SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding store dtype: {dtype}")
+
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self._vectors_path = os.path.join(self.directory, "vectors.bin")
+        self._index_path = os.path.join(self.directory, "index.tsv")
+        self._lock_path = os.path.join(self.directory, "store.lock")
+
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        self._mmap = None
+        self.dimension = None
+        self.dtype = dtype
+        self.max_entries = max_entries
+
+        self._load()
+
+    @contextmanager
+    def _locked(self):
+        # Thread lock, plus an inter-process file lock where the platform has one
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_meta(self):
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dimension = meta["dimension"]
+            self.dtype = meta["dtype"]
+
+    def _load(self):
+        with self._locked():
+            self._load_meta()
+            self._repair()
+
+            if os.path.exists(self._index_path):
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        key, _, row = line.rstrip("\n").partition("\t")
+                        if key and row:
+                            self._index[key] = int(row)
+
+            # Drop index entries whose rows never made it to disk (e.g. crash mid-write)
+            rows_on_disk = self._rows_on_disk()
+            self._index = {k: r for k, r in self._index.items() if r < rows_on_disk}
+
+    def _repair(self):
+        """
+        Cut what a crash mid-append left behind: a partial vector row (every row
+        appended after it would be misaligned) and an unterminated index line.
+        Called with the store lock held, so no append is in progress.
+        """
+        if self.dimension and os.path.exists(self._vectors_path):
+            size = os.path.getsize(self._vectors_path)
+            whole = size - size % self._row_bytes()
+            if whole != size:
+                log.warning("Truncating partial embedding row | path=%s | bytes=%s", self._vectors_path, size - whole)
+                with open(self._vectors_path, "r+b") as f:
+                    f.truncate(whole)
+                self._mmap = None
+
+        if os.path.exists(self._index_path) and os.path.getsize(self._index_path):
+            with open(self._index_path, "r+b") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.seek(0)
+                    f.truncate(f.read().rfind(b"\n") + 1)
+
+    def _row_bytes(self) -> int:
+        if self.dtype == "int8":
+            return 4 + self.dimension
+        return self.dimension * np.dtype(self.dtype).itemsize
+
+    def _rows_on_disk(self) -> int:
+        if not self.dimension or not os.path.exists(self._vectors_path):
+            return 0
+        return os.path.getsize(self._vectors_path) // self._row_bytes()
+
+    def _vectors(self):
+        rows = self._rows_on_disk()
+        if rows == 0:
+            return None
+        if self._mmap is None or self._mmap.shape[0] < rows:
+            self._mmap = np.memmap(
+                self._vectors_path, dtype=np.uint8, mode="r", shape=(rows, self._row_bytes())
+            )
+        return self._mmap
+
+    def _encode(self, matrix: np.ndarray) -> bytes:
+        if self.dtype == "int8":
+            codes, scales = quantize_int8(matrix)
+            rows = np.empty((len(codes), self._row_bytes()), dtype=np.uint8)
+            rows[:, :4] = scales.view(np.uint8).reshape(-1, 4)
+            rows[:, 4:] = codes.view(np.uint8)
+            return rows.tobytes()
+        return matrix.astype(self.dtype).tobytes()
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        rows = np.ascontiguousarray(rows)
+        if self.dtype == "int8":
+            scales = rows[:, :4].copy().view(np.float32).reshape(-1)
+            codes = rows[:, 4:].view(np.int8)
+            return dequantize_int8(codes, scales)
+        return rows.view(self.dtype).astype(np.float32)
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._index)
+
+    def newest_keys(self, n: int) -> list[str]:
+        """
+        The `n` most recently appended keys.
+        """
+        with self._lock:
+            rows = sorted(self._index.items(), key=lambda item: item[1], reverse=True)
+        return [key for key, _ in rows[: max(n, 0)]]
+
+    def nbytes(self) -> int:
+        return sum(
+            os.path.getsize(path)
+            for path in (self._vectors_path, self._index_path, self._meta_path)
+            if os.path.exists(path)
+        )
+
+    def compact(self, keep) -> int:
+        """
+        Rewrite the store with only the keys in `keep` (rows are copied as-is).
+        Returns the number of entries removed. Row numbers change, so run it while
+        no other process has the store open.
+        """
+        keep = set(keep)
+        with self._locked():
+            kept = sorted((row, key) for key, row in self._index.items() if key in keep)
+            removed = len(self._index) - len(kept)
+            if removed == 0:
+                return 0
+
+            vectors = self._vectors()
+            with open(self._vectors_path + ".tmp", "wb") as f:
+                for row, _ in kept:
+                    f.write(vectors[row].tobytes())
+            with open(self._index_path + ".tmp", "w", encoding="utf-8") as f:
+                for new_row, (_, key) in enumerate(kept):
+                    f.write(f"{key}\t{new_row}\n")
+
+            self._mmap = None
+            del vectors
+            os.replace(self._vectors_path + ".tmp", self._vectors_path)
+            os.replace(self._index_path + ".tmp", self._index_path)
+            self._index = {key: new_row for new_row, (_, key) in enumerate(kept)}
+            return removed
+
+    def __contains__(self, key: str):
+        return key in self._index
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                return None
+            return self._decode(self._vectors()[row : row + 1])[0]
+
+    def put_many(self, items: list[tuple[str, list[float]]]) -> int:
+        """
+        Append vectors for keys that are not stored yet, up to `max_entries` rows.
+        Returns the number of vectors written.
+        """
+        with self._locked():
+            new_items = [(k, v) for k, v in items if k not in self._index]
+            if new_items and self.max_entries is not None:
+                new_items = new_items[: max(self.max_entries - self._rows_on_disk(), 0)]
+            if not new_items:
+                return 0
+
+            if self.dimension is None:
+                self._load_meta()  # another process may have created the store since
+            if self.dimension is None:
+                self.dimension = len(new_items[0][1])
+                with open(self._meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dimension": self.dimension, "dtype": self.dtype}, f)
+
+            matrix = np.asarray([v for _, v in new_items], dtype=np.float32)
+            if matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match store dimension {self.dimension}"
+                )
+
+            # Under the file lock: rows appended by other processes are counted too
+            self._repair()
+            start_row = self._rows_on_disk()
+            with open(self._vectors_path, "ab") as f:
+                f.write(self._encode(matrix))
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                for offset, (key, _) in enumerate(new_items):
+                    f.write(f"{key}\t{start_row + offset}\n")
+                    self._index[key] = start_row + offset
+            return len(new_items)
+
+    def put(self, key: str, vector: list[float]) -> int:
+        return self.put_many([(key, vector)])
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Query embedding cache in front of any LangChain embeddings client.
+
+    Lookups go: in-memory LRU -> on-disk store -> underlying client.
+    Only query embeddings are cached; `embed_documents` passes straight through.
+    The LRU holds float32 arrays (a Python list of floats is ~8x larger); lists
+    are only built for the caller.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        model_name: str,
+        max_entries: int = 10000,
+        cache_dir: str | None = None,
+        dtype: str = "float16",
+        max_disk_entries: int | None = None,
+    ):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.disk_store = (
+            DiskEmbeddingStore(cache_dir, dtype=dtype, max_entries=max_disk_entries) if cache_dir else None
+        )
+
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "lookup_seconds": 0.0,
+            "miss_seconds": 0.0,
+        }
+
+    # ---------- Cache helpers ----------
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, key: str):
+        start = time.perf_counter()
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._metrics["memory_hits"] += 1
+
+        if vector is None and self.disk_store is not None:
+            stored = self.disk_store.get(key)
+            if stored is not None:
+                vector = stored
+                self._remember(key, vector)
+                with self._lock:
+                    self._metrics["disk_hits"] += 1
+
+        with self._lock:
+            self._metrics["lookup_seconds"] += time.perf_counter() - start
+        return vector
+
+    def _store(self, items: list[tuple[str, list[float]]], elapsed: float):
+        for key, vector in items:
+            self._remember(key, np.asarray(vector, dtype=np.float32))
+        if self.disk_store is not None:
+            self.disk_store.put_many(items)
+        with self._lock:
+            self._metrics["misses"] += len(items)
+            self._metrics["miss_seconds"] += elapsed
+
+    # ---------- Embeddings interface ----------
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_queries([text])[0]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_queries([text]))[0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.underlying.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.underlying.aembed_documents(texts)
+
+    def _partition(self, texts: list[str]):
+        # Normalised text only builds the key; misses are embedded as the caller wrote
+        # them. Variants differing only in case / whitespace share one entry, so they
+        # get the vector of whichever variant was embedded first
+        keys = [make_cache_key(self.model_name, normalize_text(t)) for t in texts]
+        vectors = [self._lookup(k) for k in keys]
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        return keys, vectors, missing
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed several queries, sending only cache misses to the client in one call.
+        """
+        keys, vectors, missing = self._partition(texts)
+        if missing:
+            start = time.perf_counter()
+            fresh = embed_query_texts(self.underlying, list(missing.values()))
+            self._store(list(zip(missing.keys(), fresh)), time.perf_counter() - start)
+            by_key = dict(zip(missing.keys(), fresh))
+            return [v.tolist() if v is not None else by_key[k] for k, v in zip(keys, vectors)]
+        return [v.tolist() for v in vectors]
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = self._partition(texts)
+        if missing:
+            start = time.perf_counter()
+            fresh = await aembed_query_texts(self.underlying, list(missing.values()))
+            self._store(list(zip(missing.keys(), fresh)), time.perf_counter() - start)
+            by_key = dict(zip(missing.keys(), fresh))
+            return [v.tolist() if v is not None else by_key[k] for k, v in zip(keys, vectors)]
+        return [v.tolist() for v in vectors]
+
+    # ---------- Metrics ----------
+    def stats(self) -> dict:
+        with self._lock:
+            m = dict(self._metrics)
+            memory_entries = len(self._memory)
+        hits = m["memory_hits"] + m["disk_hits"]
+        lookups = hits + m["misses"]
+        return {
+            "model": self.model_name,
+            "memory_entries": memory_entries,
+            "disk_entries": len(self.disk_store) if self.disk_store is not None else 0,
+            "memory_hits": m["memory_hits"],
+            "disk_hits": m["disk_hits"],
+            "misses": m["misses"],
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_lookup_ms": round(1000 * m["lookup_seconds"] / lookups, 3) if lookups else 0.0,
+            "avg_miss_ms": round(1000 * m["miss_seconds"] / m["misses"], 3) if m["misses"] else 0.0,
+        }
+
+    def log_stats(self):
+        log.info("Embedding cache stats | %s", self.stats())
+
+
+class DocumentEmbeddingCache(Embeddings):
+    """
+    Content-addressed, on-disk cache for ingestion embeddings.
+
+    Keys are SHA-256 of (embedding signature, exact page_content); the signature
+    carries model and dimension, and a store only ever holds one dimension.
+    Re-ingesting an unchanged catalog costs no embedding calls.
+    """
+
+    def __init__(self, underlying: Embeddings, signature: str, cache_dir: str, dtype: str = "float32"):
+        self.underlying = underlying
+        self.signature = signature
+        self.store = DiskEmbeddingStore(cache_dir, dtype=dtype)
+
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "miss_seconds": 0.0}
+
+    def key(self, text: str) -> str:
+        return make_content_key(self.signature, text)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self.key(t) for t in texts]
+        vectors = []
+        for key in keys:
+            stored = self.store.get(key)
+            vectors.append(stored.tolist() if stored is not None else None)
+
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+
+        if missing:
+            start = time.perf_counter()
+            fresh = self.underlying.embed_documents(list(missing.values()))
+            elapsed = time.perf_counter() - start
+            self.store.put_many(list(zip(missing.keys(), fresh)))
+            by_key = dict(zip(missing.keys(), fresh))
+            vectors = [v if v is not None else by_key[k] for k, v in zip(keys, vectors)]
+        else:
+            elapsed = 0.0
+
+        with self._lock:
+            self._metrics["hits"] += len(texts) - len(missing)
+            self._metrics["misses"] += len(missing)
+            self._metrics["miss_seconds"] += elapsed
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.underlying.embed_query(text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            m = dict(self._metrics)
+        lookups = m["hits"] + m["misses"]
+        return {
+            "signature": self.signature,
+            "entries": len(self.store),
+            "disk_mb": round(self.store.nbytes() / 1024 / 1024, 2),
+            "hits": m["hits"],
+            "misses": m["misses"],
+            "hit_rate": round(m["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_miss_ms": round(1000 * m["miss_seconds"] / m["misses"], 3) if m["misses"] else 0.0,
+        }
+
+    def log_stats(self):
+        log.info("Ingestion embedding cache stats | %s", self.stats())
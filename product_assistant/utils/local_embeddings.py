@@ -0,0 +1,155 @@
+import hashlib
+import threading
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables.config import run_in_executor
+
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.utils.quantization import normalize
+
+# Loaded models are process-wide: loading takes seconds and hundreds of MB.
+_LOCAL_MODELS: dict[tuple[str, str, str], object] = {}
+_LOAD_LOCK = threading.Lock()
+
+# BGE English models embed search queries with this instruction and passages without it
+BGE_QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+
+def default_query_prefix(model_name: str) -> str:
+    name = model_name.lower()
+    return BGE_QUERY_INSTRUCTION if "bge-" in name and "-en" in name else ""
+
+
+def embed_query_texts(embeddings: Embeddings, texts: list[str]) -> list[list[float]]:
+    """
+    Embed several search queries in one call: through the client's batch query path
+    when it has one (LocalEmbeddings, the cache, the micro-batcher), else as
+    documents (OpenAI models embed queries and documents the same way).
+    """
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(texts)
+    return embeddings.embed_documents(texts)
+
+
+async def aembed_query_texts(embeddings: Embeddings, texts: list[str]) -> list[list[float]]:
+    if hasattr(embeddings, "aembed_queries"):
+        return await embeddings.aembed_queries(texts)
+    return await embeddings.aembed_documents(texts)
+
+
+def _load_model(backend: str, model_name: str, device: str):
+    key = (backend, model_name, device)
+    with _LOAD_LOCK:
+        if key in _LOCAL_MODELS:
+            return _LOCAL_MODELS[key]
+
+        if backend == "sentence_transformers":
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError(
+                    "Local embeddings need `sentence-transformers` (pip install sentence-transformers)"
+                ) from e
+            model = SentenceTransformer(model_name, device=device)
+
+        elif backend == "fastembed":
+            try:
+                from fastembed import TextEmbedding
+            except ImportError as e:
+                raise ImportError("ONNX local embeddings need `fastembed` (pip install fastembed)") from e
+            model = TextEmbedding(model_name=model_name)
+
+        else:
+            raise ValueError(f"Unsupported local embedding backend: {backend}")
+
+        log.info("Local embedding model loaded | backend=%s | model=%s | device=%s", backend, model_name, device)
+        _LOCAL_MODELS[key] = model
+        return model
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    CPU-local embeddings (sentence-transformers, or an ONNX model via fastembed).
+    Removes the network hop for query embedding and scales ingestion with local cores.
+
+    Queries go through the model's query path: fastembed's `query_embed`, the
+    model's own "query" prompt, and `query_prefix` (the BGE instruction by default
+    for BGE English models).
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        backend: str = "sentence_transformers",
+        batch_size: int = 64,
+        device: str = "cpu",
+        normalize: bool = True,
+        query_prefix: str | None = None,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.device = device
+        self.normalize = normalize
+        self.query_prefix = default_query_prefix(model_name) if query_prefix is None else query_prefix
+        self.model = _load_model(backend, model_name, device)
+
+    def _encode(self, texts: list[str], query: bool = False) -> list[list[float]]:
+        if not texts:
+            return []
+
+        kwargs = {}
+        if query and self._query_prompt():
+            # The model ships its own query prompt (sentence-transformers)
+            kwargs["prompt_name"] = "query"
+        elif query and self.query_prefix:
+            texts = [self.query_prefix + text for text in texts]
+
+        if self.backend == "fastembed":
+            embed = self.model.query_embed if query else self.model.embed
+            vectors = list(embed(texts, batch_size=self.batch_size))
+            if self.normalize:
+                vectors = normalize(vectors)
+            return [list(map(float, v)) for v in vectors]
+
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            **kwargs,
+        )
+        return vectors.tolist()
+
+    def _query_prompt(self):
+        return (getattr(self.model, "prompts", None) or {}).get("query")
+
+    def query_space(self) -> str:
+        """
+        Short id of how queries are embedded; "" when they are embedded like documents.
+        """
+        marker = self._query_prompt() or self.query_prefix
+        return hashlib.sha1(marker.encode("utf-8")).hexdigest()[:8] if marker else ""
+
+    def dimension(self) -> int:
+        """
+        Output size of the model (the `dimensions` setting doesn't apply to local models).
+        """
+        if self.backend == "sentence_transformers":
+            dimension = self.model.get_sentence_embedding_dimension()
+            if dimension:
+                return dimension
+        return len(self.embed_documents(["dimension probe"])[0])
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._encode(texts)
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return self._encode(texts, query=True)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_queries([text])[0]
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        return await run_in_executor(None, self.embed_queries, texts)
@@ -0,0 +1,111 @@
+import re
+import math
+
+# Brand -> aliases that identify it in a product title or a user query.
+KNOWN_BRANDS = {
+    "apple": ["apple", "iphone", "ipad", "macbook", "airpods"],
+    "samsung": ["samsung", "galaxy"],
+    "google": ["google", "pixel"],
+    "oneplus": ["oneplus", "one plus"],
+    "xiaomi": ["xiaomi", "redmi", "mi"],
+    "poco": ["poco"],
+    "realme": ["realme"],
+    "oppo": ["oppo"],
+    "vivo": ["vivo", "iqoo"],
+    "motorola": ["motorola", "moto"],
+    "nothing": ["nothing phone", "cmf"],
+    "nokia": ["nokia"],
+    "sony": ["sony"],
+    "lg": ["lg"],
+    "asus": ["asus", "rog"],
+    "lenovo": ["lenovo", "thinkpad"],
+    "hp": ["hp"],
+    "dell": ["dell"],
+    "boat": ["boat"],
+    "jbl": ["jbl"],
+}
+
+_BRAND_PATTERNS = [
+    (brand, re.compile(r"\b(?:" + "|".join(re.escape(a) for a in aliases) + r")\b", re.IGNORECASE))
+    for brand, aliases in KNOWN_BRANDS.items()
+]
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_AMOUNT_RE = re.compile(
+    r"(?P<number>\d{1,3}(?:,\d{2,3})+|\d+(?:\.\d+)?)\s*(?P<unit>k|thousand|lakhs?|lacs?|l)?\b",
+    re.IGNORECASE,
+)
+_UNIT_MULTIPLIERS = {"k": 1_000, "thousand": 1_000, "lakh": 100_000, "lakhs": 100_000,
+                     "lac": 100_000, "lacs": 100_000, "l": 100_000}
+
+
+def _is_missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return True
+    return str(value).strip() in ("", "N/A", "nan", "None")
+
+
+def parse_amount(text: str):
+    """
+    Parse an Indian-format amount: "₹64,900", "1,00,000", "1.5 lakh", "50k".
+    Returns a float, or None if no amount is present.
+    """
+    match = _AMOUNT_RE.search(text or "")
+    if not match:
+        return None
+    value = float(match.group("number").replace(",", ""))
+    unit = (match.group("unit") or "").lower()
+    return value * _UNIT_MULTIPLIERS.get(unit, 1)
+
+
+def parse_price_inr(value):
+    """
+    Normalise a scraped price ("₹64,900") to a number of rupees.
+    """
+    if _is_missing(value):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return parse_amount(str(value))
+
+
+def parse_rating(value):
+    """
+    Normalise a scraped rating ("4.6") to a float in [0, 5].
+    """
+    if _is_missing(value):
+        return None
+    match = _NUMBER_RE.search(str(value))
+    if not match:
+        return None
+    rating = float(match.group(0))
+    return rating if 0 <= rating <= 5 else None
+
+
+def parse_count(value):
+    """
+    Normalise a scraped count ("1,234", "1234.0") to an int.
+    """
+    if _is_missing(value):
+        return None
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", str(value))
+    if not match:
+        return None
+    return int(float(match.group(0).replace(",", "")))
+
+
+def detect_brands(text: str) -> list[str]:
+    """
+    Return the known brands mentioned in text, in KNOWN_BRANDS order.
+    """
+    return [brand for brand, pattern in _BRAND_PATTERNS if pattern.search(text or "")]
+
+
+def detect_brand(title: str):
+    """
+    Return the brand of a product title (first known brand found), or None.
+    """
+    brands = detect_brands(title)
+    return brands[0] if brands else None
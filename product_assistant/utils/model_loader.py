@@ -8,6 +8,9 @@ from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_groq import ChatGroq
 from product_assistant.logger import GLOBAL_LOGGER as log
 from product_assistant.exception.custom_exception import ProductAssistantException
+from product_assistant.utils.embedding_cache import CachedEmbeddings, signature_cache_dir
+from product_assistant.utils.local_embeddings import LocalEmbeddings
+from product_assistant.utils.embedding_batcher import MicroBatchingEmbeddings
 import asyncio
 
 
@@ -156,10 +159,24 @@ class ApiKeyManager:
         return self.api_keys.get(key)
 
 
+# Native output dimension of the OpenAI embedding models
+OPENAI_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+# Process-wide query embedding caches, shared by every ModelLoader instance
+# (retriever, evaluation, ...) so they all hit the same LRU + disk store.
+_EMBEDDING_CACHES: dict[str, CachedEmbeddings] = {}
+# Process-wide query micro-batchers, one per embedding space.
+_EMBEDDING_BATCHERS: dict[str, MicroBatchingEmbeddings] = {}
+
+
 class ModelLoader:
     """
     Loads embeddings + LLM based on config and environment.
-    Embeddings: OpenAI (Groq does not support embeddings)
+    Embeddings: OpenAI (Groq does not support embeddings) or a CPU-local model
     LLM: OpenAI or Groq
     """
 
@@ -175,32 +192,171 @@ class ModelLoader:
     def load_embeddings(self):
         """
         Load and return embeddings model.
-        NOTE: Groq doesn't provide embeddings, so we use OpenAI embeddings.
+        Providers (embedding_model.provider in config):
+            openai -> OpenAI embeddings (Groq doesn't provide embeddings)
+            local  -> CPU-local sentence-transformers / ONNX model, no network hop
         """
         try:
-            model_name = self.config.get("embedding_model", {}).get(
-                "model_name", "text-embedding-3-small"
-            )
+            embedding_cfg = self.config.get("embedding_model", {})
+            provider = embedding_cfg.get("provider", "openai")
+
+            if provider == "local":
+                local_cfg = embedding_cfg.get("local", {})
+                log.info(
+                    "Loading embeddings | provider=local | backend=%s | model=%s",
+                    local_cfg.get("backend", "sentence_transformers"),
+                    local_cfg.get("model_name", "sentence-transformers/all-MiniLM-L6-v2"),
+                )
+                embeddings = self._local_embeddings()
+                return self._with_cache(
+                    self._with_batching(embeddings, self.embedding_signature()),
+                    self.query_cache_space(embeddings),
+                )
+
+            if provider != "openai":
+                raise ValueError(f"Unsupported embedding provider: {provider}")
+
+            model_name = embedding_cfg.get("model_name", "text-embedding-3-small")
+            dimensions = embedding_cfg.get("dimensions")
 
             api_key = self.api_key_mgr.get("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY is missing. Required for embeddings.")
 
-            log.info("Loading embeddings | provider=openai | model=%s", model_name)
+            log.info(
+                "Loading embeddings | provider=openai | model=%s | dimensions=%s",
+                model_name,
+                dimensions or "native",
+            )
 
-            # OpenAI embeddings
+            # OpenAI embeddings (text-embedding-3-* support server-side truncation)
             embeddings = OpenAIEmbeddings(
                 model=model_name,
                 api_key=api_key,
+                dimensions=dimensions,
             )
 
             log.info("Embeddings loaded successfully | provider=openai | model=%s", model_name)
-            return embeddings
+            signature = self.embedding_signature()
+            return self._with_cache(self._with_batching(embeddings, signature), signature)
 
         except Exception as e:
             log.error("Error loading embedding model | error=%s", str(e), exc_info=True)
             raise ProductAssistantException("Failed to load embedding model", sys)
 
+    def _local_embeddings(self) -> LocalEmbeddings:
+        local_cfg = self.config.get("embedding_model", {}).get("local", {})
+        return LocalEmbeddings(
+            model_name=local_cfg.get("model_name", "sentence-transformers/all-MiniLM-L6-v2"),
+            backend=local_cfg.get("backend", "sentence_transformers"),
+            batch_size=local_cfg.get("batch_size", 64),
+            device=local_cfg.get("device", "cpu"),
+            query_prefix=local_cfg.get("query_prefix"),
+        )
+
+    def embedding_signature(self) -> str:
+        """
+        Identify the embedding space (model + output dimensionality).
+        Vectors from different signatures must never be mixed in a cache or collection.
+        """
+        embedding_cfg = self.config.get("embedding_model", {})
+        if embedding_cfg.get("provider", "openai") == "local":
+            local_cfg = embedding_cfg.get("local", {})
+            return "local:" + local_cfg.get("model_name", "sentence-transformers/all-MiniLM-L6-v2")
+
+        model_name = embedding_cfg.get("model_name", "text-embedding-3-small")
+        dimensions = embedding_cfg.get("dimensions")
+        return f"{model_name}@{dimensions}" if dimensions else model_name
+
+    def query_cache_space(self, local_embeddings: LocalEmbeddings | None = None) -> str:
+        """
+        Name of the query embedding cache (and of its directory, see signature_cache_dir).
+        Local models that embed queries with a prefix / prompt get their own space.
+        Loads the local model unless `local_embeddings` is given.
+        """
+        signature = self.embedding_signature()
+        if self.config.get("embedding_model", {}).get("provider", "openai") != "local":
+            return signature
+        query_space = (local_embeddings or self._local_embeddings()).query_space()
+        return f"{signature}#query-{query_space}" if query_space else signature
+
+    def embedding_dimension(self, embeddings=None):
+        """
+        Vector dimension of the configured embedding space. Local models: the model's
+        own output size (`dimensions` only applies to OpenAI models and is ignored).
+        OpenAI: `dimensions` if set, the native size of known models, else measured on
+        `embeddings` with one probe query. None if it can't be determined.
+        """
+        embedding_cfg = self.config.get("embedding_model", {})
+        if embedding_cfg.get("provider", "openai") == "local":
+            local = embeddings
+            while local is not None and not isinstance(local, LocalEmbeddings):
+                local = getattr(local, "underlying", None)
+            return (local or self._local_embeddings()).dimension()
+        if embedding_cfg.get("dimensions"):
+            return embedding_cfg["dimensions"]
+        if embedding_cfg.get("provider", "openai") == "openai":
+            known = OPENAI_DIMENSIONS.get(embedding_cfg.get("model_name", "text-embedding-3-small"))
+            if known:
+                return known
+        if embeddings is not None:
+            return len(embeddings.embed_query("dimension probe"))
+        return None
+
+    def _with_batching(self, embeddings, model_name):
+        """
+        Put the shared query micro-batcher in front of the client if enabled in config.
+        """
+        batch_cfg = self.config.get("embedding_batching", {})
+        if not batch_cfg.get("enabled", False):
+            return embeddings
+
+        if model_name not in _EMBEDDING_BATCHERS:
+            _EMBEDDING_BATCHERS[model_name] = MicroBatchingEmbeddings(
+                underlying=embeddings,
+                max_batch_size=batch_cfg.get("max_batch_size", 32),
+                max_wait_ms=batch_cfg.get("max_wait_ms", 5),
+                max_concurrent_batches=batch_cfg.get("max_concurrent_batches", 4),
+            )
+            log.info(
+                "Query embedding micro-batching enabled | model=%s | max_batch_size=%s | max_wait_ms=%s",
+                model_name,
+                batch_cfg.get("max_batch_size", 32),
+                batch_cfg.get("max_wait_ms", 5),
+            )
+        return _EMBEDDING_BATCHERS[model_name]
+
+    def _with_cache(self, embeddings, model_name):
+        """
+        Wrap embeddings with the shared query embedding cache if enabled in config.
+        """
+        cache_cfg = self.config.get("embedding_cache", {})
+        if not cache_cfg.get("enabled", False):
+            return embeddings
+
+        if model_name not in _EMBEDDING_CACHES:
+            # One store per embedding space: a store holds vectors of a single dimension.
+            cache_dir = cache_cfg.get("cache_dir")
+            if cache_dir:
+                cache_dir = signature_cache_dir(cache_dir, model_name)
+
+            _EMBEDDING_CACHES[model_name] = CachedEmbeddings(
+                underlying=embeddings,
+                model_name=model_name,
+                max_entries=cache_cfg.get("max_entries", 10000),
+                cache_dir=cache_dir,
+                dtype=cache_cfg.get("dtype", "float16"),
+                max_disk_entries=cache_cfg.get("max_disk_entries"),
+            )
+            log.info(
+                "Query embedding cache enabled | model=%s | max_entries=%s | max_disk_entries=%s | cache_dir=%s",
+                model_name,
+                cache_cfg.get("max_entries", 10000),
+                cache_cfg.get("max_disk_entries"),
+                cache_dir,
+            )
+        return _EMBEDDING_CACHES[model_name]
+
     def load_llm(self):
         """
         Load and return the configured LLM model.
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def normalize(matrix) -> np.ndarray:
+    """
+    L2-normalise vectors along the last axis (zero vectors are left as-is).
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def truncate_embeddings(matrix, dimensions: int) -> np.ndarray:
+    """
+    Keep the first `dimensions` components and re-normalise.
+    This is what text-embedding-3 models do server-side for the `dimensions` parameter.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    return normalize(matrix[..., :dimensions])
+
+
+def quantize_int8(matrix):
+    """
+    Symmetric per-row int8 quantisation.
+
+    Returns (codes int8[n, d], scales float32[n]) with vector ~= codes * scale.
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes, scales) -> np.ndarray:
+    return np.asarray(codes, dtype=np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
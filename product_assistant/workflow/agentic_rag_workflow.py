@@ -63,8 +63,7 @@ class AgenticRAG:
         
         print("--- RETRIEVER ---")
         query = state["messages"][-1].content
-        retriever = self.retriever_obj.load_retriever()
-        docs = retriever.invoke(query)
+        docs = self.retriever_obj.call_retriever(query)
         context = self._format_docs(docs)
         return {"messages": [HumanMessage(content=context)]}
 
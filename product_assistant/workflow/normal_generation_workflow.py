@@ -1,4 +1,4 @@
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -32,7 +32,7 @@ def format_docs(docs) -> str:
 
 def build_chain(query):
     """Build the RAG pipeline chain with retriever, prompt, LLM, and parser."""
-    retriever = retriever_obj.load_retriever()
+    retriever = RunnableLambda(retriever_obj.call_retriever)
     retrieved_docs=retriever.invoke(query)
     
     #retrieved_contexts = [format_docs(doc) for doc in retrieved_docs]
@@ -59,7 +59,7 @@ def invoke_chain(query: str, debug: bool = False):
 
     if debug:
         # For debugging: show docs retrieved before passing to LLM
-        docs = retriever_obj.load_retriever().invoke(query)
+        docs = retriever_obj.call_retriever(query)
         print("\nRetrieved Documents:")
         print(format_docs(docs))
         print("\n---\n")
@@ -2,12 +2,37 @@
 import streamlit as st
 from product_assistant.etl.data_scrapper import FlipkartScraper
 from product_assistant.etl.data_ingestion import DataIngestion
-import os
 
-flipkart_scraper = FlipkartScraper()
+
+@st.cache_resource
+def get_scraper():
+    # Cached so the warm driver pool survives Streamlit reruns
+    return FlipkartScraper()
+
+
+flipkart_scraper = get_scraper()
 output_path = "data/product_reviews.csv"
 st.title("📦 Product Review Scraper")
 
+
+@st.cache_resource
+def get_ingestion():
+    # One pipeline (and vector store connection) reused across queries and reruns
+    return DataIngestion(records=[])
+
+
+def ingest_rows(rows, label):
+    try:
+        with st.spinner(f"📡 Ingesting {len(rows)} products from {label}..."):
+            report = get_ingestion().ingest_records(rows)
+        st.success(
+            f"✅ {label}: added={report['added']} changed={report['changed']} "
+            f"metadata_only={report['metadata_only']} unchanged={report['unchanged']} failed={report['failed']}"
+        )
+    except Exception as e:
+        st.error("❌ Ingestion failed!")
+        st.exception(e)
+
 if "product_inputs" not in st.session_state:
     st.session_state.product_inputs = [""]
 
@@ -26,8 +51,9 @@ st.session_state.product_inputs = updated_inputs
 
 st.button("➕ Add Another Product", on_click=add_product_input)
 
-max_products = st.number_input("How many products per search?", min_value=1, max_value=10, value=1)
+max_products = st.number_input("How many products per search? (result pages are followed as needed)", min_value=1, max_value=500, value=1)
 review_count = st.number_input("How many reviews per product?", min_value=1, max_value=10, value=2)
+live_ingest = st.checkbox("⚡ Make products searchable as each results page comes in (ingest into AstraDB)", value=True)
 
 if st.button("🚀 Start Scraping"):
     product_inputs = [p.strip() for p in st.session_state.product_inputs if p.strip()]
@@ -38,30 +64,28 @@ if st.button("🚀 Start Scraping"):
         st.warning("⚠️ Please enter at least one product name or a product description.")
     else:
         final_data = []
-        for query in product_inputs:
-            st.write(f"🔍 Searching for: {query}")
-            results = flipkart_scraper.scrape_flipkart_products(query, max_products=max_products, review_count=review_count)
-            final_data.extend(results)
-
-        unique_products = {}
-        for row in final_data:
-            if row[1] not in unique_products:
-                unique_products[row[1]] = row
+        seen_ids = set()  # product_ids already scraped, across pages and queries
+        progress = st.empty()
+        # Rows are written (and optionally ingested) page by page, as they come in
+        with flipkart_scraper.csv_stream(output_path) as write_rows:
+            for query in product_inputs:
+                st.write(f"🔍 Searching for: {query}")
+                for page_rows in flipkart_scraper.iter_products(
+                    query, max_products=max_products, review_count=review_count, seen=seen_ids
+                ):
+                    write_rows(page_rows)
+                    final_data.extend(page_rows)
+                    progress.caption(f"📦 {len(final_data)} products scraped so far")
+                    # Rows go straight from the scraper to the vector store, no CSV round trip
+                    if live_ingest:
+                        ingest_rows(page_rows, f"'{query}'")
 
-        final_data = list(unique_products.values())
+        st.caption(f"🚗 Driver pool: {flipkart_scraper.driver_pool.stats()}")
+        st.caption(f"⏱️ Scrape phases: {flipkart_scraper.timings.stats()}")
         st.session_state["scraped_data"] = final_data  # store in session
-        flipkart_scraper.save_to_csv(final_data, output_path)
         st.success("✅ Data saved to `data/product_reviews.csv`")
         st.download_button("📥 Download CSV", data=open(output_path, "rb"), file_name="product_reviews.csv")
 
 # This stays OUTSIDE "if st.button('Start Scraping')"
 if "scraped_data" in st.session_state and st.button("🧠 Store in Vector DB (AstraDB)"):
-    with st.spinner("📡 Initializing ingestion pipeline..."):
-        try:
-            ingestion = DataIngestion()
-            st.info("🚀 Running ingestion pipeline...")
-            ingestion.run_pipeline()
-            st.success("✅ Data successfully ingested to AstraDB!")
-        except Exception as e:
-            st.error("❌ Ingestion failed!")
-            st.exception(e)
\ No newline at end of file
+    ingest_rows(st.session_state["scraped_data"], "scraped data")
\ No newline at end of file
@@ -0,0 +1,59 @@
+import os
+
+from product_assistant.etl.browser_profile import (
+    BLOCKED_URL_PATTERNS,
+    LEAN_PREFS,
+    apply_lean_options,
+    block_resources,
+    slot_profile_dir,
+)
+
+
+class _Options:
+    def __init__(self):
+        self.arguments = []
+        self.experimental = {}
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+    def add_experimental_option(self, name, value):
+        self.experimental[name] = value
+
+
+class _CdpDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+
+def test_each_pool_slot_gets_its_own_persistent_profile(tmp_path):
+    first = slot_profile_dir(str(tmp_path / "profiles"), 0)
+    second = slot_profile_dir(str(tmp_path / "profiles"), 1)
+
+    assert first != second
+    assert os.path.isdir(first) and os.path.isdir(second)
+    # Same slot, same profile: the disk cache survives a recycled driver
+    assert slot_profile_dir(str(tmp_path / "profiles"), 0) == first
+
+
+def test_lean_options_turn_off_images_and_bound_the_cache(tmp_path):
+    options = apply_lean_options(_Options(), str(tmp_path), disk_cache_mb=64)
+
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    assert f"--disk-cache-dir={os.path.join(str(tmp_path), 'cache')}" in options.arguments
+    assert f"--disk-cache-size={64 * 1024 * 1024}" in options.arguments
+    assert options.experimental == {"prefs": LEAN_PREFS}
+
+
+def test_block_resources_sends_the_patterns_over_cdp():
+    driver = _CdpDriver()
+
+    block_resources(driver, BLOCKED_URL_PATTERNS + ["*example.com*"])
+
+    assert driver.commands == [
+        ("Network.enable", {}),
+        ("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS + ["*example.com*"]}),
+    ]
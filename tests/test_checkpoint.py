@@ -0,0 +1,87 @@
+from langchain_core.documents import Document
+
+from product_assistant.etl.checkpoint import IngestionCheckpoint
+from product_assistant.etl.embed_pipeline import EmbedUpsertPipeline
+from product_assistant.etl.vector_sink import InMemoryVectorSink
+
+
+class _CountingEmbeddings:
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded += texts
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class _FlakySink(InMemoryVectorSink):
+    """
+    Fails every upsert containing one of `poisoned` ids (a crash mid-run).
+    """
+
+    def __init__(self, poisoned=()):
+        super().__init__()
+        self.poisoned = set(poisoned)
+
+    def upsert_vectors(self, documents, vectors, ids):
+        if self.poisoned & set(ids):
+            raise ConnectionError("store went away")
+        return super().upsert_vectors(documents, vectors, ids)
+
+
+def _documents():
+    return [Document(page_content=f"doc {i}", metadata={"product_id": f"p{i}"}) for i in range(10)]
+
+
+def _pipeline(embeddings, sink):
+    return EmbedUpsertPipeline(embeddings, sink, batch_size=3, embed_workers=1, insert_workers=1, max_retries=0)
+
+
+def test_checkpoint_survives_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "ingest.json")
+    checkpoint = IngestionCheckpoint(path)
+    checkpoint.start(source="products.csv", mode="incremental")
+    checkpoint.commit_batch(0, ["a", "b"])
+    with open(checkpoint.batches_path, "a", encoding="utf-8") as f:
+        f.write('{"batch": 1, "ids": ["c"')
+
+    reloaded = IngestionCheckpoint(path)
+    assert reloaded.load()["status"] == "running"
+    assert reloaded.committed_batches() == {0}
+    assert reloaded.committed_documents() == 2
+    assert reloaded.resumable(source="products.csv", mode="incremental")
+    assert not reloaded.resumable(source="other.csv", mode="incremental")
+
+    reloaded.finish("completed")
+    completed = IngestionCheckpoint(path)
+    completed.load()
+    assert not completed.resumable(source="products.csv", mode="incremental")
+
+
+def test_resume_only_embeds_uncommitted_batches(tmp_path):
+    path = str(tmp_path / "ingest.json")
+    checkpoint = IngestionCheckpoint(path)
+    checkpoint.start(source="products.csv")
+
+    sink = _FlakySink(poisoned={"p4"})  # batch 1 = p3..p5 fails
+    report = _pipeline(_CountingEmbeddings(), sink).run(_documents(), on_batch_committed=checkpoint.commit_batch)
+    assert report["failed_batches"] == 1
+    assert checkpoint.committed_batches() == {0, 2, 3}
+
+    resumed = IngestionCheckpoint(path)
+    resumed.load()
+    assert resumed.resumable(source="products.csv")
+    resumed.resume()
+
+    sink.poisoned.clear()
+    embeddings = _CountingEmbeddings()
+    report = _pipeline(embeddings, sink).run(
+        _documents(),
+        skip_batches=resumed.committed_batches(),
+        on_batch_committed=resumed.commit_batch,
+    )
+
+    assert embeddings.embedded == ["doc 3", "doc 4", "doc 5"]
+    assert report["skipped_batches"] == 3
+    assert sorted(sink.documents) == sorted(f"p{i}" for i in range(10))
+    assert resumed.committed_documents() == 10
@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+
+import pytest
+
+from product_assistant.utils import collection_pointer
+from product_assistant.utils.collection_pointer import CollectionPointer, check_collection_dimension
+
+
+class _FakeCollection:
+    def __init__(self, dimension=None):
+        self.docs = {}
+        self.dimension = dimension
+
+    def find_one(self, filter, projection=None):
+        doc = self.docs.get(filter["_id"])
+        return dict(doc) if doc else None
+
+    def find_one_and_update(self, filter, update, upsert=False, return_document="before"):
+        before = self.find_one(filter)
+        self.update_one(filter, update)
+        return before
+
+    def update_one(self, filter, update):
+        doc = self.docs.setdefault(filter["_id"], {"_id": filter["_id"]})
+        doc.update(update["$set"])
+
+    def options(self):
+        vector = SimpleNamespace(dimension=self.dimension) if self.dimension else None
+        return SimpleNamespace(vector=vector)
+
+
+class _FakeDatabase:
+    def __init__(self, *names, dimension=None):
+        self.collections = {name: _FakeCollection(dimension) for name in names}
+
+    def list_collection_names(self):
+        return list(self.collections)
+
+    def create_collection(self, name):
+        self.collections[name] = _FakeCollection()
+
+    def get_collection(self, name):
+        return self.collections[name]
+
+    def drop_collection(self, name):
+        del self.collections[name]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = _FakeDatabase("products")
+    client = SimpleNamespace(get_database=lambda *args, **kwargs: database)
+    monkeypatch.setattr(collection_pointer, "DataAPIClient", lambda: client)
+    return database
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1_000.0)
+    monkeypatch.setattr(collection_pointer.time, "time", lambda: clock.now)
+    return clock
+
+
+def _pointer():
+    return CollectionPointer("https://db", "token", "ks", alias="products")
+
+
+def test_resolve_before_any_switch_is_read_only(database):
+    assert _pointer().resolve() == "products"
+    assert "products_pointer" not in database.collections
+
+
+def test_switch_retires_the_previous_collection(database, clock):
+    pointer = _pointer()
+    database.create_collection("products_v1")
+
+    assert pointer.switch("products_v1") == "products"
+    assert pointer.resolve() == "products_v1"
+
+    clock.now = 2_000.0
+    database.create_collection("products_v2")
+    assert pointer.switch("products_v2") == "products_v1"
+
+    doc = pointer.collection.find_one({"_id": "products"})
+    assert doc["previous"] == "products_v1"
+    assert doc["retired"] == {"products": 1_000.0, "products_v1": 2_000.0}
+
+
+def test_switching_back_revives_a_retired_version(database, clock):
+    pointer = _pointer()
+    pointer.switch("products_v1")
+    pointer.switch("products")
+
+    assert pointer.collection.find_one({"_id": "products"})["retired"] == {"products_v1": 1_000.0}
+
+
+def test_retire_old_versions_drops_the_original_collection_too(database, clock):
+    pointer = _pointer()
+    for version in ("products_v1", "products_v2", "products_v3"):
+        database.create_collection(version)
+        pointer.switch(version)
+        clock.now += 100
+
+    # Still within the grace period: nothing is dropped
+    assert pointer.retire_old_versions(grace_seconds=1_000, keep=1) == []
+
+    clock.now += 1_000
+    dropped = pointer.retire_old_versions(grace_seconds=1_000, keep=1, exclude=("products_v1",))
+    assert dropped == ["products"]
+    assert sorted(database.collections) == ["products_pointer", "products_v1", "products_v2", "products_v3"]
+
+    assert pointer.retire_old_versions(grace_seconds=1_000, keep=1) == ["products_v1"]
+    assert pointer.collection.find_one({"_id": "products"})["retired"] == {"products_v2": 1_200.0}
+
+
+def test_retire_old_versions_stamps_untracked_versions(database, clock):
+    pointer = _pointer()
+    database.create_collection("products_v1")
+    pointer.switch("products_v1")
+    database.create_collection("products_v0")  # left over from before retirement was tracked
+
+    clock.now = 5_000.0
+    assert pointer.retire_old_versions(grace_seconds=1_000, keep=0) == ["products"]
+    assert "products_v0" in database.collections
+
+    clock.now = 6_000.0
+    assert pointer.retire_old_versions(grace_seconds=1_000, keep=0) == ["products_v0"]
+
+
+def test_check_collection_dimension(monkeypatch):
+    database = _FakeDatabase("products", dimension=1536)
+    client = SimpleNamespace(get_database=lambda *args, **kwargs: database)
+    monkeypatch.setattr(collection_pointer, "DataAPIClient", lambda: client)
+
+    check_collection_dimension("https://db", "token", "ks", "products", 1536, "openai:text-embedding-3-small")
+    check_collection_dimension("https://db", "token", "ks", "missing", 384, "local:all-MiniLM-L6-v2")
+    check_collection_dimension("https://db", "token", "ks", "products", None, "unknown")
+
+    with pytest.raises(ValueError, match="1536-dim"):
+        check_collection_dimension("https://db", "token", "ks", "products", 384, "local:all-MiniLM-L6-v2")
@@ -0,0 +1,76 @@
+import csv
+from datetime import datetime, timezone
+
+import pyarrow.parquet as pq
+
+from product_assistant.etl.columnar import rows_to_table, write_parquet_dataset
+from product_assistant.etl.streaming import CSV_COLUMNS, iter_document_batches
+
+ROWS = [
+    ["itm1", "Apple iPhone 16 (Black, 128 GB)", "4.6", "1,234", "₹64,900", "Great camera || Pricey"],
+    ["itm2", "  SAMSUNG Galaxy S24  ", "4.0", "N/A", "N/A", "No reviews found"],
+    ["itm3", "Unknown Title", "4.1", "12", "₹1,000", "ok"],
+    ["itm4", "Google Pixel 8a", "", "", "", ""],
+    ["itm5", "Nothing Phone (2a)", "4", "12345", "₹23,999", " Clean UI ||  Bright screen  "],
+    ["itm6", "OnePlus Nord CE4", "4.25", "1,24", "₹24,999", "N/A"],
+    ["itm1", "Apple iPhone 16 duplicate", "3.0", "1", "₹1", "older row"],
+]
+
+
+def _documents(path):
+    return [
+        (doc.page_content, doc.metadata)
+        for batch in iter_document_batches(path, batch_size=2)
+        for doc in batch
+    ]
+
+
+def test_parquet_and_csv_produce_the_same_documents(tmp_path):
+    csv_path = tmp_path / "products.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(ROWS)
+    parquet_path = write_parquet_dataset(rows_to_table(ROWS), str(tmp_path / "products_parquet"))
+
+    from_csv = _documents(str(csv_path))
+    from_parquet = _documents(parquet_path)
+
+    assert [meta["product_id"] for _, meta in from_csv] == ["itm1", "itm2", "itm4", "itm5", "itm6"]
+    assert from_parquet == from_csv
+    # Display strings are kept as scraped, whatever the typed value
+    assert "Rating: 4 | Total Reviews: 12345 |" in from_parquet[3][0]
+    assert "Rating: 4.25 | Total Reviews: 1,24" in from_parquet[4][0]
+    assert from_parquet[3][0].endswith("| Reviews: Clean UI ||  Bright screen")
+
+    content, metadata = from_parquet[0]
+    assert content.endswith("| Reviews: Great camera || Pricey")
+    assert metadata["price_inr"] == 64900.0
+    assert metadata["rating"] == 4.6
+    assert metadata["total_reviews"] == 1234
+    assert "Rating: 4.0 |" in from_parquet[1][0]
+    assert "rating" not in from_parquet[2][1]
+
+
+def test_parquet_keeps_the_newest_scrape_per_product(tmp_path):
+    path = str(tmp_path / "products_parquet")
+    old = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    new = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    write_parquet_dataset(rows_to_table([["itm1", "Pixel", "4.0", "1", "₹10,000", "old"]], scraped_at=old), path)
+    write_parquet_dataset(rows_to_table([["itm1", "Pixel", "4.5", "2", "₹9,000", "new"]], scraped_at=new), path)
+
+    documents = _documents(path)
+    assert len(documents) == 1
+    assert documents[0][1]["price_inr"] == 9000.0
+
+
+def test_parquet_without_display_columns_still_reads(tmp_path):
+    # Files written before the display-string columns existed
+    table = rows_to_table([["itm1", "Pixel", "4", "12345", "₹10,000", "good"]])
+    legacy = table.drop_columns(["rating_text", "total_reviews_text", "scraped_at"])
+    path = str(tmp_path / "legacy.parquet")
+    pq.write_table(legacy, path)
+
+    content, metadata = _documents(path)[0]
+    assert "Rating: 4.0 | Total Reviews: 12345 |" in content
+    assert metadata["rating"] == 4.0
@@ -0,0 +1,79 @@
+import csv
+from types import SimpleNamespace
+
+from product_assistant.etl.data_ingestion import DataIngestion
+from product_assistant.etl.streaming import CSV_COLUMNS, iter_document_batches, iter_record_batches
+from product_assistant.etl.vector_sink import InMemoryVectorSink
+
+
+class _CountingEmbeddings:
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded += texts
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _ingestion(sink, embeddings):
+    """
+    DataIngestion wired to an in-memory sink: no env, no AstraDB, no model download.
+    """
+    ingestion = DataIngestion.__new__(DataIngestion)
+    ingestion.config = {"ingestion": {"streaming": {"batch_size": 2}, "pipeline": {"max_retries": 0}}}
+    ingestion.records = None
+    ingestion.document_cache = None
+    ingestion.last_report = None
+    ingestion.model_loader = SimpleNamespace(embedding_signature=lambda: "test:counting")
+    ingestion._live_vstore = SimpleNamespace(embeddings=embeddings)
+    ingestion._sink = lambda vstore: sink
+    return ingestion
+
+
+PAGE_1 = [
+    ["itm1", "Apple iPhone 16", "4.6", "1,234", "₹64,900", "Great camera"],
+    ["itm2", "Google Pixel 8a", "", "", "₹39,999", ""],
+]
+PAGE_2 = [
+    ["itm2", "Google Pixel 8a (repeat)", "4.5", "10", "₹39,999", "Clean UI"],
+    ["itm3", "Nothing Phone (2a)", "4.3", "12", "₹23,999", "   "],
+]
+
+
+def test_records_and_csv_build_the_same_documents(tmp_path):
+    path = tmp_path / "products.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(PAGE_1 + PAGE_2)
+
+    def _flatten(batches):
+        return [(d.page_content, d.metadata) for batch in batches for d in batch]
+
+    from_records = _flatten(iter_record_batches(PAGE_1 + PAGE_2, batch_size=2))
+    assert from_records == _flatten(iter_document_batches(str(path), batch_size=2))
+    assert "Rating: N/A | Total Reviews: N/A" in from_records[1][0]
+
+
+def test_ingest_records_upserts_each_page_without_deleting():
+    sink, embeddings = InMemoryVectorSink(), _CountingEmbeddings()
+    ingestion = _ingestion(sink, embeddings)
+
+    # Rows repeated across pages of one query are ingested once (first one wins)
+    report = ingestion.ingest_records(PAGE_1 + PAGE_2)
+    assert (report["added"], report["deleted"]) == (3, 0)
+    assert sink.documents["itm2"].metadata["product_title"] == "Google Pixel 8a"
+
+    # The next query's rows: unchanged products are skipped, nothing else is deleted
+    embeddings.embedded.clear()
+    report = ingestion.ingest_records([PAGE_2[1], ["itm4", "OnePlus Nord CE4", "4.2", "5", "₹24,999", "Fast"]])
+    assert (report["added"], report["unchanged"], report["deleted"]) == (1, 1, 0)
+    assert len(embeddings.embedded) == 1
+    assert sorted(sink.documents) == ["itm1", "itm2", "itm3", "itm4"]
+
+    # A price change alone updates metadata in place without re-embedding
+    embeddings.embedded.clear()
+    report = ingestion.ingest_records([["itm1", "Apple iPhone 16", "4.6", "1,234", "₹59,900", "Great camera"]])
+    assert (report["metadata_only"], report["added"], report["changed"]) == (1, 0, 0)
+    assert embeddings.embedded == []
+    assert sink.documents["itm1"].metadata["price_inr"] == 59_900.0
@@ -0,0 +1,278 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+from product_assistant.etl.data_scrapper import FlipkartScraper
+from product_assistant.etl.driver_pool import DriverPool
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+class _StubDriver:
+    """
+    Minimal WebDriver stand-in: healthy, and records the pages it was sent to.
+    """
+
+    def __init__(self, slot=0):
+        self.slot = slot
+        self.visited = []
+        self.page_source = ""
+        self.ready_state = "complete"
+        # Matches returned by successive find_elements calls; the last one repeats
+        self.counts = [0]
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script):
+        return self.ready_state
+
+    @property
+    def window_handles(self):
+        return ["main"]
+
+    def find_element(self, by, value):
+        return object()
+
+    def find_elements(self, by, value):
+        count = self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+        return [object()] * count
+
+    def quit(self):
+        pass
+
+
+class _StubHttp:
+    """
+    HttpFetcher stand-in serving canned (html, reason) results by URL.
+    """
+
+    def __init__(self, pages, default=(None, "HTTP 404")):
+        self.pages = pages
+        self.default = default
+        self.requested = []
+
+    def get_html(self, url):
+        self.requested.append(url)
+        return self.pages.get(url, self.default)
+
+    def close(self):
+        pass
+
+
+def _scraper(tmp_path, http=False, concurrency=3):
+    config = {
+        "scraper": {
+            "http": {"enabled": http},
+            "politeness": {"min_interval_seconds": 0},
+            "reviews": {"concurrency": concurrency},
+            "driver_pool": {"max_drivers": concurrency},
+            "waits": {"stable_seconds": 0.05, "poll_seconds": 0.01},
+        }
+    }
+    scraper = FlipkartScraper(output_dir=str(tmp_path), config=config)
+    scraper.drivers = []
+
+    def factory(slot):
+        driver = _StubDriver(slot)
+        scraper.drivers.append(driver)
+        return driver
+
+    scraper.driver_pool = DriverPool(factory, max_size=concurrency)
+    return scraper
+
+
+def test_reviews_are_fetched_concurrently_and_keep_product_order(tmp_path, monkeypatch):
+    scraper = _scraper(tmp_path, concurrency=3)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def get_reviews(driver, product_url, count=2):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        # Later products finish first
+        time.sleep(0.05 * (5 - int(product_url.rsplit("itm", 1)[1])))
+        with lock:
+            running[0] -= 1
+        return f"reviews of {product_url}"
+
+    monkeypatch.setattr(scraper, "_get_reviews_with_driver", get_reviews)
+    products = [(f"Phone {i}", f"https://www.flipkart.com/phone/p/itm{i}") for i in range(5)]
+
+    reviews = scraper._fetch_reviews(products, 2)
+
+    assert reviews == [f"reviews of {url}" for _, url in products]
+    assert 1 < peak[0] <= 3
+    assert scraper.driver_pool.stats()["drivers_started"] <= 3
+
+
+def test_wait_returns_as_soon_as_the_target_is_met(tmp_path):
+    scraper = _scraper(tmp_path)
+    driver = _StubDriver()
+    driver.counts = [0, 2, 5]
+
+    start = time.monotonic()
+    assert scraper._wait_for_elements(driver, "div[data-id]", 5, timeout=5) == 5
+    assert time.monotonic() - start < 1
+
+
+def test_wait_stops_once_a_loaded_page_stops_growing(tmp_path):
+    scraper = _scraper(tmp_path)
+    driver = _StubDriver()
+    driver.counts = [1, 3]
+
+    start = time.monotonic()
+    # Fewer matches than asked for: done when the count has held for stable_seconds
+    assert scraper._wait_for_elements(driver, "div.ZmyHeo", 10, timeout=5) == 3
+    assert time.monotonic() - start < 1
+
+
+def test_wait_gives_up_at_the_timeout_while_the_page_is_loading(tmp_path):
+    scraper = _scraper(tmp_path)
+    driver = _StubDriver()
+    driver.ready_state = "loading"
+    driver.counts = [2]
+
+    start = time.monotonic()
+    assert scraper._wait_for_elements(driver, "div.ZmyHeo", 10, timeout=0.2) == 2
+    assert time.monotonic() - start >= 0.2
+
+
+SEARCH_URL = "https://www.flipkart.com/search?q=smartphones"
+REVIEWS_URL = "https://www.flipkart.com/phone/product-reviews/itm1"
+
+
+def test_search_uses_http_when_the_page_is_usable(tmp_path):
+    scraper = _scraper(tmp_path)
+    scraper.http = _StubHttp({SEARCH_URL: (_fixture("flipkart_search.html"), None)})
+
+    products = scraper._search_page("smartphones", 1)
+
+    assert len(products) == 10
+    assert products[0][:2] == ("itm1000000ab0", "Apple iPhone 15 (Black, 128 GB)")
+    assert scraper.drivers == []
+    assert scraper.fetch_log.stats() == {"search_http": 1}
+
+
+@pytest.mark.parametrize("http_result, reason", [
+    ((None, "blocked: bot check"), "blocked: bot check"),
+    ((None, "error: ConnectTimeout"), "error: ConnectTimeout"),
+    (("<html><body>No results</body></html>", None), "no product cards"),
+])
+def test_search_falls_back_to_the_browser(tmp_path, http_result, reason):
+    scraper = _scraper(tmp_path)
+    scraper.http = _StubHttp({SEARCH_URL: http_result})
+    with scraper.driver_pool.driver() as driver:
+        driver.page_source = _fixture("flipkart_search.html")
+
+    products = scraper._search_page("smartphones", 1)
+
+    assert len(products) == 10
+    assert driver.visited == [SEARCH_URL]
+    assert scraper.fetch_log.stats() == {"search_browser": 1}
+    assert scraper.fetch_log.entries()[-1]["fallback_reason"] == reason
+
+
+def test_reviews_fall_back_to_the_browser_per_product(tmp_path):
+    scraper = _scraper(tmp_path, concurrency=1)
+    blocked_url = "https://www.flipkart.com/other/product-reviews/itm2"
+    scraper.http = _StubHttp({
+        REVIEWS_URL: (_fixture("flipkart_reviews.html"), None),
+        blocked_url: (None, "blocked: HTTP 429"),
+    })
+    with scraper.driver_pool.driver() as driver:
+        driver.page_source = _fixture("flipkart_reviews.html")
+        driver.counts = [5]
+
+    reviews = scraper._fetch_reviews(
+        [("Phone", "https://www.flipkart.com/phone/p/itm1"), ("Other", "https://www.flipkart.com/other/p/itm2")], 2
+    )
+
+    assert reviews[0] == reviews[1]
+    assert reviews[0].startswith("Superb phone, the camera is excellent")
+    assert driver.visited == [blocked_url]
+    assert scraper.fetch_log.stats() == {"reviews_browser": 1, "reviews_http": 1}
+
+
+def test_broken_page_state_falls_back_to_the_dom_cards(tmp_path):
+    scraper = _scraper(tmp_path)
+    html = _fixture("flipkart_search_state.html")
+    broken = html.replace("window.__INITIAL_STATE__ = {", "window.__INITIAL_STATE__ = {,", 1)
+
+    from_state = scraper._parse_search_results(html, None)
+    from_dom = scraper._parse_search_results(broken, None)
+
+    assert [p[0] for p in from_dom] == [p[0] for p in from_state]
+    assert "search_extract_json" in scraper.timings.stats()
+    assert "search_extract_dom" in scraper.timings.stats()
+
+
+def _product(n):
+    return (f"itm{n}", f"Phone {n}", "4.5", "1,024", "₹9,999", f"https://www.flipkart.com/phone-{n}/p/itm{n}")
+
+
+def _paged_scraper(tmp_path, monkeypatch, pages_by_query):
+    scraper = _scraper(tmp_path)
+    scraper.requested_pages = []
+
+    def search_page(query, page):
+        scraper.requested_pages.append((query, page))
+        pages = pages_by_query[query]
+        # Like the site: past the last page, the last page is served again
+        return pages[min(page, len(pages)) - 1] if pages else []
+
+    monkeypatch.setattr(scraper, "_search_page", search_page)
+    monkeypatch.setattr(scraper, "_fetch_reviews", lambda products, count: [f"reviews of {t}" for t, _ in products])
+    return scraper
+
+
+def test_pagination_stops_when_the_first_page_is_empty(tmp_path, monkeypatch, capsys):
+    scraper = _paged_scraper(tmp_path, monkeypatch, {"nothing": []})
+
+    assert scraper.scrape_flipkart_products("nothing", max_products=5) == []
+    assert scraper.requested_pages == [("nothing", 1)]
+    assert "No more results for 'nothing' on page 1 (1 page(s) fetched)" in capsys.readouterr().out
+
+
+def test_pagination_stops_when_the_site_repeats_the_last_page(tmp_path, monkeypatch, capsys):
+    pages = [[_product(1), _product(2)], [_product(3), _product(4)]]
+    scraper = _paged_scraper(tmp_path, monkeypatch, {"phones": pages})
+
+    rows = scraper.scrape_flipkart_products("phones", max_products=10)
+
+    assert [row[0] for row in rows] == ["itm1", "itm2", "itm3", "itm4"]
+    assert rows[0] == ["itm1", "Phone 1", "4.5", "1,024", "₹9,999", "reviews of Phone 1"]
+    assert "No more results for 'phones' on page 3 (3 page(s) fetched)" in capsys.readouterr().out
+
+
+def test_pagination_fetches_only_the_pages_needed(tmp_path, monkeypatch):
+    pages = [[_product(2 * i + 1), _product(2 * i + 2)] for i in range(10)]
+    scraper = _paged_scraper(tmp_path, monkeypatch, {"phones": pages})
+
+    rows = scraper.scrape_flipkart_products("phones", max_products=3)
+
+    assert [row[0] for row in rows] == ["itm1", "itm2", "itm3"]
+    assert scraper.requested_pages == [("phones", 1), ("phones", 2)]
+
+
+def test_products_are_deduplicated_across_pages_and_queries(tmp_path, monkeypatch):
+    scraper = _paged_scraper(tmp_path, monkeypatch, {
+        "phones": [[_product(1), _product(2)], [_product(2), _product(3)], []],
+        "android phones": [[_product(3), _product(4)], []],
+    })
+    seen = set()
+
+    first = scraper.scrape_flipkart_products("phones", max_products=10, seen=seen)
+    second = scraper.scrape_flipkart_products("android phones", max_products=10, seen=seen)
+
+    assert [row[0] for row in first] == ["itm1", "itm2", "itm3"]
+    assert [row[0] for row in second] == ["itm4"]
+    assert seen == {"itm1", "itm2", "itm3", "itm4"}
@@ -0,0 +1,178 @@
+import threading
+
+import pytest
+
+from product_assistant.etl.driver_pool import DriverPool
+
+
+class _StubDriver:
+    def __init__(self, slot):
+        self.slot = slot
+        self.healthy = True
+        self.quit_calls = 0
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("session deleted")
+        return "complete"
+
+    @property
+    def window_handles(self):
+        return ["main"] if self.healthy else []
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class _Factory:
+    def __init__(self):
+        self.started = []
+
+    def __call__(self, slot):
+        driver = _StubDriver(slot)
+        self.started.append(driver)
+        return driver
+
+
+def test_returned_driver_is_reused():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=2)
+
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+
+    assert second is first
+    assert len(factory.started) == 1
+    stats = pool.stats()
+    assert stats["leases"] == 2 and stats["drivers_started"] == 1 and stats["idle"] == 1
+
+
+def test_concurrent_checkouts_get_distinct_slots():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=2)
+
+    with pool.driver() as a, pool.driver() as b:
+        assert a is not b
+        assert {a.slot, b.slot} == {0, 1}
+        assert pool.stats()["leased"] == 2
+    assert pool.stats()["idle"] == 2
+
+
+def test_checkout_blocks_until_a_driver_is_returned():
+    pool = DriverPool(_Factory(), max_size=1, acquire_timeout=0.05)
+
+    with pool.driver():
+        with pytest.raises(TimeoutError):
+            with pool.driver():
+                pass
+
+    leased = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.driver():
+            leased.set()
+            release.wait(1)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    leased.wait(1)
+    pool.acquire_timeout = 1
+    release.set()
+    with pool.driver() as driver:
+        assert driver.slot == 0
+    worker.join()
+
+
+def test_crashed_session_is_replaced():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.driver() as driver:
+            driver.healthy = False
+            raise RuntimeError("tab crashed")
+
+    with pool.driver() as replacement:
+        assert replacement is not driver
+    assert driver.quit_calls == 1
+    # The dead driver's slot (and profile) is handed to its replacement
+    assert replacement.slot == driver.slot
+    assert pool.stats()["unhealthy"] == 1
+
+
+def test_error_with_a_healthy_driver_keeps_it():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=1)
+
+    with pytest.raises(ValueError):
+        with pool.driver() as driver:
+            raise ValueError("parse error")
+
+    with pool.driver() as again:
+        assert again is driver
+    assert len(factory.started) == 1
+
+
+def test_idle_driver_failing_health_check_is_replaced():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=1)
+    with pool.driver() as driver:
+        pass
+    driver.healthy = False  # e.g. Chrome died while idle
+
+    with pool.driver() as replacement:
+        assert replacement is not driver
+    assert pool.stats()["unhealthy"] == 1
+
+
+def test_driver_is_recycled_after_max_pages():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=1, max_pages_per_driver=2)
+
+    with pool.driver() as driver:
+        pool.record_page(driver, 0.1)
+        pool.record_page(driver, 0.1)
+    with pool.driver() as fresh:
+        assert fresh is not driver
+    assert driver.quit_calls == 1
+    assert pool.stats()["recycled"] == 1
+
+
+def test_failed_startup_frees_the_slot():
+    calls = []
+
+    def factory(slot):
+        calls.append(slot)
+        if len(calls) == 1:
+            raise RuntimeError("chrome did not start")
+        return _StubDriver(slot)
+
+    pool = DriverPool(factory, max_size=1, acquire_timeout=0.05)
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
+    with pool.driver() as driver:
+        assert driver.slot == 0
+    assert pool.stats()["startup_failures"] == 1
+
+
+def test_close_quits_idle_now_and_leased_on_return():
+    factory = _Factory()
+    pool = DriverPool(factory, max_size=2)
+    with pool.driver():
+        pass
+
+    with pool.driver() as leased:
+        with pool.driver() as other:
+            pass
+        pool.close()
+        assert other.quit_calls == 1
+        assert leased.quit_calls == 0
+    assert leased.quit_calls == 1
+
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
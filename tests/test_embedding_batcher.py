@@ -0,0 +1,116 @@
+import asyncio
+import math
+import threading
+
+import pytest
+
+from product_assistant.utils.embedding_batcher import MicroBatchingEmbeddings
+
+
+class _CountingEmbeddings:
+    """
+    Query-path fake: one call per batch, vectors derived from the text.
+    """
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self._lock = threading.Lock()
+
+    def embed_queries(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.error:
+            raise self.error
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_documents(self, texts):
+        return [[0.0, float(len(text))] for text in texts]
+
+
+def _concurrently(fn, args):
+    """
+    Run fn(arg) on one thread per arg, all released at once. Returns results (or exceptions).
+    """
+    barrier = threading.Barrier(len(args))
+    results = [None] * len(args)
+
+    def _run(i, arg):
+        barrier.wait()
+        try:
+            results[i] = fn(arg)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=_run, args=(i, arg)) for i, arg in enumerate(args)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_queries_are_coalesced():
+    underlying = _CountingEmbeddings()
+    batcher = MicroBatchingEmbeddings(underlying, max_batch_size=8, max_wait_ms=200)
+    texts = [f"query {'x' * i}" for i in range(20)]
+
+    results = _concurrently(batcher.embed_query, texts)
+    batcher.close()
+
+    assert results == [[float(len(text)), 1.0] for text in texts]
+    assert len(underlying.calls) <= math.ceil(len(texts) / 8)
+    assert all(len(call) <= 8 for call in underlying.calls)
+    stats = batcher.stats()
+    assert stats["items"] == 20 and stats["batches"] == len(underlying.calls)
+
+
+def test_one_failure_reaches_every_waiting_caller():
+    error = ConnectionError("embedding API down")
+    batcher = MicroBatchingEmbeddings(_CountingEmbeddings(error=error), max_batch_size=16, max_wait_ms=200)
+
+    results = _concurrently(batcher.embed_query, [f"q{i}" for i in range(10)])
+    batcher.close()
+
+    assert all(result is error for result in results)
+    assert batcher.stats()["errors"] >= 1
+
+
+def test_async_callers_share_batches():
+    underlying = _CountingEmbeddings()
+    batcher = MicroBatchingEmbeddings(underlying, max_batch_size=32, max_wait_ms=50)
+
+    async def _main():
+        return await asyncio.gather(*(batcher.aembed_query(f"q{i}") for i in range(5)))
+
+    results = asyncio.run(_main())
+    batcher.close()
+
+    assert results == [[2.0, 1.0]] * 5
+    assert underlying.calls == [[f"q{i}" for i in range(5)]]
+
+
+def test_large_query_lists_and_documents_bypass_the_queue():
+    underlying = _CountingEmbeddings()
+    batcher = MicroBatchingEmbeddings(underlying, max_batch_size=2)
+
+    assert batcher.embed_queries(["a", "bb", "ccc"]) == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+    assert batcher.embed_documents(["a"]) == [[0.0, 1.0]]
+    assert underlying.calls == [["a", "bb", "ccc"]]
+    assert batcher._collector is None
+    assert batcher.stats()["batches"] == 0
+
+
+def test_close_flushes_queued_queries_and_stops_the_collector():
+    underlying = _CountingEmbeddings()
+    batcher = MicroBatchingEmbeddings(underlying, max_batch_size=8, max_wait_ms=5_000)
+
+    futures = [batcher._submit(f"q{i}") for i in range(3)]
+    batcher.close()
+
+    # Dispatched on close, without waiting out max_wait_ms
+    assert [future.result(timeout=1) for future in futures] == [[2.0, 1.0]] * 3
+    assert not batcher._collector.is_alive()
+    with pytest.raises(RuntimeError):
+        batcher.embed_query("late")
+    batcher.close()  # idempotent
@@ -0,0 +1,182 @@
+import json
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from product_assistant.utils.embedding_cache import (
+    CachedEmbeddings,
+    DiskEmbeddingStore,
+    DocumentEmbeddingCache,
+    signature_cache_dir,
+)
+from product_assistant.utils.quantization import dequantize_int8, quantize_int8
+
+
+class _CountingEmbeddings(Embeddings):
+    """
+    Deterministic fake client that records every text it is asked to embed.
+    """
+
+    def __init__(self, dimension=8):
+        self.dimension = dimension
+        self.calls = []
+
+    def _vector(self, text):
+        rng = np.random.default_rng(sum(map(ord, text)))
+        return rng.standard_normal(self.dimension).astype(np.float32).tolist()
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_quantize_int8_round_trip():
+    matrix = np.random.default_rng(0).standard_normal((5, 64)).astype(np.float32)
+    codes, scales = quantize_int8(matrix)
+    assert codes.dtype == np.int8
+    restored = dequantize_int8(codes, scales)
+    assert np.abs(restored - matrix).max() <= scales.max() / 2 + 1e-6
+
+
+@pytest.mark.parametrize("dtype, atol", [("float32", 0.0), ("float16", 1e-2), ("int8", 5e-2)])
+def test_disk_store_round_trip(tmp_path, dtype, atol):
+    vectors = np.random.default_rng(1).standard_normal((3, 16)).astype(np.float32)
+    store = DiskEmbeddingStore(str(tmp_path), dtype=dtype)
+    store.put_many([(f"k{i}", v.tolist()) for i, v in enumerate(vectors)])
+
+    reopened = DiskEmbeddingStore(str(tmp_path), dtype=dtype)
+    assert len(reopened) == 3
+    for i, vector in enumerate(vectors):
+        np.testing.assert_allclose(reopened.get(f"k{i}"), vector, atol=atol)
+
+
+def test_disk_store_stops_at_max_entries(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path), dtype="float32", max_entries=2)
+    assert store.put_many([("a", [1.0, 0.0]), ("b", [0.0, 1.0]), ("c", [1.0, 1.0])]) == 2
+    assert store.put("d", [0.5, 0.5]) == 0
+    assert sorted(store.keys()) == ["a", "b"]
+
+
+def test_compact_keeps_newest_keys(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path), dtype="float32")
+    for i in range(5):
+        store.put(f"k{i}", [float(i), 0.0])
+
+    assert store.compact(store.newest_keys(2)) == 3
+    reopened = DiskEmbeddingStore(str(tmp_path), dtype="float32")
+    assert sorted(reopened.keys()) == ["k3", "k4"]
+    np.testing.assert_array_equal(reopened.get("k4"), [4.0, 0.0])
+
+
+def test_cached_embeddings_hits_memory_then_disk(tmp_path):
+    client = _CountingEmbeddings()
+    cache = CachedEmbeddings(client, "fake", cache_dir=str(tmp_path), dtype="float32")
+
+    first = cache.embed_queries(["Phone under 20k", "laptop"])
+    # Same query modulo case/whitespace is a hit, and the caller gets plain lists back
+    second = cache.embed_queries(["  phone UNDER 20k "])
+    assert client.calls == [["Phone under 20k", "laptop"]]
+    assert isinstance(second[0], list)
+    assert second[0] == pytest.approx(first[0])
+    assert all(v.dtype == np.float32 for v in cache._memory.values())
+
+    fresh = CachedEmbeddings(client, "fake", cache_dir=str(tmp_path), dtype="float32")
+    assert fresh.embed_query("laptop") == pytest.approx(first[1])
+    assert len(client.calls) == 1
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_cached_embeddings_lru_is_bounded():
+    cache = CachedEmbeddings(_CountingEmbeddings(), "fake", max_entries=2)
+    cache.embed_queries(["a", "b", "c"])
+    assert len(cache._memory) == 2
+
+
+def test_cache_admin_prunes_query_store(tmp_path):
+    cache_admin = pytest.importorskip("product_assistant.etl.cache_admin")
+    store = DiskEmbeddingStore(str(tmp_path), dtype="float16")
+    for i in range(4):
+        store.put(f"q{i}", [float(i), 1.0])
+
+    dry = cache_admin.prune_query_cache(store, keep=1, dry_run=True)
+    assert dry["stale_entries"] == 3 and len(store) == 4
+
+    result = cache_admin.prune_query_cache(store, keep=1)
+    assert result["removed"] == 3
+    assert store.keys() == ["q3"]
+
+
+def test_document_cache_embeds_only_new_or_changed_texts(tmp_path):
+    client = _CountingEmbeddings()
+    catalog = ["Product: Pixel 8a | Price: ₹39,999", "Product: iPhone 16 | Price: ₹64,900"]
+    first = DocumentEmbeddingCache(client, "fake@8", str(tmp_path)).embed_documents(catalog)
+
+    # A later run (new process) over an updated catalog
+    cache = DocumentEmbeddingCache(client, "fake@8", str(tmp_path))
+    updated = [catalog[0], "Product: iPhone 16 | Price: ₹59,900", "Product: Nothing Phone (2a)"]
+    vectors = cache.embed_documents(updated)
+
+    assert client.calls == [catalog, updated[1:]]
+    assert vectors[0] == pytest.approx(first[0])
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    # Another embedding space never reuses these vectors
+    DocumentEmbeddingCache(client, "other@8", str(tmp_path / "other")).embed_documents(catalog[:1])
+    assert client.calls[-1] == catalog[:1]
+
+
+def test_cache_admin_finds_the_query_space_of_prefixed_models(tmp_path, monkeypatch, capsys):
+    cache_admin = pytest.importorskip("product_assistant.etl.cache_admin")
+    query_space = "local:BAAI/bge-small-en-v1.5#query-1a2b3c4d"
+    store = DiskEmbeddingStore(signature_cache_dir(str(tmp_path), query_space), dtype="float16")
+    store.put("q", [1.0, 0.0])
+
+    class _Loader:
+        def embedding_signature(self):
+            return "local:BAAI/bge-small-en-v1.5"
+
+        def query_cache_space(self):
+            return query_space
+
+    monkeypatch.setattr(cache_admin, "ModelLoader", _Loader)
+    monkeypatch.setattr(cache_admin, "load_config", lambda: {"embedding_cache": {"cache_dir": str(tmp_path)}})
+    monkeypatch.setattr("sys.argv", ["cache_admin", "--query", "stats"])
+
+    cache_admin.main()
+
+    assert json.loads(capsys.readouterr().out)["entries"] == 1
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_disk_store_recovers_from_a_torn_append(tmp_path, dtype):
+    store = DiskEmbeddingStore(str(tmp_path), dtype=dtype)
+    store.put_many([("a", [1.0, 0.0, 0.0]), ("b", [0.0, 1.0, 0.0])])
+    # Crash mid-append: half a vector row and half an index line made it to disk
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(b"\x01\x02\x03")
+    with open(tmp_path / "index.tsv", "a", encoding="utf-8") as f:
+        f.write("c\t")
+
+    reopened = DiskEmbeddingStore(str(tmp_path), dtype=dtype)
+    assert sorted(reopened.keys()) == ["a", "b"]
+    reopened.put("d", [0.0, 0.0, 1.0])
+
+    final = DiskEmbeddingStore(str(tmp_path), dtype=dtype)
+    assert sorted(final.keys()) == ["a", "b", "d"]
+    np.testing.assert_allclose(final.get("d"), [0.0, 0.0, 1.0], atol=1e-2)
+    np.testing.assert_allclose(final.get("b"), [0.0, 1.0, 0.0], atol=1e-2)
+
+
+def test_put_many_trims_a_partial_row_written_after_load(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path), dtype="float32")
+    store.put("a", [1.0, 0.0])
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(b"\x00" * 5)  # another process crashed mid-append
+
+    store.put("b", [0.0, 1.0])
+
+    np.testing.assert_array_equal(DiskEmbeddingStore(str(tmp_path), dtype="float32").get("b"), [0.0, 1.0])
@@ -0,0 +1,78 @@
+import pytest
+from langchain_core.documents import Document
+
+retrieval = pytest.importorskip("product_assistant.retriever.retrieval")
+
+CATALOG = [
+    # (product_id, price_inr): out-of-budget products rank first for the unfiltered rewrite
+    ("premium-1", 24_900.0),
+    ("premium-2", 14_999.0),
+    ("mid-1", 1_999.0),
+    ("mid-2", 2_049.0),
+    ("mid-3", 2_099.0),
+]
+
+
+def _price_matches(metadata_filter, price):
+    if metadata_filter is None:
+        return True
+    clauses = metadata_filter.get("$and", [metadata_filter])
+    for clause in clauses:
+        bounds = clause["$or"][0]["price_inr"] if "$or" in clause else None
+        if bounds and not (bounds.get("$gte", 0) <= price <= bounds.get("$lte", float("inf"))):
+            return False
+    return True
+
+
+class _FakeStoreRetriever(retrieval.Retriever):
+    """
+    Retriever over an in-memory catalog that honours the price part of metadata filters.
+    """
+
+    def __init__(self):
+        self.config = {"retriever": {"metadata_filters": True, "fusion": {"max_variants": 3}}}
+        self.search_kwargs = {"k": 3, "score_threshold": 0.5}
+        self.filters = []
+
+    def load_retriever(self):
+        return None
+
+    def _embed_queries(self, queries):
+        return [[float(i)] for i, _ in enumerate(queries)]
+
+    def _vector_hits(self, vector, k, metadata_filter=None):
+        self.filters.append(metadata_filter)
+        return [
+            Document(page_content=pid, metadata={"product_id": pid, "price_inr": price})
+            for pid, price in CATALOG
+            if _price_matches(metadata_filter, price)
+        ][:k]
+
+
+def test_fused_results_respect_the_original_price_range():
+    retriever = _FakeStoreRetriever()
+    query = "budget earphones 1999 to 2099"
+    # Only "budget" makes this year-like range a price; the synonym rewrite drops it
+    assert any(
+        not retrieval.parse_query_constraints(variant) for variant in retrieval.expand_query(query)
+    )
+
+    docs = retriever.call_retriever_fused(query)
+
+    assert docs
+    assert all(1_999 <= doc.metadata["price_inr"] <= 2_099 for doc in docs)
+    expected = retrieval.relaxation_plan(retrieval.parse_query_constraints(query))[0]
+    assert retriever.filters and all(f == expected for f in retriever.filters)
+
+
+def test_variants_relax_together():
+    retriever = _FakeStoreRetriever()
+    query = "phones between 5000 and 9000"
+
+    docs = retriever.call_retriever_fused(query)
+
+    # Nothing in range for any variant: all variants fall back to the unfiltered search
+    assert docs
+    plan = retrieval.relaxation_plan(retrieval.parse_query_constraints(query))
+    variants = len(retrieval.expand_query(query))
+    assert retriever.filters == [plan[0]] * variants + [None] * variants
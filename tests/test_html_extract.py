@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from product_assistant.etl.html_extract import get_text, parse_reviews, parse_search_cards
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+BASE_URL = "https://www.flipkart.com"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    pytest.importorskip("undetected_chromedriver")
+    from product_assistant.etl.data_scrapper import FlipkartScraper
+
+    scraper = FlipkartScraper(output_dir=str(tmp_path), config={"scraper": {"http": {"enabled": False}}})
+    yield scraper
+    scraper.close()
+
+
+@pytest.mark.parametrize("snippet, separator", [
+    ("<div> A <b>bold</b> move <!-- hidden --> <i> x </i>tail</div>", ""),
+    ("<div>4.5<script>var x = 1;</script><span> (1,204) </span></div>", " "),
+    ("<div><style>.a{}</style><p>one</p>\n<p>two</p></div>", " "),
+])
+def test_get_text_matches_beautifulsoup(snippet, separator):
+    element = lxml_html.fragment_fromstring(snippet)
+    tag = BeautifulSoup(snippet, "html.parser").div
+
+    assert get_text(element, separator) == tag.get_text(separator=separator, strip=True)
+
+
+@pytest.mark.parametrize("name", ["flipkart_search.html", "flipkart_search_state.html"])
+@pytest.mark.parametrize("max_products", [None, 3])
+def test_search_cards_match_the_beautifulsoup_path(scraper, name, max_products):
+    html = _fixture(name)
+
+    lxml_cards = parse_search_cards(html, max_products, BASE_URL)
+
+    assert lxml_cards == scraper._bs4_search_cards(html, max_products)
+    assert lxml_cards[0] == (max_products or 10)
+
+
+def test_search_card_fields():
+    _, products = parse_search_cards(_fixture("flipkart_search.html"), None, BASE_URL)
+
+    product_id, title, rating, total_reviews, price, link = products[0]
+    assert (product_id, title, rating, price) == ("itm1000000ab0", "Apple iPhone 15 (Black, 128 GB)", "4.6", "₹64,900")
+    assert total_reviews == "1,24"
+    assert link.startswith(BASE_URL + "/apple-iphone-15/p/itm1000000ab0")
+
+
+@pytest.mark.parametrize("name", ["flipkart_reviews.html", "flipkart_reviews_state.html"])
+@pytest.mark.parametrize("count", [2, 50])
+def test_reviews_match_the_beautifulsoup_path(scraper, name, count):
+    html = _fixture(name)
+
+    assert parse_reviews(html, count) == scraper._bs4_parse_reviews(html, count)
+
+
+def test_reviews_fall_back_to_leaf_divs_without_review_blocks(scraper):
+    html = (
+        "<html><body><div><div>Flipkart Internet Private Limited, Bengaluru, Karnataka, India</div>"
+        "<div>Battery life is excellent and it charges quickly with the bundled adapter.</div>"
+        "<div>short</div></div></body></html>"
+    )
+
+    reviews = parse_reviews(html, 5)
+
+    assert reviews == ["Battery life is excellent and it charges quickly with the bundled adapter."]
+    assert reviews == scraper._bs4_parse_reviews(html, 5)
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+import requests
+
+from product_assistant.etl.http_fetcher import HttpFetcher
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+
+
+class _Response:
+    def __init__(self, text, status_code=200, content_type="text/html; charset=utf-8"):
+        self.text = text
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+
+
+def _fetcher(monkeypatch, response):
+    fetcher = HttpFetcher()
+
+    def get(url, timeout):
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(fetcher.session, "get", get)
+    return fetcher
+
+
+def test_server_rendered_page_is_returned(monkeypatch):
+    page = (FIXTURES / "flipkart_search.html").read_text(encoding="utf-8")
+    fetcher = _fetcher(monkeypatch, _Response(page))
+
+    assert fetcher.get_html("https://www.flipkart.com/search?q=phones") == (page, None)
+
+
+@pytest.mark.parametrize("response, reason", [
+    (_Response((FIXTURES / "flipkart_blocked.html").read_text(encoding="utf-8")), "blocked: bot check"),
+    (_Response("", status_code=429), "blocked: HTTP 429"),
+    (_Response("", status_code=404), "HTTP 404"),
+    (_Response("{}", content_type="application/json"), "not html"),
+    (requests.ConnectTimeout(), "error: ConnectTimeout"),
+])
+def test_unusable_pages_give_a_fallback_reason(monkeypatch, response, reason):
+    fetcher = _fetcher(monkeypatch, response)
+
+    assert fetcher.get_html("https://www.flipkart.com/search?q=phones") == (None, reason)
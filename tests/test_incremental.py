@@ -0,0 +1,44 @@
+from langchain_core.documents import Document
+
+from product_assistant.etl.incremental import add_fingerprints, plan_sync
+
+
+def _doc(product_id, reviews="great phone", price="₹10,000"):
+    doc = Document(
+        page_content=f"Product: Phone {product_id} | Price: {price} | Reviews: {reviews}",
+        metadata={"product_id": product_id, "price": price},
+    )
+    return add_fingerprints(doc, f"Phone {product_id}\x1f{reviews}")
+
+
+def _stored(doc):
+    return {key: doc.metadata[key] for key in ("embed_hash", "content_hash")}
+
+
+def test_plan_sync_classifies_every_document():
+    unchanged, reworded, repriced = _doc("u"), _doc("r"), _doc("p")
+    existing = {
+        "u": _stored(unchanged),
+        "r": _stored(reworded),
+        "p": _stored(repriced),
+        "gone": _stored(_doc("gone")),
+    }
+    documents = [unchanged, _doc("r", reviews="battery died"), _doc("p", price="₹9,000"), _doc("new")]
+
+    plan = plan_sync(documents, existing)
+
+    assert [d.metadata["product_id"] for d in plan["to_embed"]] == ["r", "new"]
+    assert [d.metadata["product_id"] for d in plan["to_update"]] == ["p"]
+    assert [d.metadata["product_id"] for d in plan["unchanged"]] == ["u"]
+    assert plan["to_delete"] == ["gone"]
+
+
+def test_plan_sync_without_deletes():
+    plan = plan_sync([_doc("a")], {"b": _stored(_doc("b"))}, include_deletes=False)
+    assert plan["to_delete"] == []
+
+
+def test_price_change_keeps_the_embed_hash():
+    before, after = _doc("a"), _doc("a", price="₹9,000")
+    assert before.metadata["embed_hash"] == after.metadata["embed_hash"]
+    assert before.metadata["content_hash"] != after.metadata["content_hash"]
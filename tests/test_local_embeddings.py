@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from product_assistant.utils import local_embeddings
+from product_assistant.utils.embedding_batcher import MicroBatchingEmbeddings
+from product_assistant.utils.embedding_cache import CachedEmbeddings
+from product_assistant.utils.local_embeddings import BGE_QUERY_INSTRUCTION, LocalEmbeddings
+
+
+class _SentenceTransformerModel:
+    """
+    Records what it is asked to encode; vectors are [len(text), 1, 0].
+    """
+
+    def __init__(self, prompts=None):
+        self.prompts = prompts or {}
+        self.calls = []
+
+    def encode(self, texts, prompt_name=None, **kwargs):
+        self.calls.append((list(texts), prompt_name))
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+
+class _FastEmbedModel:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts, batch_size=None):
+        self.calls.append(("embed", list(texts)))
+        return [np.ones(4) for _ in texts]
+
+    def query_embed(self, texts, batch_size=None):
+        self.calls.append(("query_embed", list(texts)))
+        return [np.ones(4) for _ in texts]
+
+
+@pytest.fixture
+def local_model(monkeypatch):
+    # Inject a loaded model instead of downloading one
+    def install(backend, model_name, model):
+        monkeypatch.setitem(local_embeddings._LOCAL_MODELS, (backend, model_name, "cpu"), model)
+        return LocalEmbeddings(model_name=model_name, backend=backend, normalize=False)
+
+    return install
+
+
+def test_bge_queries_get_the_instruction_and_documents_do_not(local_model):
+    model = _SentenceTransformerModel()
+    embeddings = local_model("sentence_transformers", "BAAI/bge-small-en-v1.5", model)
+
+    embeddings.embed_documents(["iphone 15 review"])
+    embeddings.embed_query("budget phone")
+
+    assert model.calls == [
+        (["iphone 15 review"], None),
+        ([BGE_QUERY_INSTRUCTION + "budget phone"], None),
+    ]
+    assert embeddings.query_space()
+
+
+def test_model_query_prompt_is_used_instead_of_a_prefix(local_model):
+    model = _SentenceTransformerModel(prompts={"query": "query: "})
+    embeddings = local_model("sentence_transformers", "BAAI/bge-base-en-v1.5", model)
+
+    embeddings.embed_queries(["a", "b"])
+
+    assert model.calls == [(["a", "b"], "query")]
+
+
+def test_symmetric_models_embed_queries_like_documents(local_model):
+    embeddings = local_model("sentence_transformers", "sentence-transformers/all-MiniLM-L6-v2", _SentenceTransformerModel())
+    assert embeddings.embed_query("x") == embeddings.embed_documents(["x"])[0]
+    assert embeddings.query_space() == ""
+
+
+def test_fastembed_uses_query_embed(local_model):
+    model = _FastEmbedModel()
+    embeddings = local_model("fastembed", "BAAI/bge-small-en-v1.5", model)
+
+    embeddings.embed_documents(["doc"])
+    embeddings.embed_queries(["query"])
+
+    assert model.calls == [("embed", ["doc"]), ("query_embed", [BGE_QUERY_INSTRUCTION + "query"])]
+    assert embeddings.dimension() == 4
+
+
+def test_cache_and_batcher_embed_misses_on_the_query_path(local_model):
+    model = _SentenceTransformerModel()
+    embeddings = local_model("sentence_transformers", "BAAI/bge-small-en-v1.5", model)
+    cache = CachedEmbeddings(MicroBatchingEmbeddings(embeddings, max_wait_ms=1), "bge")
+
+    cache.embed_queries(["phone"])
+    cache.embed_documents(["doc"])
+
+    assert model.calls == [([BGE_QUERY_INSTRUCTION + "phone"], None), (["doc"], None)]
+
+
+def test_embedding_dimension_ignores_dimensions_for_local_models(local_model):
+    model_loader = pytest.importorskip("product_assistant.utils.model_loader")
+    embeddings = local_model("sentence_transformers", "sentence-transformers/all-MiniLM-L6-v2", _SentenceTransformerModel())
+
+    loader = model_loader.ModelLoader.__new__(model_loader.ModelLoader)
+    loader.config = {"embedding_model": {"provider": "local", "dimensions": 512}}
+
+    assert loader.embedding_dimension(CachedEmbeddings(embeddings, "local")) == 3
+
+
+def test_query_cache_space_follows_the_query_prefix(local_model):
+    model_loader = pytest.importorskip("product_assistant.utils.model_loader")
+    bge = local_model("sentence_transformers", "BAAI/bge-small-en-v1.5", _SentenceTransformerModel())
+    minilm = local_model("sentence_transformers", "sentence-transformers/all-MiniLM-L6-v2", _SentenceTransformerModel())
+
+    loader = model_loader.ModelLoader.__new__(model_loader.ModelLoader)
+    loader.config = {"embedding_model": {"provider": "local", "local": {"model_name": "BAAI/bge-small-en-v1.5"}}}
+    assert loader.query_cache_space(bge) == f"local:BAAI/bge-small-en-v1.5#query-{bge.query_space()}"
+
+    loader.config["embedding_model"]["local"]["model_name"] = "sentence-transformers/all-MiniLM-L6-v2"
+    assert loader.query_cache_space(minilm) == "local:sentence-transformers/all-MiniLM-L6-v2"
+
+    loader.config = {"embedding_model": {"provider": "openai", "dimensions": 512}}
+    assert loader.query_cache_space() == "text-embedding-3-small@512"
@@ -0,0 +1,28 @@
+import numpy as np
+
+from product_assistant.retriever.mmr import cosine_scores, maximal_marginal_relevance
+
+
+def test_cosine_scores():
+    scores = cosine_scores([1.0, 0.0], [[2.0, 0.0], [0.0, 3.0], [1.0, 1.0], [0.0, 0.0]])
+    np.testing.assert_allclose(scores, [1.0, 0.0, np.sqrt(0.5), 0.0], atol=1e-6)
+
+
+def test_pure_relevance_is_a_similarity_ranking():
+    query = [1.0, 0.0]
+    candidates = [[0.5, 0.5], [1.0, 0.0], [0.9, 0.1], [0.0, 1.0]]
+    assert maximal_marginal_relevance(query, candidates, k=3, lambda_mult=1.0) == [1, 2, 0]
+
+
+def test_mmr_skips_near_duplicates_of_selected_items():
+    query = [1.0, 0.0]
+    candidates = [[1.0, 0.1], [1.0, 0.11], [0.7, -0.7]]
+    # Relevance alone would pick the duplicate second
+    assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=1.0) == [0, 1]
+    assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=0.5) == [0, 2]
+
+
+def test_mmr_edge_cases():
+    assert maximal_marginal_relevance([1.0, 0.0], [], k=3) == []
+    assert maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0]], k=0) == []
+    assert sorted(maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0], [0.0, 1.0]], k=5)) == [0, 1]
@@ -0,0 +1,47 @@
+from langchain_core.documents import Document
+
+from product_assistant.etl.near_dedup import collapse_near_duplicates, near_dedup_batches
+
+REVIEWS = "Great camera and battery life || Smooth performance, a bit pricey || Value for money"
+
+
+def _doc(product_id, title, price, total_reviews, reviews=REVIEWS):
+    return Document(
+        page_content=f"Product: {title} | Price: ₹{price:,} | Reviews: {reviews}",
+        metadata={
+            "product_id": product_id,
+            "product_title": title,
+            "price_inr": float(price),
+            "total_reviews": total_reviews,
+        },
+    )
+
+
+def _catalog():
+    return [
+        _doc("black", "Apple iPhone 16 (Black, 128 GB)", 64_900, 100),
+        _doc("blue", "Apple iPhone 16 (Blue, 256 GB)", 74_900, 500),
+        _doc("pixel", "Google Pixel 8a (Obsidian, 128 GB)", 39_999, 50, "Clean software || Compact size"),
+    ]
+
+
+def test_variants_collapse_into_the_most_reviewed_one():
+    documents, stats = collapse_near_duplicates(_catalog(), threshold=0.8)
+
+    assert stats == {"documents": 3, "clusters": 2, "collapsed": 1}
+    assert [d.metadata["product_id"] for d in documents] == ["blue", "pixel"]
+    canonical = documents[0].metadata
+    assert canonical["variant_count"] == 2
+    assert sorted(canonical["variant_product_ids"]) == ["black", "blue"]
+    assert (canonical["min_price_inr"], canonical["max_price_inr"]) == (64_900.0, 74_900.0)
+    assert "variant_count" not in documents[1].metadata
+
+
+def test_near_dedup_batches_is_a_no_op_when_disabled():
+    batches = [_catalog()]
+    assert list(near_dedup_batches(batches, 2, {"enabled": False})) == batches
+
+
+def test_near_dedup_batches_rebatches_collapsed_documents():
+    out = list(near_dedup_batches([_catalog()[:2], _catalog()[2:]], 1, {"enabled": True, "window_documents": 0}))
+    assert [[d.metadata["product_id"] for d in batch] for batch in out] == [["blue"], ["pixel"]]
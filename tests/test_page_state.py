@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from product_assistant.etl.html_extract import REVIEW_SKIP, parse_reviews, parse_search_cards
+from product_assistant.etl.page_state import extract_initial_state, products_from_state, reviews_from_state
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+BASE_URL = "https://www.flipkart.com"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _page(script):
+    return f"<html><head><script>{script}</script></head><body><div data-id='x'></div></body></html>"
+
+
+def test_state_is_parsed_up_to_the_end_of_the_object():
+    html = _page('window.__INITIAL_STATE__ = {"a": {"b": "};"}, "c": [1, 2]}; window.other = {};')
+
+    assert extract_initial_state(html) == {"a": {"b": "};"}, "c": [1, 2]}
+
+
+@pytest.mark.parametrize("html", [
+    _page("window.dataLayer = [];"),                          # no state at all
+    _page('window.__INITIAL_STATE__ = {"a": 1, "b": };'),     # malformed JSON
+    _page('window.__INITIAL_STATE__ = {"a": "unterminated'),  # truncated page
+    _page("window.__INITIAL_STATE__ = [1, 2, 3];"),           # not an object
+    _page("window.__INITIAL_STATE__;"),                       # no assignment
+])
+def test_missing_or_malformed_state_is_none(html):
+    assert extract_initial_state(html) is None
+
+
+def test_products_from_state_match_the_dom_cards():
+    html = _fixture("flipkart_search_state.html")
+    state = extract_initial_state(html)
+
+    products = products_from_state(state, None, BASE_URL)
+    _, cards = parse_search_cards(html, None, BASE_URL)
+
+    assert len(products) == 10
+    for product, card in zip(products, cards):
+        product_id, title, rating, _, price, link = product
+        assert (product_id, title, rating, price, link) == (card[0], card[1], card[2], card[4], card[5])
+    # The state has the full count where the card text only shows "1,24,512 Ratings"
+    assert products[0][3] == "1,24,512"
+    assert products_from_state(state, 3, BASE_URL) == products[:3]
+
+
+def test_products_are_deduplicated_and_incomplete_ones_skipped():
+    def item(item_id, title="Phone", price=9999):
+        return {
+            "itemId": item_id,
+            "titles": {"title": title},
+            "baseUrl": f"/phone/p/{item_id}",
+            "pricing": {"finalPrice": {"value": price}},
+            "rating": {"average": 4.25, "count": 123456},
+        }
+
+    state = {"slots": [
+        {"widget": {"data": {"products": [{"productInfo": {"value": item("itmA")}}]}}},
+        {"widget": {"data": {"products": [{"productInfo": {"value": item("itmA")}}]}}},
+        {"widget": {"data": {"products": [{"productInfo": {"value": item("itmB", title=None)}}]}}},
+        {"widget": {"data": {"products": [{"productInfo": {"value": item("itmC", price=None)}}]}}},
+    ]}
+
+    products = products_from_state(state, None, BASE_URL)
+
+    assert products == [
+        ("itmA", "Phone", "4.2", "1,23,456", "₹9,999", BASE_URL + "/phone/p/itmA"),
+        ("itmC", "Phone", "4.2", "1,23,456", "N/A", BASE_URL + "/phone/p/itmC"),
+    ]
+
+
+def test_reviews_from_state_match_the_dom_reviews():
+    html = _fixture("flipkart_reviews_state.html")
+    state = extract_initial_state(html)
+
+    reviews = reviews_from_state(state, 10, skip=REVIEW_SKIP)
+
+    assert reviews == parse_reviews(html, 5)
+    assert reviews_from_state(state, 2, skip=REVIEW_SKIP) == reviews[:2]
+
+
+def test_reviews_from_state_skip_boilerplate_and_repeats():
+    review = "Battery life is excellent and it charges quickly with the bundled adapter."
+    state = {"reviews": [
+        {"text": review, "rating": 5, "author": "A"},
+        {"text": "  " + review.replace(" ", "\n  ", 2), "rating": 4, "author": "B"},
+        {"text": "1 year manufacturer warranty for device and 6 months for accessories", "rating": 5, "author": "C"},
+        {"text": "Too short", "rating": 1, "author": "D"},
+        {"text": "A description block that is not a review because it has no author.", "rating": 5},
+    ]}
+
+    assert reviews_from_state(state, 10, skip=REVIEW_SKIP) == [review]
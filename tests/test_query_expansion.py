@@ -0,0 +1,36 @@
+from langchain_core.documents import Document
+
+from product_assistant.retriever.query_expansion import expand_query, reciprocal_rank_fusion
+
+
+def _doc(product_id):
+    return Document(page_content=f"product {product_id}", metadata={"product_id": product_id})
+
+
+def test_rrf_rewards_documents_ranked_well_in_several_lists():
+    fused = reciprocal_rank_fusion(
+        [
+            [_doc("a"), _doc("b"), _doc("c")],
+            [_doc("b"), _doc("c"), _doc("d")],
+        ],
+        k=60,
+    )
+    assert [d.metadata["product_id"] for d in fused] == ["b", "c", "a", "d"]
+
+
+def test_rrf_deduplicates_and_truncates():
+    fused = reciprocal_rank_fusion([[_doc("a"), _doc("b")], [_doc("a")]], top_n=1)
+    assert [d.metadata["product_id"] for d in fused] == ["a"]
+
+
+def test_rrf_falls_back_to_page_content_as_key():
+    first = Document(page_content="same text")
+    fused = reciprocal_rank_fusion([[first], [Document(page_content="same text")]])
+    assert fused == [first]
+
+
+def test_expand_query_keeps_the_original_first_without_duplicates():
+    variants = expand_query("  cheap   phone ", max_variants=3)
+    assert variants[0] == "cheap phone"
+    assert len({v.lower() for v in variants}) == len(variants) <= 3
+    assert expand_query("phone", max_variants=1) == ["phone"]
@@ -0,0 +1,102 @@
+import pytest
+
+from product_assistant.retriever.query_filters import (
+    build_metadata_filter,
+    parse_query_constraints,
+    relaxation_plan,
+    without_price,
+)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "iPhone 15 Pro Max 512GB",
+        "phones with more than 5000 mAh battery",
+        "over 1000 reviews",
+        "camera above 48 MP",
+        "monitor over 144 hz",
+        "from 2023 to 2024",
+        "between 2023 and 2024",
+        "between 2 and 5",
+    ],
+)
+def test_specs_and_counts_are_not_prices(query):
+    constraints = parse_query_constraints(query)
+    assert "min_price" not in constraints
+    assert "max_price" not in constraints
+
+
+def test_max_is_not_a_price_keyword():
+    assert parse_query_constraints("pro max 20000") == {}
+
+
+def test_amount_needs_a_word_boundary():
+    # "5120gb" must not be read as a 512 budget either
+    assert "max_price" not in parse_query_constraints("under 5120gb storage")
+
+
+@pytest.mark.parametrize(
+    "query, low, high",
+    [
+        ("samsung 20-30k", 20_000, 30_000),
+        ("between 2 and 3 lakh", 200_000, 300_000),
+        ("between 500 and 2k", 500, 2_000),
+        ("budget 20000 to 30000", 20_000, 30_000),
+        ("₹15,000 to ₹25,000", 15_000, 25_000),
+        ("phones between 10000 and 20000", 10_000, 20_000),
+        ("laptops 40000 to 60000", 40_000, 60_000),
+    ],
+)
+def test_price_ranges(query, low, high):
+    constraints = parse_query_constraints(query)
+    assert constraints["min_price"] == low
+    assert constraints["max_price"] == high
+
+
+@pytest.mark.parametrize(
+    "query, key, value",
+    [
+        ("phones under 20k", "max_price", 20_000),
+        ("iphone below ₹1,00,000", "max_price", 100_000),
+        ("laptop under 50000 with 16 gb ram", "max_price", 50_000),
+        ("tv above 1.5 lakh", "min_price", 150_000),
+    ],
+)
+def test_price_bounds(query, key, value):
+    assert parse_query_constraints(query)[key] == value
+
+
+def test_rating_and_brand():
+    constraints = parse_query_constraints("samsung phone with 4.5+ stars under 30k")
+    assert constraints == {"max_price": 30_000, "min_rating": 4.5, "brands": ["samsung"]}
+
+
+def test_without_price_keeps_brand_and_rating():
+    constraints = {"min_price": 1000.0, "min_rating": 4.0, "brands": ["samsung"]}
+    assert without_price(constraints) == {"min_rating": 4.0, "brands": ["samsung"]}
+    assert build_metadata_filter(without_price(constraints)) == {
+        "$and": [{"rating": {"$gte": 4.0}}, {"brand": "samsung"}]
+    }
+
+
+def test_build_metadata_filter_empty():
+    assert build_metadata_filter({}) is None
+
+
+def test_relaxation_plan_drops_price_then_everything():
+    constraints = parse_query_constraints("samsung phones under 20k")
+    assert relaxation_plan(constraints) == [
+        build_metadata_filter(constraints),
+        {"brand": "samsung"},
+        None,
+    ]
+
+
+def test_relaxation_plan_brand_only_falls_back_to_unfiltered():
+    assert relaxation_plan(parse_query_constraints("alternatives to iphone")) == [{"brand": "apple"}, None]
+    assert relaxation_plan(parse_query_constraints("phones under 20k")) == [
+        build_metadata_filter({"max_price": 20_000}),
+        None,
+    ]
+    assert relaxation_plan({}) == [None]
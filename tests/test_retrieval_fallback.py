@@ -0,0 +1,55 @@
+import pytest
+
+from product_assistant.retriever.query_filters import build_metadata_filter
+
+retrieval = pytest.importorskip("product_assistant.retriever.retrieval")
+
+
+class _FakeRetriever(retrieval.Retriever):
+    """
+    Retriever with the vector search replaced by a recorder (no AstraDB, no env).
+    """
+
+    def __init__(self, results_by_filter):
+        self.config = {"retriever": {"metadata_filters": True}}
+        self.search_kwargs = {"k": 3, "score_threshold": 0.5}
+        self.results_by_filter = results_by_filter
+        self.filters = []
+
+    def _vector_hits(self, vector, k, metadata_filter=None):
+        self.filters.append(metadata_filter)
+        return self.results_by_filter.get(repr(metadata_filter), [])
+
+
+def test_fallback_relaxes_price_but_keeps_brand():
+    brand_only = {"brand": "samsung"}
+    retriever = _FakeRetriever({repr(brand_only): ["galaxy"]})
+
+    docs = retriever._search_by_vector("samsung phones under 20k", [0.0])
+
+    assert docs == ["galaxy"]
+    assert len(retriever.filters) == 2
+    assert "$and" in retriever.filters[0]
+    assert retriever.filters[1] == brand_only
+
+
+def test_brand_only_query_falls_back_to_unfiltered_search():
+    retriever = _FakeRetriever({repr(None): ["pixel"]})
+
+    assert retriever._search_by_vector("alternatives to iphone", [0.0]) == ["pixel"]
+    assert retriever.filters == [{"brand": "apple"}, None]
+
+
+def test_unfiltered_query_is_searched_once():
+    retriever = _FakeRetriever({})
+
+    assert retriever._search_by_vector("good phones", [0.0]) == []
+    assert retriever.filters == [None]
+
+
+def test_filtered_hits_are_returned_directly():
+    price_filter = build_metadata_filter({"max_price": 20000.0})
+    retriever = _FakeRetriever({repr(price_filter): ["phone"]})
+
+    assert retriever._search_by_vector("phones under 20k", [0.0]) == ["phone"]
+    assert retriever.filters == [price_filter]
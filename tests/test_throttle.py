@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from product_assistant.etl import throttle as throttle_module
+from product_assistant.etl.throttle import DomainThrottle
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """
+    Clock that only moves when the test says so; sleeps are recorded, not taken.
+    """
+    clock = {"now": 100.0, "sleeps": []}
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(throttle_module.time, "sleep", clock["sleeps"].append)
+    return clock
+
+
+def test_requests_to_one_domain_are_spaced(frozen_clock):
+    throttle = DomainThrottle(min_interval_seconds=1.5)
+
+    delays = [throttle.wait(f"https://www.flipkart.com/p/{i}") for i in range(3)]
+
+    assert delays == [0, 1.5, 3.0]
+    assert frozen_clock["sleeps"] == [1.5, 3.0]
+    assert throttle.stats() == {"requests": 3, "waited_seconds": 4.5, "domains": 1}
+
+
+def test_other_domains_are_not_held_up(frozen_clock):
+    throttle = DomainThrottle(min_interval_seconds=1.0)
+
+    throttle.wait("https://www.flipkart.com/search?q=a")
+    assert throttle.wait("https://rukminim2.flixcart.com/image.jpeg") == 0
+    # Host names are case-insensitive
+    assert throttle.wait("https://WWW.FLIPKART.COM/search?q=b") == 1.0
+
+
+def test_elapsed_time_counts_toward_the_interval(frozen_clock):
+    throttle = DomainThrottle(min_interval_seconds=1.0)
+
+    throttle.wait("https://www.flipkart.com/a")
+    frozen_clock["now"] += 0.75
+    assert throttle.wait("https://www.flipkart.com/b") == pytest.approx(0.25)
+    frozen_clock["now"] += 5
+    assert throttle.wait("https://www.flipkart.com/c") == 0
+
+
+def test_concurrent_callers_are_spaced():
+    throttle = DomainThrottle(min_interval_seconds=0.05)
+    starts = []
+    lock = threading.Lock()
+
+    def fetch():
+        throttle.wait("https://www.flipkart.com/search")
+        with lock:
+            starts.append(time.monotonic())
+
+    workers = [threading.Thread(target=fetch) for _ in range(4)]
+    begin = time.monotonic()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # However the threads were scheduled, the k-th request started no sooner than
+    # k intervals in (a late-running thread can only push its own start later)
+    assert len(starts) == 4
+    for k, start in enumerate(sorted(starts)):
+        assert start - begin >= k * 0.05 - 1e-3
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+from astrapy.exceptions import TooManyDocumentsToCountException
+
+from product_assistant.etl.vector_sink import AstraVectorSink
+
+
+class _LargeCollection:
+    """
+    Collection too large for count_documents, with a stale estimate.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.projections = []
+
+    def count_documents(self, filter, upper_bound):
+        raise TooManyDocumentsToCountException(text="too many", server_max_count_exceeded=True)
+
+    def estimated_document_count(self):
+        return self.size // 2
+
+    def find(self, filter, projection=None):
+        self.projections.append(projection)
+        return ({"_id": str(i)} for i in range(self.size))
+
+
+def test_count_is_exact_above_the_counting_limit():
+    collection = _LargeCollection(2500)
+    sink = AstraVectorSink.__new__(AstraVectorSink)
+    sink.vstore = SimpleNamespace(
+        astra_env=SimpleNamespace(ensure_db_setup=lambda: None, collection=collection)
+    )
+
+    assert sink.count() == 2500
+    assert collection.projections == [{"_id": True}]